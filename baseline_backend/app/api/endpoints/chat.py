@@ -23,10 +23,12 @@ class ChatRequest(BaseModel):
     character: CharacterType = "devil_coach"
 
 
+# 응답 생성(RAG 조회 + LLM 호출)은 chat_service가 vector_store 전용 executor에서 실행
+# → 이벤트 루프를 막지 않고, 동시 실행 수는 VECTOR_STORE_MAX_WORKERS로 제한
 @router.post("/chat")
 async def chat(req: ChatRequest):
 
-    result = chat_service.handle_chat(
+    result = await chat_service.handle_chat(
         user_id=req.user_id, message=req.message, character=req.character
     )
 
@@ -45,7 +47,7 @@ class FixedRequest(BaseModel):
 @router.post("/chat/fixed")
 async def chat_fixed(req: FixedRequest):
 
-    result = chat_service.handle_fixed_chat(
+    result = await chat_service.handle_fixed_chat(
         user_id=req.user_id, question_type=req.question_type, character=req.character
     )
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, UploadFile, File, Query
+from app.config import INGEST_JOB_QUEUE
 from app.services.file_upload_service import FileUploadService
 
 router = APIRouter(prefix="/api/file", tags=["File Upload"])
@@ -12,6 +13,30 @@ async def upload_file(
     difficulty: str = Query("중"),
     duration: int = Query(30),
 ):
+    """
+    ZIP/DB 업로드
+
+    - INGEST_JOB_QUEUE=1 (기본): 파일 저장 + 작업 등록 후 바로 job_id 반환
+      → GET /api/file/jobs/{job_id}로 진행 상황 / 분석 결과 조회
+    - INGEST_JOB_QUEUE=0: 요청 안에서 분석까지 끝내고 결과 반환
+    """
+    if INGEST_JOB_QUEUE:
+        return await service.enqueue_file(
+            file=file, user_id=user_id, difficulty=difficulty, duration=duration
+        )
     return await service.process_file(
         file=file, user_id=user_id, difficulty=difficulty, duration=duration
     )
+
+
+@router.get("/jobs/{job_id}")
+async def get_upload_job(job_id: str):
+    """
+    업로드 작업 상태
+
+    - status: queued / running / succeeded / failed
+    - stage: 진행 중인 단계 (extract / parse / preprocess / store / analysis)
+    - timings: 끝난 단계별 소요 시간(s), queue_position: 앞에 남은 작업 수 (queued일 때)
+    - result: 완료 시 기존 업로드 응답과 같은 분석 결과
+    """
+    return await service.get_job(job_id)
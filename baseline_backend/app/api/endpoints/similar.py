@@ -13,4 +13,4 @@ class SimilarRequest(BaseModel):
 
 @router.post("/similar")
 async def find_similar(req: SimilarRequest):
-    return SimilarService.find_similar(req.summary, req.user_id)
+    return await SimilarService.find_similar(req.summary, req.user_id)
@@ -3,9 +3,13 @@ User API Router (수정 버전 - 날짜 기준 최신 데이터 조회)
 """
 
 from fastapi import APIRouter, Query, HTTPException
-from app.core.vector_store import collection, search_similar_summaries
+from app.core import day_store
+from app.core.vector_store import (
+    search_similar_summaries,
+    get_recent_summaries,
+    get_user_records,
+)
 from app.core.llm_analysis import run_llm_analysis
-import json
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
@@ -31,42 +35,31 @@ def get_latest_analysis(
 
     # ✅ 1. 날짜 기준으로 최신 데이터 가져오기
     try:
-        result = collection.get(where={"user_id": user_id})
+        # 최신 날짜의 대표 기록 (오래 업로드가 없어 보관된 경우 보관소에서)
+        latest_records = get_recent_summaries(user_id, 1)
 
-        if not result or not result["metadatas"]:
+        if not latest_records:
             raise HTTPException(
                 404,
                 "업로드된 데이터가 없습니다. 먼저 스마트폰 앱에서 데이터를 전송해주세요.",
             )
 
-        # 날짜별로 정렬 (최신순)
-        metadatas = result["metadatas"]
-        sorted_data = sorted(metadatas, key=lambda x: x.get("date", ""), reverse=True)
-
-        if not sorted_data:
-            raise HTTPException(404, "데이터가 없습니다.")
-
         # 최신 데이터 추출
-        latest_meta = sorted_data[0]
-        date = latest_meta.get("date", "")
+        latest = latest_records[0]
+        date = latest.get("date", "")
 
         print(f"[INFO] 최신 데이터 날짜: {date}")
 
-        # summary_json 파싱
-        summary_json = latest_meta.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
-
-        raw_data = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
+        raw_data = latest.get("raw", {})
+        summary_text = latest.get("summary_text", "")
 
         if not raw_data:
             raise HTTPException(400, "건강 데이터가 비어있습니다.")
 
-        # 데이터 개수 및 출처 정보 출력
-        same_date_data = [m for m in sorted_data if m.get("date") == date]
+        # 데이터 개수 및 출처 정보 출력 (출처별 원본)
+        same_date_data = day_store.get_records_on_date(
+            user_id, latest["timestamp"], canonical_only=False
+        ) or [latest]
         print(f"[INFO] 해당 날짜 데이터 개수: {len(same_date_data)}개")
         for idx, m in enumerate(same_date_data[:3], 1):
             source = m.get("source", "unknown")
@@ -141,34 +134,21 @@ def get_latest_analysis(
 def get_raw_history(user_id: str = Query(...)):
     """
     사용자가 업로드한 summary/raw 전체 조회
-    VectorDB에 저장된 summary_json을 파싱하여 반환
+    day_store에 저장된 일별 기록 + 보관소로 옮겨진 오래된 기록을 반환
     """
-    result = collection.get(where={"user_id": user_id})
-
-    ids = result.get("ids", [])
-    metas = result.get("metadatas", [])
+    records = get_user_records(user_id)
 
     history = []
-    for doc_id, meta in zip(ids, metas):
-        # summary_json 파싱
-        sj = meta.get("summary_json", "{}")
-        try:
-            parsed = json.loads(sj)
-        except:
-            parsed = {}
-
-        raw = parsed.get("raw", {})
-        summary_text = parsed.get("summary_text", "")
-
+    for record in records:
         history.append(
             {
-                "doc_id": doc_id,
-                "date": meta.get("date"),
-                "source": meta.get("source", "unknown"),
-                "platform": meta.get("platform", "unknown"),
-                "health_score": meta.get("health_score", 0),
-                "summary_text": summary_text,
-                "raw": raw,
+                "doc_id": record["document_id"],
+                "date": record.get("date"),
+                "source": record.get("source", "unknown"),
+                "platform": record.get("platform", "unknown"),
+                "health_score": record.get("health_score", 0),
+                "summary_text": record.get("summary_text", ""),
+                "raw": record.get("raw", {}),
             }
         )
 
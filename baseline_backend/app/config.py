@@ -7,11 +7,9 @@ load_dotenv()
 # ============================================================
 # OpenAI 설정
 # ============================================================
+# 키가 없어도 import는 가능 (OpenAI 호출 시점에 에러, app/core/openai_client.py)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-if not OPENAI_API_KEY:
-    raise ValueError("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요.")
-
 # ============================================================
 # LLM 설정
 # ============================================================
@@ -25,6 +23,9 @@ LLM_MAX_TOKENS = 1500
 API_HOST = "0.0.0.0"
 API_PORT = 8000
 
+# 서버 시작 시 ChromaDB/임베딩 백엔드/SQLite를 미리 준비 (끄면 첫 요청 때 준비)
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "1") == "1"
+
 
 # ============================================================
 # CORS 설정 (보안 강화)
@@ -39,6 +40,114 @@ ALLOWED_ORIGINS = [
 # ============================================================
 CHROMA_PERSIST_DIR = "./chroma_data"
 CHROMA_COLLECTION_NAME = "summaries"
+# 컬렉션 분할: single (전체 공유) | hash (user_id 해시 버킷) | user (사용자별 컬렉션)
+COLLECTION_PARTITIONING = os.getenv("COLLECTION_PARTITIONING", "single")
+COLLECTION_HASH_BUCKETS = 64  # hash 모드 버킷 수
+
+# ============================================================
+# 로컬 저장소 설정 (일별 기록, 임베딩 캐시 등 SQLite 파일)
+# ============================================================
+LOCAL_STORE_DIR = "./local_store"
+DAY_STORE_PATH = f"{LOCAL_STORE_DIR}/day_store.sqlite3"
+
+# 오래된 일별 기록 보관 (cold tier)
+# - RETENTION_HOT_DAYS보다 오래된 날짜는 사용자/월별 gzip NDJSON으로 옮기고
+#   ChromaDB 벡터 / day_store 행은 삭제 (유사 검색 대상에서 빠짐)
+# - 날짜/기간 / 전체 기록 조회(raw-history, app history)는 보관소까지 자동으로 읽음
+# - ZIP/DB 업로드의 보관 기간 밖 날짜는 임베딩하지 않고 보관소에 바로 기록
+# - 0이면 보관하지 않음
+RETENTION_HOT_DAYS = int(os.getenv("RETENTION_HOT_DAYS", "365"))
+RETENTION_INTERVAL_HOURS = 24  # 보관 작업 주기
+ARCHIVE_DIR = f"{LOCAL_STORE_DIR}/archive"
+
+# ZIP/DB 업로드 백그라운드 처리 (app/core/job_queue.py)
+# - 업로드 요청은 파일 저장 + 작업 등록 후 바로 job_id 반환
+#   → GET /api/file/jobs/{job_id}로 진행 단계 / 단계별 소요 시간 / 분석 결과 조회
+# - 작업은 SQLite 파일에 기록 → 서버 재시작 후에도 이어서 처리
+#   (INGEST_JOB_LEASE_SEC 동안 heartbeat가 없는 실행 중 작업은 다시 대기열로)
+# - 같은 작업 DB를 쓰는 모든 서버 프로세스를 합쳐 동시에 INGEST_MAX_CONCURRENT개까지 처리
+# - 0이면 기존처럼 요청 안에서 끝까지 처리
+INGEST_JOB_QUEUE = os.getenv("INGEST_JOB_QUEUE", "1") == "1"
+INGEST_JOB_DB_PATH = f"{LOCAL_STORE_DIR}/ingest_jobs.sqlite3"
+INGEST_MAX_CONCURRENT = int(os.getenv("INGEST_MAX_CONCURRENT", "2"))
+INGEST_JOB_MAX_ATTEMPTS = 3  # 오류 / 중단 시 최대 시도 횟수
+INGEST_JOB_LEASE_SEC = 120
+INGEST_JOB_HEARTBEAT_SEC = 20
+INGEST_JOB_POLL_SEC = 2.0  # 대기 작업 확인 주기 (같은 프로세스 업로드는 바로 깨움)
+
+# 업로드 파일 저장 / ZIP 안 SQLite 멤버 추출 시 한 번에 복사하는 바이트 수
+# (업로드 전체를 메모리에 올리지 않고 이 크기씩 스트리밍)
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# 업로드 DB(ZIP/.db) 파싱 방식 (app/core/db_ingest.py)
+# - sql   : 테이블마다 GROUP BY 날짜 집계 쿼리 (SQLite 엔진이 합계/개수 계산, 가장 빠름)
+# - stream: 필요한 테이블/컬럼만 chunk 단위로 읽어 날짜별로 바로 누적 (메모리 일정)
+# - json  : 기존 방식 (모든 테이블 → JSON dict → 파싱)
+DB_PARSE_MODE = os.getenv("DB_PARSE_MODE", "sql")
+DB_STREAM_CHUNK_ROWS = 5000  # 커서에서 한 번에 가져오는 행 수
+# 업로드 파싱 / 날짜별 전처리를 프로세스 풀에서 병렬 처리 (app/core/parallel_ingest.py)
+# - 0 / 1이면 사용 안 함 (기존처럼 서버 프로세스의 스레드에서 처리)
+# - CPU 코어 수 이하로 설정 (서버 전체가 풀 1개를 공유)
+# - 날짜 수가 INGEST_PARALLEL_MIN_DAYS보다 적은 업로드(증분 등)는 나누지 않음
+INGEST_PROCESS_WORKERS = int(os.getenv("INGEST_PROCESS_WORKERS", "0"))
+INGEST_PARALLEL_MIN_DAYS = 60
+# 업로드 저장 / LLM 분석 파이프라인
+# - 최근 INGEST_ANALYSIS_HISTORY_DAYS일을 먼저 저장 (분석의 RAG 검색이 기다리는 유일한 저장)
+#   → 최신 날짜 LLM 분석과 나머지 날짜 저장을 동시에 실행, 분석이 끝나면 바로 응답
+# - 나머지 날짜는 백그라운드에서 계속 저장하고 끝난 뒤 워터마크 갱신
+#   (처음 올리는 긴 기록은 분석 시점에 이 기간 밖의 과거가 아직 검색되지 않을 수 있음,
+#    기본 90일 = 최신성 반감기 RAG_RECENCY_HALF_LIFE_DAYS의 3배)
+# - 0이면 기존처럼 전체 저장이 끝난 뒤 분석
+INGEST_PIPELINE = os.getenv("INGEST_PIPELINE", "1") == "1"
+INGEST_ANALYSIS_HISTORY_DAYS = 90
+# 백그라운드 저장 실패 시 저장 단계만 다시 시도 (분석은 다시 하지 않음)
+# - 그래도 실패하면 작업을 대기열로 되돌리고, 다시 실행할 때는 이미 공개한 분석 결과를 재사용
+INGEST_STORE_MAX_ATTEMPTS = 3
+INGEST_STORE_RETRY_DELAY_SEC = 2.0  # 재시도 대기 (초, 시도 횟수만큼 늘어남)
+# ZIP 증분 업로드: 사용자/플랫폼/원본 테이블별 마지막 local_date(워터마크)를 기록해 두고
+# 다음 업로드는 (가장 최근 워터마크 − INGEST_RECHECK_DAYS)일부터만 읽음
+# - 처음 보는 테이블이 있으면 전체를 다시 읽음 / json 방식은 항상 전체
+# - 재확인 기간보다 늦게 들어온 과거 데이터는 반영되지 않음 (끄면 매번 전체)
+INGEST_INCREMENTAL = os.getenv("INGEST_INCREMENTAL", "1") == "1"
+INGEST_RECHECK_DAYS = 3
+# 심박수 series 등 epoch millis → 현지 날짜 변환 기준 (UTC 오프셋, 분 / 기본: KST +9시간)
+HEALTH_DATA_UTC_OFFSET_MINUTES = int(os.getenv("HEALTH_DATA_UTC_OFFSET_MINUTES", "540"))
+# 심박수 날짜별 추가 통계 (최소 / 최대 / HEART_RATE_PERCENTILES 백분위수, sql·stream 방식)
+# - raw의 heart_rate_min / heart_rate_max / heart_rate_p<q> (day_store) + 요약 텍스트 심박수 범위
+# - 켜면 sql 방식은 (날짜, bpm)별 개수를 읽어 히스토그램으로 계산 → 날짜별 SUM/COUNT 1번보다 느림
+# - 끄면 (기본) 날짜별 평균 심박수만
+HEART_RATE_SERIES_STATS = os.getenv("HEART_RATE_SERIES_STATS", "0") == "1"
+HEART_RATE_PERCENTILES = (5, 50, 95)
+
+# 같은 날짜에 출처가 여러 개일 때(zip_samsung, api_samsung 등) 대표 기록 선택 규칙
+# - 앞에 있는 출처(접두사 매칭)가 우선, 순위가 같으면 최근 업데이트가 우선
+# - 비어 있으면 최근 업데이트만 비교 (예: SOURCE_PRECEDENCE=api,zip)
+SOURCE_PRECEDENCE = [
+    prefix.strip()
+    for prefix in os.getenv("SOURCE_PRECEDENCE", "").split(",")
+    if prefix.strip()
+]
+
+# ============================================================
+# 임베딩 설정
+# ============================================================
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")  # openai | local
+EMBEDDING_MODEL = "text-embedding-3-small"
+# openai 벡터 차원 (text-embedding-3-small 원본 1536, 줄이면 저장/검색 비용 감소)
+# - 원본과 다르면 별도 컬렉션(summaries_openai<차원>) 사용
+# - 기존 벡터는 서버 시작 시 migrate_embedding_dimensions로 잘라서 이전 (재임베딩 없음)
+EMBEDDING_NATIVE_DIMENSIONS = 1536
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", EMBEDDING_NATIVE_DIMENSIONS))
+LOCAL_EMBEDDING_DIM = 256  # local 백엔드 벡터 차원
+EMBEDDING_CACHE_PATH = f"{LOCAL_STORE_DIR}/embedding_cache.sqlite3"
+EMBEDDING_CACHE_MAX_ENTRIES = 50000  # 약 300MB (1536차원 float32 기준)
+# 임베딩 캐시 벡터 저장 형식: float32 | float16 | int8 (int8이면 약 1/4 크기)
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")
+EMBEDDING_BATCH_SIZE = 100  # 요청당 최대 텍스트 개수
+EMBEDDING_MAX_TOKENS_PER_BATCH = 100000  # 요청당 최대 토큰 (OpenAI 한도 300k)
+EMBEDDING_CONCURRENCY = 4  # 동시에 보내는 청크 요청 수
+EMBEDDING_MAX_RETRIES = 3  # 청크 실패 시 재시도 횟수
+EMBEDDING_RETRY_BASE_DELAY = 1.0  # 재시도 대기 (초, 지수 백오프)
 
 # ============================================================
 # RAG 설정
@@ -46,9 +155,42 @@ CHROMA_COLLECTION_NAME = "summaries"
 RAG_TOP_K = 3
 RAG_SIMILARITY_THRESHOLD = 0.5
 
+# 검색 결과 재정렬 (유사도 + 최신성)
+RAG_FETCH_MULTIPLIER = 2  # 후보 수 = top_k × 배수 (재정렬 여유분)
+RAG_MAX_DISTANCE = 0.8  # 코사인 거리 상한 (유사도 0.2 미만은 프롬프트에 넣지 않음)
+RAG_SIMILARITY_WEIGHT = 0.7  # 점수 = 유사도 × 가중치 + 최신성 × 가중치
+RAG_RECENCY_WEIGHT = 0.3
+RAG_RECENCY_HALF_LIFE_DAYS = 30  # 최신성 점수가 절반이 되는 기간 (일)
+
+# 유사 검색 경로: chroma (공유 HNSW 인덱스) | numpy (사용자별 행렬 brute-force, 정확)
+VECTOR_SEARCH_MODE = os.getenv("VECTOR_SEARCH_MODE", "chroma")
+USER_VECTOR_CACHE_MAX_USERS = 200  # 메모리에 올려둘 최대 사용자 수
+USER_VECTOR_CACHE_DTYPE = os.getenv(
+    "USER_VECTOR_CACHE_DTYPE", "float32"
+)  # float32 | float16 | int8
+
+# 파싱된 일별 기록 캐시 (최근 N일 / 날짜 조회 반복 시 SQLite + JSON 파싱 생략)
+# - 행렬 캐시와 함께 서버 프로세스마다 따로 유지, 다른 프로세스의 저장/삭제는
+#   day_store 공유 세대 번호(cache_versions)로 확인
+RECORD_CACHE_MAX_RECORDS = 20000  # 최대 기록 수 (기록 1개 약 2KB)
+RECORD_CACHE_MAX_VIEWS = 5000  # 최대 조회 결과 수 (사용자 × 조회 종류)
+# 사용자별 공유 세대 번호를 다시 읽는 간격 (초)
+# → 캐시 hit는 이 시간 동안 SQLite 조회 없음, 다른 프로세스의 저장은 최대 이만큼 늦게 반영
+# (같은 프로세스의 저장은 바로 무효화)
+CACHE_VERSION_CHECK_SEC = 1.0
+
+# 비동기 API(async_vector_store) 전용 스레드 수 (ChromaDB/SQLite 동시 호출 상한)
+VECTOR_STORE_MAX_WORKERS = 8
+
+# 앱 자동 업로드 지연 저장 (사용자별로 모아서 임베딩 1번 + upsert 1번)
+# - 날짜별 기록(day_store)은 바로 저장, 벡터만 늦게 저장 (유사 검색 반영이 늦어짐)
+AUTO_UPLOAD_WRITE_BEHIND = os.getenv("AUTO_UPLOAD_WRITE_BEHIND", "1") == "1"
+WRITE_BEHIND_WINDOW_SEC = 3.0  # 마지막 저장 후 이 시간 동안 추가 저장이 없으면 flush
+WRITE_BEHIND_MAX_DELAY_SEC = 30.0  # 첫 저장 후 최대 대기 시간
+WRITE_BEHIND_MAX_ITEMS = 31  # 사용자별 최대 묶음 크기
+
 # ============================================================
 # 기타 설정
 # ============================================================
 DEFAULT_DIFFICULTY = "중"
 DEFAULT_DURATION = 30
-EMBEDDING_BATCH_SIZE = 100
@@ -0,0 +1,205 @@
+"""
+오래된 일별 기록 보관소 (cold tier, gzip NDJSON)
+
+- 사용자별 디렉터리 / 월별 파일 1개: {root}/{user_id 해시}/{YYYY-MM}.ndjson.gz
+- 한 줄 = 기록 1개 (조회 결과와 같은 형식 + is_canonical)
+- 날짜 범위 조회는 겹치는 월 파일만 읽음
+- 쓰기는 임시 파일 → os.replace (중간에 멈춰도 기존 파일 유지)
+- 같은 월을 다시 보관하면 doc_id 기준으로 병합 (새 기록 우선)
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+
+
+class ArchiveStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------
+    # 경로
+    # ------------------------------------------------
+    def _user_dir(self, user_id: str) -> str:
+        return os.path.join(
+            self.root, hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:20]
+        )
+
+    def _month_path(self, user_id: str, month: str) -> str:
+        return os.path.join(self._user_dir(user_id), f"{month}.ndjson.gz")
+
+    @staticmethod
+    def _month_of(timestamp: int) -> str:
+        return f"{timestamp // 10000:04d}-{timestamp // 100 % 100:02d}"
+
+    def months(self, user_id: str) -> list:
+        """보관된 월 목록 (오래된 순, YYYY-MM)"""
+        directory = self._user_dir(user_id)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            name[: -len(".ndjson.gz")]
+            for name in os.listdir(directory)
+            if name.endswith(".ndjson.gz")
+        )
+
+    # ------------------------------------------------
+    # 읽기 / 쓰기
+    # ------------------------------------------------
+    def _read_month(self, user_id: str, month: str) -> list:
+        path = self._month_path(user_id, month)
+        if not os.path.exists(path):
+            return []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def write(self, user_id: str, records: list) -> int:
+        """
+        기록 보관 (records: 조회 결과 형식 + is_canonical)
+
+        Returns:
+            쓴 월 파일 수
+        """
+        by_month = {}
+        for record in records:
+            by_month.setdefault(self._month_of(record["timestamp"]), []).append(record)
+
+        directory = self._user_dir(user_id)
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            for month, month_records in by_month.items():
+                merged = {r["document_id"]: r for r in self._read_month(user_id, month)}
+                for record in month_records:
+                    # 같은 날짜의 대표 기록이 바뀌었으면 예전 대표 표시 해제
+                    if record.get("is_canonical"):
+                        for old in merged.values():
+                            if old["timestamp"] == record["timestamp"]:
+                                old["is_canonical"] = False
+                    merged[record["document_id"]] = record
+
+                ordered = sorted(
+                    merged.values(),
+                    key=lambda r: (r["timestamp"], r.get("updated_at") or ""),
+                    reverse=True,
+                )
+
+                path = self._month_path(user_id, month)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                    for record in ordered:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                os.replace(tmp_path, path)
+
+        return len(by_month)
+
+    def read_range(
+        self,
+        user_id: str,
+        start_timestamp: int,
+        end_timestamp: int,
+        canonical_only: bool = True,
+    ) -> list:
+        """날짜 범위(YYYYMMDD 정수, 양 끝 포함) 기록, 최신 날짜순"""
+        start_month = self._month_of(start_timestamp)
+        end_month = self._month_of(end_timestamp)
+
+        found = []
+        for month in reversed(self.months(user_id)):
+            if month < start_month or month > end_month:
+                continue
+            for record in self._read_month(user_id, month):
+                if not start_timestamp <= record["timestamp"] <= end_timestamp:
+                    continue
+                if canonical_only and not record.get("is_canonical"):
+                    continue
+                found.append(record)
+
+        return sorted(
+            found,
+            key=lambda r: (r["timestamp"], r.get("updated_at") or ""),
+            reverse=True,
+        )
+
+    def read_latest(self, user_id: str, days: int, before_timestamp: int = None) -> list:
+        """before_timestamp 이전 최근 N개 날짜의 대표 기록 (최신 날짜순)"""
+        found = []
+        for month in reversed(self.months(user_id)):
+            if len(found) >= days:
+                break
+            records = [
+                record
+                for record in self._read_month(user_id, month)
+                if record.get("is_canonical")
+                and (before_timestamp is None or record["timestamp"] < before_timestamp)
+            ]
+            found.extend(sorted(records, key=lambda r: r["timestamp"], reverse=True))
+        return found[:days]
+
+    def rerank_canonical(self, rank) -> int:
+        """
+        보관된 모든 날짜의 대표 기록 다시 선택 (rank(record) 가장 큰 기록)
+
+        - 사용자 디렉터리 / 월 파일 전체를 훑음 (user_id 없이, 마이그레이션용)
+        - 대표 기록이 바뀐 월 파일만 다시 씀
+
+        Returns:
+            보관된 날짜 수
+        """
+        days = 0
+        if not os.path.isdir(self.root):
+            return 0
+
+        with self._lock:
+            for name in os.listdir(self.root):
+                directory = os.path.join(self.root, name)
+                if not os.path.isdir(directory):
+                    continue
+                for file_name in os.listdir(directory):
+                    if not file_name.endswith(".ndjson.gz"):
+                        continue
+                    path = os.path.join(directory, file_name)
+                    with gzip.open(path, "rt", encoding="utf-8") as f:
+                        records = [json.loads(line) for line in f if line.strip()]
+
+                    by_day = {}
+                    for record in records:
+                        by_day.setdefault(record["timestamp"], []).append(record)
+                    days += len(by_day)
+
+                    changed = False
+                    for day_records in by_day.values():
+                        best = max(day_records, key=rank)
+                        for record in day_records:
+                            flag = record is best
+                            if bool(record.get("is_canonical")) != flag:
+                                record["is_canonical"] = flag
+                                changed = True
+                    if not changed:
+                        continue
+
+                    tmp_path = f"{path}.tmp"
+                    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                        for record in records:
+                            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    os.replace(tmp_path, path)
+
+        return days
+
+    def stats(self) -> dict:
+        """보관소 현황 (사용자 수 / 월 파일 수 / 바이트)"""
+        users = files = size = 0
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                directory = os.path.join(self.root, name)
+                if not os.path.isdir(directory):
+                    continue
+                users += 1
+                for file_name in os.listdir(directory):
+                    if file_name.endswith(".ndjson.gz"):
+                        files += 1
+                        size += os.path.getsize(os.path.join(directory, file_name))
+        return {"root": self.root, "users": users, "files": files, "bytes": size}
@@ -0,0 +1,113 @@
+"""
+vector_store 비동기 API (async def 서비스/엔드포인트용)
+
+- 모든 호출은 전용 executor(VECTOR_STORE_MAX_WORKERS)에서 실행 → 이벤트 루프 블로킹 없음
+- 같은 조회가 동시에 들어오면 백엔드 호출 1번으로 합침 (기다리는 쪽은 스레드 점유 없음)
+- 저장/삭제는 합치지 않음
+
+사용 예:
+    from app.core import async_vector_store
+
+    summaries = await async_vector_store.get_recent_summaries(user_id, limit=7)
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import VECTOR_STORE_MAX_WORKERS
+from app.core import vector_store
+from app.utils.singleflight import AsyncSingleFlight, make_key
+
+executor = ThreadPoolExecutor(
+    max_workers=VECTOR_STORE_MAX_WORKERS, thread_name_prefix="vector-store"
+)
+
+_read_flights = AsyncSingleFlight()
+
+
+async def run_in_vector_executor(func, *args, **kwargs):
+    """동기 vector_store 함수를 전용 executor에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def _coalesced_read(func, *args, **kwargs):
+    key = make_key(func.__name__, args, kwargs)
+    return await _read_flights.do(
+        key, lambda: run_in_vector_executor(func, *args, **kwargs)
+    )
+
+
+# ------------------------------------------------
+# 조회 (동시 중복 요청 합침)
+# ------------------------------------------------
+async def search_similar_summaries(
+    query_dict: dict, user_id: str, top_k: int = 3, **filters
+) -> dict:
+    return await _coalesced_read(
+        vector_store.search_similar_summaries, query_dict, user_id, top_k, **filters
+    )
+
+
+async def get_recent_summaries(user_id: str, limit: int = 7) -> list:
+    return await _coalesced_read(vector_store.get_recent_summaries, user_id, limit)
+
+
+async def get_summaries_by_date(user_id: str, target_date: str) -> list:
+    return await _coalesced_read(
+        vector_store.get_summaries_by_date, user_id, target_date
+    )
+
+
+async def get_summaries_by_date_range(
+    user_id: str, start_date: str, end_date: str
+) -> list:
+    return await _coalesced_read(
+        vector_store.get_summaries_by_date_range, user_id, start_date, end_date
+    )
+
+
+# ------------------------------------------------
+# 저장 / 삭제
+# ------------------------------------------------
+async def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
+    return await run_in_vector_executor(
+        vector_store.save_daily_summary, summary, user_id, source
+    )
+
+
+async def queue_daily_summary(summary: dict, user_id: str, source: str = "api"):
+    return await run_in_vector_executor(
+        vector_store.queue_daily_summary, summary, user_id, source
+    )
+
+
+async def save_daily_summaries_batch(
+    summaries: list[dict], user_id: str, source: str = "zip"
+):
+    return await run_in_vector_executor(
+        vector_store.save_daily_summaries_batch, summaries, user_id, source
+    )
+
+
+async def archive_daily_summaries(
+    summaries: list[dict], user_id: str, source: str = "zip"
+):
+    return await run_in_vector_executor(
+        vector_store.archive_daily_summaries, summaries, user_id, source
+    )
+
+
+async def delete_daily_summaries(doc_ids: list[str]):
+    return await run_in_vector_executor(vector_store.delete_daily_summaries, doc_ids)
+
+
+def get_coalescing_stats() -> dict:
+    """조회 합치기 현황 (디버깅용)"""
+    return {
+        "async": _read_flights.stats(),
+        "threads": vector_store.read_flights.stats(),
+    }
@@ -5,14 +5,13 @@ Chat Generator - 개선 버전
 - 비교/패턴 키워드: 의미 유사도 검색 활용
 """
 
-import os
 import json
-from openai import OpenAI
 
 from app.core.chatbot_engine.intent_classifier import classify_intent
 from app.core.chatbot_engine.persona import get_persona_prompt
 from app.core.chatbot_engine.rag_query import query_health_data
 from app.core.llm_analysis import run_llm_analysis
+from app.core.openai_client import get_openai_client
 from app.core.health_interpreter import (
     interpret_health_data,
     build_health_context_for_llm,
@@ -25,8 +24,10 @@ CHAT_MAX_TOKENS = 400
 
 class ChatGenerator:
 
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    @property
+    def client(self):
+        # 첫 호출 시 생성되는 공용 클라이언트 (import/서비스 생성 시 네트워크 없음)
+        return get_openai_client()
 
     # ================================================================
     # 1) OpenAI 호출
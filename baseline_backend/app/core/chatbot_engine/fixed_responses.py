@@ -7,8 +7,6 @@ Fixed Responses - 고정형 질문 응답 생성기 (개선 버전)
 """
 
 import json
-from openai import OpenAI
-import os
 
 from app.config import (
     LLM_MODEL_MAIN,
@@ -18,6 +16,7 @@ from app.config import (
     DEFAULT_DURATION,
 )
 from app.core.chatbot_engine.persona import get_persona_prompt
+from app.core.openai_client import get_openai_client
 from app.core.vector_store import get_recent_summaries, search_similar_summaries
 from app.core.llm_analysis import run_llm_analysis
 from app.core.health_interpreter import (
@@ -29,8 +28,6 @@ from app.core.health_interpreter import (
     interpret_activity,
 )
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 
 def generate_fixed_response(user_id: str, question_type: str, character: str):
     """
@@ -275,7 +272,7 @@ def _generate_weekly_report(
 5. 3-4문단으로 자연스럽게 작성하세요 (리스트/불릿 금지)
 """
 
-    resp = client.chat.completions.create(
+    resp = get_openai_client().chat.completions.create(
         model=LLM_MODEL_MAIN,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=LLM_MAX_TOKENS,
@@ -491,7 +488,7 @@ def _generate_steps_report(persona, character, raw, summaries, health_info):
 5. 2-3문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
+    resp = get_openai_client().chat.completions.create(
         model=LLM_MODEL_MAIN,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=600,
@@ -549,7 +546,7 @@ def _generate_sleep_report(persona, character, raw, summaries, health_info):
 5. 2-3문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
+    resp = get_openai_client().chat.completions.create(
         model=LLM_MODEL_MAIN,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=600,
@@ -594,7 +591,7 @@ def _generate_heart_rate_report(persona, character, raw, health_info):
 5. 2-3문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
+    resp = get_openai_client().chat.completions.create(
         model=LLM_MODEL_MAIN,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=600,
@@ -650,7 +647,7 @@ def _generate_health_score_report(persona, character, raw, health_info):
 6. 3-4문단으로 자연스럽게 (리스트 금지)
 """
 
-    resp = client.chat.completions.create(
+    resp = get_openai_client().chat.completions.create(
         model=LLM_MODEL_MAIN,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=700,
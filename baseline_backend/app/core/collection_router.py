@@ -0,0 +1,103 @@
+"""
+사용자 → ChromaDB 컬렉션(샤드) 라우팅
+
+- single: 모든 사용자가 기본 컬렉션 1개 공유 (기존 방식)
+- hash  : user_id 해시로 N개 버킷 컬렉션에 분산 ({기본이름}_p000 ~)
+- user  : 사용자마다 전용 컬렉션 ({기본이름}_u_{user_id 해시})
+
+샤드는 처음 필요할 때 생성하고, 한 번 연 컬렉션 핸들은 재사용한다.
+사용자 1명의 검색 비용이 전체 사용자 수가 아니라 해당 샤드 크기에 비례하게 된다.
+"""
+
+import hashlib
+import threading
+
+PARTITION_MODES = ("single", "hash", "user")
+
+
+class CollectionRouter:
+    def __init__(
+        self,
+        client,
+        base_name: str,
+        mode: str = "single",
+        buckets: int = 64,
+        metadata: dict = None,
+    ):
+        if mode not in PARTITION_MODES:
+            raise ValueError(
+                f"❌ 지원하지 않는 컬렉션 분할 방식: {mode} "
+                f"(사용 가능: {', '.join(PARTITION_MODES)})"
+            )
+
+        self.client = client
+        self.base_name = base_name
+        self.mode = mode
+        self.buckets = buckets
+        self.metadata = metadata or {}
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------
+    # 이름 규칙
+    # ------------------------------------------------
+    @staticmethod
+    def _user_hash(user_id: str) -> str:
+        return hashlib.sha1(user_id.encode("utf-8")).hexdigest()
+
+    def shard_name(self, user_id: str) -> str:
+        """user_id가 속한 컬렉션 이름"""
+        if self.mode == "hash":
+            bucket = int(self._user_hash(user_id)[:8], 16) % self.buckets
+            return f"{self.base_name}_p{bucket:03d}"
+        if self.mode == "user":
+            # ChromaDB 이름 규칙(3~63자, 영문/숫자/._-)을 지키기 위해 해시 사용
+            return f"{self.base_name}_u_{self._user_hash(user_id)[:20]}"
+        return self.base_name
+
+    def _is_shard_name(self, name: str) -> bool:
+        if self.mode == "hash":
+            return name.startswith(f"{self.base_name}_p")
+        if self.mode == "user":
+            return name.startswith(f"{self.base_name}_u_")
+        return name == self.base_name
+
+    # ------------------------------------------------
+    # 컬렉션 조회
+    # ------------------------------------------------
+    def get(self, name: str):
+        """이름으로 컬렉션 (없으면 생성)"""
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
+
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self.client.get_or_create_collection(
+                    name=name, metadata=self.metadata
+                )
+                self._collections[name] = collection
+        return collection
+
+    def for_user(self, user_id: str):
+        """사용자 샤드 컬렉션 (처음이면 생성)"""
+        return self.get(self.shard_name(user_id))
+
+    def base(self):
+        """기본 컬렉션 (single 모드 저장소 / 분할 전 예전 문서)"""
+        return self.get(self.base_name)
+
+    def list_shards(self) -> list:
+        """
+        현재 분할 방식의 샤드 목록
+
+        Returns:
+            [{"name": ..., "count": ...}, ...] (이름순)
+        """
+        shards = []
+        for collection in self.client.list_collections():
+            name = collection if isinstance(collection, str) else collection.name
+            if self._is_shard_name(name):
+                shards.append({"name": name, "count": self.get(name).count()})
+        return sorted(shards, key=lambda shard: shard["name"])
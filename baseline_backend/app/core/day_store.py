@@ -0,0 +1,617 @@
+"""
+일별 건강 기록 저장소 (SQLite, WAL 모드)
+
+- (user_id, date, source)당 1행, 정규화된 건강 지표는 타입 있는 컬럼으로 저장
+- ChromaDB에는 id / 벡터 / 작은 필터용 메타데이터만 두고,
+  raw 지표가 필요한 조회는 여기서 인덱스 쿼리 1번으로 처리 (JSON 파싱 없음)
+- 같은 날짜에 출처가 여러 개면 저장 시점에 대표(canonical) 기록 1개를 정해
+  canonical_days에 기록 → 조회할 때 중복 제거 불필요 (출처별 원본은 그대로 보관)
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+from app.config import DAY_STORE_PATH, SOURCE_PRECEDENCE
+
+
+# normalize_raw() 결과 키 → 컬럼 타입
+RAW_METRIC_COLUMNS = {
+    "sleep_min": "REAL",
+    "sleep_hr": "REAL",
+    "weight": "REAL",
+    "height_m": "REAL",
+    "bmi": "REAL",
+    "body_fat": "REAL",
+    "lean_body": "REAL",
+    "distance_km": "REAL",
+    "steps": "INTEGER",
+    "steps_cadence": "REAL",
+    "exercise_min": "REAL",
+    "flights": "INTEGER",
+    "active_calories": "REAL",
+    "total_calories": "REAL",
+    "calories_intake": "REAL",
+    "oxygen_saturation": "REAL",
+    "heart_rate": "REAL",
+    "resting_heart_rate": "REAL",
+    "walking_heart_rate": "REAL",
+    "hrv": "REAL",
+    "systolic": "REAL",
+    "diastolic": "REAL",
+    "glucose": "REAL",
+}
+
+_RECORD_COLUMNS = [
+    "doc_id",
+    "user_id",
+    "date",
+    "source",
+    "timestamp",
+    "platform",
+    "created_at",
+    "summary_text",
+    "health_score",
+    "recommended_intensity",
+    "updated_at",
+]
+
+_ALL_COLUMNS = _RECORD_COLUMNS + list(RAW_METRIC_COLUMNS) + ["extra_json"]
+
+_local = threading.local()
+
+
+# ------------------------------------------------
+# 1) 연결 / 스키마
+# ------------------------------------------------
+def _connect() -> sqlite3.Connection:
+    """스레드별 연결 (첫 사용 시 파일/테이블 생성)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    directory = os.path.dirname(DAY_STORE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(DAY_STORE_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    metric_columns = ",\n".join(
+        f"{name} {col_type}" for name, col_type in RAW_METRIC_COLUMNS.items()
+    )
+    conn.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS daily_records (
+            user_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            source TEXT NOT NULL,
+            doc_id TEXT NOT NULL UNIQUE,
+            timestamp INTEGER NOT NULL,
+            platform TEXT,
+            created_at TEXT,
+            summary_text TEXT,
+            health_score INTEGER,
+            recommended_intensity TEXT,
+            updated_at TEXT,
+            {metric_columns},
+            extra_json TEXT,
+            PRIMARY KEY (user_id, date, source)
+        );
+        DROP INDEX IF EXISTS idx_daily_records_user_timestamp;
+        CREATE INDEX IF NOT EXISTS idx_daily_records_user_day
+            ON daily_records(user_id, timestamp, updated_at);
+        CREATE TABLE IF NOT EXISTS canonical_days (
+            user_id TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            doc_id TEXT NOT NULL,
+            PRIMARY KEY (user_id, timestamp)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS store_migrations (
+            name TEXT PRIMARY KEY,
+            applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS ingest_watermarks (
+            user_id TEXT NOT NULL,
+            platform TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            last_local_date INTEGER,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, platform, table_name)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS pending_vectors (
+            doc_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            failed_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_pending_vectors_user
+            ON pending_vectors(user_id);
+        CREATE TABLE IF NOT EXISTS cache_versions (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.commit()
+
+    _local.conn = conn
+    return conn
+
+
+def warm_up():
+    """연결/테이블을 미리 준비 (서버 시작 시 선택적으로 호출)"""
+    _connect()
+
+
+# ------------------------------------------------
+# 2) 변환 (record dict ↔ row)
+# ------------------------------------------------
+def _record_to_row(record: dict) -> tuple:
+    raw = record.get("raw") or {}
+    extra = {k: v for k, v in raw.items() if k not in RAW_METRIC_COLUMNS}
+
+    values = [record.get(column) for column in _RECORD_COLUMNS]
+    values += [raw.get(name) for name in RAW_METRIC_COLUMNS]
+    values.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+    return tuple(values)
+
+
+def _row_to_record(row: sqlite3.Row) -> dict:
+    raw = {name: row[name] for name in RAW_METRIC_COLUMNS if row[name] is not None}
+    if row["extra_json"]:
+        raw.update(json.loads(row["extra_json"]))
+
+    return {
+        "document_id": row["doc_id"],
+        "user_id": row["user_id"],
+        "date": row["date"],
+        "timestamp": row["timestamp"],
+        "health_score": row["health_score"],
+        "recommended_intensity": row["recommended_intensity"],
+        "source": row["source"] or "unknown",
+        "platform": row["platform"] or "unknown",
+        "updated_at": row["updated_at"] or "",
+        "created_at": row["created_at"] or "",
+        "raw": raw,
+        "summary_text": row["summary_text"] or "",
+    }
+
+
+# ------------------------------------------------
+# 3) 저장 / 삭제
+# ------------------------------------------------
+def upsert_records(records: list[dict]):
+    """
+    일별 기록 저장 (같은 user_id/date/source는 덮어쓰기)
+
+    record 형식:
+        {doc_id, user_id, date, source, timestamp, platform, created_at,
+         summary_text, health_score, recommended_intensity, updated_at, raw}
+    """
+    if not records:
+        return
+
+    conn = _connect()
+    placeholders = ",".join("?" * len(_ALL_COLUMNS))
+    conn.executemany(
+        f"INSERT OR REPLACE INTO daily_records ({','.join(_ALL_COLUMNS)}) "
+        f"VALUES ({placeholders})",
+        [_record_to_row(record) for record in records],
+    )
+    conn.commit()
+
+
+def delete_records(doc_ids: list[str]):
+    """doc_id 목록 삭제"""
+    if not doc_ids:
+        return
+
+    conn = _connect()
+    conn.executemany(
+        "DELETE FROM daily_records WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids]
+    )
+    conn.commit()
+
+
+# ------------------------------------------------
+# 4) 조회
+# ------------------------------------------------
+def get_records_by_ids(doc_ids: list[str]) -> dict:
+    """
+    doc_id 목록으로 조회 (ChromaDB 검색 결과 → raw 지표 결합용)
+
+    Returns:
+        {doc_id: record} (저장소에 있는 항목만)
+    """
+    if not doc_ids:
+        return {}
+
+    conn = _connect()
+    found = {}
+    unique_ids = list(dict.fromkeys(doc_ids))
+
+    # SQLite 변수 개수 제한(999)을 넘지 않도록 나눠서 조회
+    for start in range(0, len(unique_ids), 500):
+        chunk = unique_ids[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT * FROM daily_records WHERE doc_id IN ({placeholders})", chunk
+        ).fetchall()
+        for row in rows:
+            found[row["doc_id"]] = _row_to_record(row)
+
+    return found
+
+
+def get_user_records(
+    user_id: str,
+    platform: str = None,
+    date: str = None,
+    limit: int = None,
+) -> list:
+    """
+    사용자 기록 조회 (최신 날짜순, 같은 날짜는 최근 업데이트순)
+
+    Args:
+        user_id: 사용자 ID
+        platform: 플랫폼 필터 (platform 컬럼 또는 source에 포함된 경우)
+        date: 특정 날짜만 (YYYY-MM-DD)
+        limit: 최대 개수
+    """
+    query = "SELECT * FROM daily_records WHERE user_id = ?"
+    params = [user_id]
+
+    if platform:
+        query += " AND (platform = ? OR source LIKE ?)"
+        params += [platform, f"%{platform}%"]
+
+    if date:
+        query += " AND timestamp = ?"
+        params.append(int(date.replace("-", "")))
+
+    query += " ORDER BY timestamp DESC, updated_at DESC"
+
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    rows = _connect().execute(query, params).fetchall()
+    return [_row_to_record(row) for row in rows]
+
+
+# ------------------------------------------------
+# 4-1) 날짜 인덱스 조회
+#   - 기본: 날짜별 대표 기록만 (canonical_days 기본키 순서로 읽음)
+#   - canonical_only=False: 출처별 원본 모두 ((user_id, timestamp, updated_at) 인덱스)
+#   - 사용자 전체 기록을 읽지 않고 필요한 날짜 구간만 읽음
+#   - 반환 순서: 최신 날짜순, 같은 날짜는 최근 업데이트순
+# ------------------------------------------------
+_DAY_ORDER = " ORDER BY timestamp DESC, updated_at DESC"
+
+_CANONICAL_SELECT = (
+    "SELECT d.* FROM canonical_days c "
+    "JOIN daily_records d ON d.doc_id = c.doc_id WHERE c.user_id = ?"
+)
+
+
+def get_latest_days(user_id: str, days: int, canonical_only: bool = True) -> list:
+    """최근 N개 날짜의 기록"""
+    if days <= 0:
+        return []
+
+    if canonical_only:
+        query = _CANONICAL_SELECT + " ORDER BY c.timestamp DESC LIMIT ?"
+        params = (user_id, days)
+    else:
+        query = (
+            "SELECT * FROM daily_records WHERE user_id = ? AND timestamp IN ("
+            "SELECT DISTINCT timestamp FROM daily_records WHERE user_id = ? "
+            "ORDER BY timestamp DESC LIMIT ?)" + _DAY_ORDER
+        )
+        params = (user_id, user_id, days)
+
+    rows = _connect().execute(query, params).fetchall()
+    return [_row_to_record(row) for row in rows]
+
+
+def get_canonical_doc_ids(user_id: str, timestamps: set) -> dict:
+    """날짜(YYYYMMDD 정수)별 대표 기록 doc_id → {timestamp: doc_id}"""
+    timestamps = list(timestamps)
+    if not timestamps:
+        return {}
+
+    conn = _connect()
+    found = {}
+    for start in range(0, len(timestamps), 500):
+        chunk = timestamps[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            "SELECT timestamp, doc_id FROM canonical_days "
+            f"WHERE user_id = ? AND timestamp IN ({placeholders})",
+            [user_id, *chunk],
+        ).fetchall()
+        found.update((row["timestamp"], row["doc_id"]) for row in rows)
+    return found
+
+
+def get_records_on_date(
+    user_id: str, timestamp: int, canonical_only: bool = True
+) -> list:
+    """특정 날짜(YYYYMMDD 정수)의 기록"""
+    if canonical_only:
+        query = _CANONICAL_SELECT + " AND c.timestamp = ?"
+    else:
+        query = (
+            "SELECT * FROM daily_records WHERE user_id = ? AND timestamp = ?"
+            + _DAY_ORDER
+        )
+
+    rows = _connect().execute(query, (user_id, timestamp)).fetchall()
+    return [_row_to_record(row) for row in rows]
+
+
+def get_records_in_range(
+    user_id: str,
+    start_timestamp: int,
+    end_timestamp: int,
+    canonical_only: bool = True,
+) -> list:
+    """날짜 범위(YYYYMMDD 정수, 양 끝 포함)의 기록"""
+    if canonical_only:
+        query = (
+            _CANONICAL_SELECT
+            + " AND c.timestamp BETWEEN ? AND ? ORDER BY c.timestamp DESC"
+        )
+    else:
+        query = (
+            "SELECT * FROM daily_records "
+            "WHERE user_id = ? AND timestamp BETWEEN ? AND ?" + _DAY_ORDER
+        )
+
+    rows = (
+        _connect().execute(query, (user_id, start_timestamp, end_timestamp)).fetchall()
+    )
+    return [_row_to_record(row) for row in rows]
+
+
+# ------------------------------------------------
+# 4-2) 대표 기록(canonical) 선택 (저장/삭제 시점에 갱신)
+# ------------------------------------------------
+def canonical_rank(source: str, updated_at: str) -> tuple:
+    """
+    대표 기록 우선순위 (클수록 우선)
+
+    1. SOURCE_PRECEDENCE에서 앞에 있는 출처
+    2. 최근 업데이트 (updated_at)
+    3. 출처 이름 (완전히 같을 때 결과를 고정하기 위함)
+    """
+    source = source or ""
+    precedence = 0
+    for index, prefix in enumerate(SOURCE_PRECEDENCE):
+        if source.startswith(prefix):
+            precedence = len(SOURCE_PRECEDENCE) - index
+            break
+    return precedence, updated_at or "", source
+
+
+def refresh_canonical_days(days: set) -> dict:
+    """
+    지정한 (user_id, timestamp) 날짜들의 대표 기록 다시 선택
+
+    Returns:
+        {doc_id: 대표 여부} (해당 날짜의 모든 기록, ChromaDB 플래그 갱신용)
+    """
+    if not days:
+        return {}
+
+    conn = _connect()
+    flags = {}
+
+    for user_id, timestamp in days:
+        rows = conn.execute(
+            "SELECT doc_id, source, updated_at FROM daily_records "
+            "WHERE user_id = ? AND timestamp = ?",
+            (user_id, timestamp),
+        ).fetchall()
+
+        if not rows:
+            conn.execute(
+                "DELETE FROM canonical_days WHERE user_id = ? AND timestamp = ?",
+                (user_id, timestamp),
+            )
+            continue
+
+        winner = max(
+            rows, key=lambda row: canonical_rank(row["source"], row["updated_at"])
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO canonical_days (user_id, timestamp, doc_id) "
+            "VALUES (?, ?, ?)",
+            (user_id, timestamp, winner["doc_id"]),
+        )
+        for row in rows:
+            flags[row["doc_id"]] = row["doc_id"] == winner["doc_id"]
+
+    conn.commit()
+    return flags
+
+
+def get_all_day_keys() -> set:
+    """저장된 모든 (user_id, timestamp) 날짜 (대표 기록 전체 재계산용)"""
+    rows = (
+        _connect()
+        .execute("SELECT DISTINCT user_id, timestamp FROM daily_records")
+        .fetchall()
+    )
+    return {(row["user_id"], row["timestamp"]) for row in rows}
+
+
+# ------------------------------------------------
+# 4-3) 보관(cold tier) 대상 조회
+# ------------------------------------------------
+def get_users_with_days_before(timestamp: int) -> list:
+    """timestamp(YYYYMMDD) 이전 날짜 기록이 있는 사용자"""
+    rows = (
+        _connect()
+        .execute(
+            "SELECT DISTINCT user_id FROM daily_records WHERE timestamp < ?",
+            (timestamp,),
+        )
+        .fetchall()
+    )
+    return [row["user_id"] for row in rows]
+
+
+def get_records_before(user_id: str, timestamp: int) -> list:
+    """timestamp 이전 날짜의 모든 출처 기록 (is_canonical 포함, 최신 날짜순)"""
+    rows = (
+        _connect()
+        .execute(
+            "SELECT d.*, c.doc_id IS NOT NULL AS is_canonical FROM daily_records d "
+            "LEFT JOIN canonical_days c ON c.doc_id = d.doc_id "
+            "WHERE d.user_id = ? AND d.timestamp < ? "
+            "ORDER BY d.timestamp DESC, d.updated_at DESC",
+            (user_id, timestamp),
+        )
+        .fetchall()
+    )
+    return [
+        {**_row_to_record(row), "is_canonical": bool(row["is_canonical"])}
+        for row in rows
+    ]
+
+
+# ------------------------------------------------
+# 5) 일회성 마이그레이션 기록
+# ------------------------------------------------
+def is_migration_applied(name: str) -> bool:
+    row = (
+        _connect()
+        .execute("SELECT 1 FROM store_migrations WHERE name = ?", (name,))
+        .fetchone()
+    )
+    return row is not None
+
+
+def mark_migration_applied(name: str):
+    conn = _connect()
+    conn.execute("INSERT OR IGNORE INTO store_migrations (name) VALUES (?)", (name,))
+    conn.commit()
+
+
+# ------------------------------------------------
+# 6) 업로드 증분 워터마크 (사용자 / 플랫폼 / 원본 테이블별 마지막 local_date)
+#   - last_local_date가 NULL이면 "테이블은 있었지만 행이 없었음"
+#   - 더 오래된 내보내기 파일을 올려도 뒤로 가지 않음 (MAX)
+# ------------------------------------------------
+def get_ingest_watermarks(user_id: str, platform: str) -> dict:
+    """{원본 테이블: last_local_date 또는 None}"""
+    rows = (
+        _connect()
+        .execute(
+            "SELECT table_name, last_local_date FROM ingest_watermarks "
+            "WHERE user_id = ? AND platform = ?",
+            (user_id, platform),
+        )
+        .fetchall()
+    )
+    return {row["table_name"]: row["last_local_date"] for row in rows}
+
+
+def update_ingest_watermarks(user_id: str, platform: str, last_days: dict):
+    """last_days: {원본 테이블: 이번에 읽은 마지막 local_date 또는 None}"""
+    if not last_days:
+        return
+
+    conn = _connect()
+    conn.executemany(
+        """
+        INSERT INTO ingest_watermarks (user_id, platform, table_name, last_local_date)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, platform, table_name) DO UPDATE SET
+            last_local_date = CASE
+                WHEN ingest_watermarks.last_local_date IS NULL
+                    THEN excluded.last_local_date
+                WHEN excluded.last_local_date IS NULL
+                    THEN ingest_watermarks.last_local_date
+                ELSE MAX(ingest_watermarks.last_local_date, excluded.last_local_date)
+            END,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        [(user_id, platform, table, day) for table, day in last_days.items()],
+    )
+    conn.commit()
+
+
+# ------------------------------------------------
+# 7) 벡터 저장 실패 기록 (day_store에는 있지만 ChromaDB에 없는 문서)
+#   - 지연 저장이 재시도 한도를 넘으면 기록 → 다음 저장 성공 / 서버 시작 때 다시 저장
+# ------------------------------------------------
+def mark_pending_vectors(user_id: str, doc_ids: list[str]):
+    if not doc_ids:
+        return
+    conn = _connect()
+    conn.executemany(
+        "INSERT OR REPLACE INTO pending_vectors (doc_id, user_id) VALUES (?, ?)",
+        [(doc_id, user_id) for doc_id in doc_ids],
+    )
+    conn.commit()
+
+
+def get_pending_vectors(user_id: str = None) -> dict:
+    """{user_id: [doc_id, ...]} (user_id를 주면 그 사용자만)"""
+    query = "SELECT user_id, doc_id FROM pending_vectors"
+    params = ()
+    if user_id is not None:
+        query += " WHERE user_id = ?"
+        params = (user_id,)
+
+    pending = {}
+    for row in _connect().execute(query, params).fetchall():
+        pending.setdefault(row["user_id"], []).append(row["doc_id"])
+    return pending
+
+
+def clear_pending_vectors(doc_ids: list[str]):
+    if not doc_ids:
+        return
+    conn = _connect()
+    conn.executemany(
+        "DELETE FROM pending_vectors WHERE doc_id = ?", [(doc_id,) for doc_id in doc_ids]
+    )
+    conn.commit()
+
+
+# ------------------------------------------------
+# 8) 캐시 세대 번호 (프로세스 간 캐시 무효화)
+#   - 저장/삭제한 프로세스가 사용자별 번호를 올림 → 다른 프로세스의 캐시는 조회할 때
+#     번호가 바뀌었으면 버리고 다시 읽음 (record_cache / user_vector_cache)
+#   - ALL_USERS 행은 전체 무효화용 (마이그레이션 등), 사용자 번호에 더해서 비교
+# ------------------------------------------------
+ALL_USERS = "*"
+
+
+def bump_cache_versions(user_ids):
+    """user_ids의 세대 번호 증가 (None이면 전체 사용자)"""
+    keys = [ALL_USERS] if user_ids is None else list(user_ids)
+    if not keys:
+        return
+    conn = _connect()
+    conn.executemany(
+        "INSERT INTO cache_versions (user_id, version) VALUES (?, 1) "
+        "ON CONFLICT(user_id) DO UPDATE SET version = version + 1",
+        [(key,) for key in keys],
+    )
+    conn.commit()
+
+
+def get_cache_version(user_id: str) -> int:
+    """사용자 세대 번호 + 전체 세대 번호 (저장/삭제가 있었으면 이전보다 커짐)"""
+    row = _connect().execute(
+        "SELECT COALESCE(SUM(version), 0) FROM cache_versions WHERE user_id IN (?, ?)",
+        (user_id, ALL_USERS),
+    ).fetchone()
+    return row[0]
@@ -0,0 +1,459 @@
+"""
+업로드된 Health Connect DB → 날짜별 raw 추출
+
+파싱 방식 (DB_PARSE_MODE):
+- stream: 파서가 쓰는 테이블/컬럼만 SELECT, 커서를 chunk 단위로 읽으면서
+          날짜별 running 합계(DayAccumulator)에 바로 누적
+          → 테이블 전체를 메모리에 올리지 않음 (최대 메모리 ≈ 날짜 수에 비례)
+- sql   : 테이블마다 GROUP BY 날짜 집계 쿼리 1번 (SUM / COUNT를 SQLite 엔진이 계산)
+          → Python으로 넘어오는 행 = 날짜 수
+          (HEART_RATE_SERIES_STATS면 심박수 series만 (날짜, bpm)별 개수 → 히스토그램)
+- json  : 기존 방식 (db_to_json으로 모든 테이블 SELECT * → dict → 파싱)
+
+세 방식의 결과 형식은 같다 (parse_db_json_to_raw_data_by_day 참고).
+HEART_RATE_SERIES_STATS면 sql / stream 방식은 심박수 날짜별 최소 / 최대 / 백분위수를
+추가로 넣는다 (heartRateMin, heartRateMax, heartRateP<q>, heart_rate_series.py).
+
+증분 업로드 (since_day): sql / stream 방식은 since_day 이후 행만 읽고
+원본 테이블별 마지막 local_date를 돌려줌 (day_store 워터마크, incremental_start_day).
+평균은 모두 합계 / 개수로 계산하므로 방식 간 차이는 부동소수점 오차 수준
+(evaluation/scripts/benchmark_db_ingestion.py에서 json 방식과 비교).
+"""
+
+import sqlite3
+from pathlib import Path
+
+from app.config import (
+    DB_PARSE_MODE,
+    DB_STREAM_CHUNK_ROWS,
+    HEALTH_DATA_UTC_OFFSET_MINUTES,
+    HEART_RATE_PERCENTILES,
+    HEART_RATE_SERIES_STATS,
+    INGEST_RECHECK_DAYS,
+)
+from app.core.db_parser import DayAccumulator, parse_db_json_to_raw_data_by_day
+from app.core.db_to_json import db_to_json
+from app.core.heart_rate_series import DAY_MILLIS, HeartRateHistogram
+
+DB_PARSE_MODES = ("sql", "stream", "json")
+
+# _epoch_millis_to_local_date와 같은 기준
+UTC_OFFSET_MILLIS = HEALTH_DATA_UTC_OFFSET_MINUTES * 60_000
+
+
+# ------------------------------------------------
+# 1) 테이블별 읽을 컬럼
+# ------------------------------------------------
+# (테이블, bucket 항목, 날짜 컬럼, 값 컬럼들)
+# - 날짜 컬럼이 None이면 값에서 날짜 계산 (심박수 series: epoch_millis → HeartRateHistogram)
+# - steps_cadence_record_table은 읽지 않음: 기존 경로도 samples가 list일 때만
+#   집계하는데 SQLite 값은 list가 될 수 없어 항상 비어 있음 (stepsCadence = 0)
+TABLE_COLUMNS = [
+    ("steps_record_table", "steps", "local_date", ("count",)),
+    ("distance_record_table", "distance", "local_date", ("distance",)),
+    ("total_calories_burned_record_table", "total_calories", "local_date", ("energy",)),
+    ("active_calories_burned_record_table", "active_calories", "local_date", ("energy",)),
+    ("heart_rate_record_series_table", "heart_rate", None, ("epoch_millis", "beats_per_minute")),
+    ("resting_heart_rate_record_table", "resting_heart_rate", "local_date", ("value",)),
+    ("oxygen_saturation_record_table", "oxygen_saturation", "local_date", ("percentage",)),
+    ("weight_record_table", "weight", "local_date", ("weight",)),
+    ("height_record_table", "height", "local_date", ("height",)),
+    ("sleep_session_record_table", "sleep", "local_date", ("start_time", "end_time")),
+]
+
+
+def _row_value(key: str, values: tuple):
+    """
+    컬럼 값 → bucket에 더할 값 (None이면 건너뜀)
+    변환 규칙은 parse_db_json_to_raw_data_by_day와 같음
+    """
+    if key in ("total_calories", "active_calories"):
+        return values[0] / 1000  # energy: calories → kcal
+    if key == "weight":
+        w = values[0]
+        return w / 1000 if w > 0 else w  # gram → kg
+    if key == "sleep":
+        s, e = values
+        if not s or not e:
+            return None
+        return (e - s) / 1000 / 60  # minutes
+    return values[0]
+
+
+# ------------------------------------------------
+# 2) SQLite 접근 (읽기 전용)
+# ------------------------------------------------
+def _connect_readonly(db_path: str) -> sqlite3.Connection:
+    try:
+        uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+    except Exception as e:
+        raise ValueError(f"DB 파일을 열 수 없습니다: {str(e)}")
+
+
+def _table_names(conn: sqlite3.Connection) -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+    if not rows:
+        raise ValueError("DB 내부에 테이블이 없습니다.")
+    return {name for (name,) in rows}
+
+
+def _column_names(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f'PRAGMA table_info("{table}");')}
+
+
+def _iter_chunks(conn: sqlite3.Connection, sql: str, chunk_size: int, params=()):
+    cursor = conn.execute(sql, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _has_columns(conn: sqlite3.Connection, table: str, columns: list) -> bool:
+    missing = set(columns) - _column_names(conn, table)
+    if missing:
+        print(f"[WARN] {table}: 컬럼 없음 {sorted(missing)} → 건너뜀")
+        return False
+    return True
+
+
+def _add_heart_rate(accumulator: DayAccumulator, histogram: HeartRateHistogram):
+    percentiles = HEART_RATE_PERCENTILES if HEART_RATE_SERIES_STATS else ()
+    for day, stats in histogram.day_stats(percentiles).items():
+        accumulator.add_aggregate(day, "heart_rate", stats["sum"], stats["count"])
+        if not HEART_RATE_SERIES_STATS:
+            continue
+        accumulator.set_extra(
+            day,
+            {
+                "heartRateMin": stats["min"],
+                "heartRateMax": stats["max"],
+                **{f"heartRateP{q:g}": stats[f"p{q:g}"] for q in HEART_RATE_PERCENTILES},
+            },
+        )
+
+
+def _day_range_conditions(date_column, since_day, until_day=None) -> tuple:
+    """
+    since_day 이후 (until_day 전까지) 행만 읽는 조건
+
+    Returns:
+        (조건 문자열 목록, 파라미터)
+    """
+    conditions, params = [], []
+    for day, operator in ((since_day, ">="), (until_day, "<")):
+        if day is None:
+            continue
+        if date_column:
+            conditions.append(f'"{date_column}" {operator} ?')
+            params.append(day)
+        else:
+            # 심박수 series: 현지 날짜 0시 기준 epoch millis (HeartRateHistogram과 같은 날짜 경계)
+            conditions.append(f'"epoch_millis" {operator} ?')
+            params.append(day * DAY_MILLIS - UTC_OFFSET_MILLIS)
+    return conditions, tuple(params)
+
+
+def _last_days_by_table(accumulator: DayAccumulator, tables: set) -> dict:
+    """{원본 테이블: 값이 있는 마지막 local_date 또는 None} (DB에 있는 파싱 대상 테이블만)"""
+    last_days = accumulator.last_days()
+    return {
+        table: last_days.get(key)
+        for table, key, _, _ in TABLE_COLUMNS
+        if table in tables
+    }
+
+
+def day_bounds(db_path: str, since_day: int = None):
+    """
+    파싱 대상 행의 local_date 범위 (병렬 파싱 날짜 범위 분할용)
+
+    - 테이블마다 MIN / MAX만 계산 (심박수 series는 epoch_millis → 현지 날짜)
+    - 0 / 빈 값처럼 파싱에서 건너뛰는 심박수 샘플은 제외
+
+    Returns:
+        (첫 local_date, 마지막 local_date + 1) 또는 None (행 없음)
+    """
+    conn = _connect_readonly(db_path)
+    first, last = [], []
+    try:
+        tables = _table_names(conn)
+        for table, _, date_column, value_columns in TABLE_COLUMNS:
+            if table not in tables:
+                continue
+            columns = ([date_column] if date_column else []) + list(value_columns)
+            if not _has_columns(conn, table, columns):
+                continue
+
+            conditions, params = _day_range_conditions(date_column, since_day)
+            conditions += [f'"{c}" IS NOT NULL' for c in columns]
+            column = date_column
+            if date_column is None:
+                column = "epoch_millis"
+                conditions.append('"epoch_millis" != 0 AND "beats_per_minute" != 0')
+
+            low, high = conn.execute(
+                f'SELECT MIN("{column}"), MAX("{column}") FROM "{table}" '
+                f'WHERE {" AND ".join(conditions)};',
+                params,
+            ).fetchone()
+            if low is None:
+                continue
+            if date_column is None:
+                low, high = (
+                    (int(value) + UTC_OFFSET_MILLIS) // DAY_MILLIS for value in (low, high)
+                )
+            first.append(int(low))
+            last.append(int(high))
+    finally:
+        conn.close()
+
+    if not first:
+        return None
+    return min(first), max(last) + 1
+
+
+def list_db_tables(db_path: str) -> set:
+    """DB 테이블 이름 목록 (플랫폼 감지용)"""
+    conn = _connect_readonly(db_path)
+    try:
+        return _table_names(conn)
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------
+# 3) 스트리밍 파싱
+# ------------------------------------------------
+def parse_db_file_to_raw_data_by_day(
+    db_path: str, chunk_size: int = DB_STREAM_CHUNK_ROWS, since_day: int = None
+) -> dict:
+    """
+    DB 파일에서 바로 날짜별 raw_json 생성 (db_to_json 없이)
+
+    - NULL 값 행은 건너뜀 (기존 경로는 NULL이면 합계/평균에서 예외)
+    - 필요한 컬럼이 없는 테이블은 건너뜀
+    - since_day가 있으면 그 날짜(local_date) 이후 행만 읽음
+    """
+    return _stream_accumulate(db_path, chunk_size, since_day)[0].to_raw_by_day()
+
+
+def _stream_accumulate(
+    db_path: str, chunk_size: int, since_day: int, until_day: int = None
+) -> tuple:
+    """
+    until_day: 이 local_date 전까지만 읽음 (병렬 파싱에서 날짜 범위를 나눌 때)
+
+    Returns: (DayAccumulator, DB 테이블 이름 집합)
+    """
+    conn = _connect_readonly(db_path)
+    accumulator = DayAccumulator()
+    heart_rate = HeartRateHistogram(UTC_OFFSET_MILLIS)
+
+    try:
+        tables = _table_names(conn)
+
+        for table, key, date_column, value_columns in TABLE_COLUMNS:
+            if table not in tables:
+                continue
+
+            columns = ([date_column] if date_column else []) + list(value_columns)
+            if not _has_columns(conn, table, columns):
+                continue
+
+            select = ", ".join(f'"{c}"' for c in columns)
+            conditions = [f'"{c}" IS NOT NULL' for c in columns]
+            day_range, params = _day_range_conditions(date_column, since_day, until_day)
+            conditions += day_range
+            sql = f'SELECT {select} FROM "{table}" WHERE {" AND ".join(conditions)};'
+
+            for rows in _iter_chunks(conn, sql, chunk_size, params):
+                if date_column is None:
+                    # 심박수 series: chunk 단위로 NumPy 배열 → 날짜별 히스토그램
+                    epoch_millis, bpm = zip(*rows)
+                    heart_rate.add_samples(epoch_millis, bpm)
+                    continue
+
+                for row in rows:
+                    value = _row_value(key, row[1:])
+                    if value is not None:
+                        accumulator.add(row[0], key, value)
+
+        _add_heart_rate(accumulator, heart_rate)
+    finally:
+        conn.close()
+
+    return accumulator, tables
+
+
+# ------------------------------------------------
+# 4) SQL 집계 (GROUP BY 날짜)
+# ------------------------------------------------
+# bucket 항목 → (값 식, 추가 조건)
+# - 값 식은 _row_value와 같은 변환 (정수 나눗셈이 되지 않도록 1000.0)
+# - 추가 조건은 기존 경로에서 건너뛰는 행 (0 / 빈 값)
+_SQL_VALUES = {
+    "steps": ('"count"', None),
+    "distance": ('"distance"', None),
+    "total_calories": ('"energy" / 1000.0', None),
+    "active_calories": ('"energy" / 1000.0', None),
+    "heart_rate": ('"beats_per_minute"', '"epoch_millis" != 0 AND "beats_per_minute" != 0'),
+    "resting_heart_rate": ('"value"', None),
+    "oxygen_saturation": ('"percentage"', None),
+    "weight": ('CASE WHEN "weight" > 0 THEN "weight" / 1000.0 ELSE "weight" END', None),
+    "height": ('"height"', None),
+    "sleep": ('("end_time" - "start_time") / 1000.0 / 60', '"start_time" != 0 AND "end_time" != 0'),
+}
+
+
+def _local_day_sql(column: str, offset_millis: int) -> str:
+    """epoch millis 컬럼 → 현지 Epoch Day (음수도 내림, SQLite %는 피제수 부호를 따름)"""
+    shifted = f'(CAST("{column}" AS INTEGER) + {offset_millis})'
+    return (
+        f"(({shifted} - (({shifted} % {DAY_MILLIS}) + {DAY_MILLIS}) % {DAY_MILLIS})"
+        f" / {DAY_MILLIS})"
+    )
+
+
+def aggregate_db_file_by_day(db_path: str, since_day: int = None) -> dict:
+    """
+    테이블마다 GROUP BY 날짜 집계 쿼리로 날짜별 raw_json 생성
+
+    NULL 값 / 컬럼이 없는 테이블 / since_day 처리는 parse_db_file_to_raw_data_by_day와 같음
+    """
+    return _sql_accumulate(db_path, since_day)[0].to_raw_by_day()
+
+
+def _sql_accumulate(db_path: str, since_day: int, until_day: int = None) -> tuple:
+    """
+    until_day: 이 local_date 전까지만 읽음 (병렬 파싱에서 날짜 범위를 나눌 때)
+
+    Returns: (DayAccumulator, DB 테이블 이름 집합)
+    """
+    conn = _connect_readonly(db_path)
+    accumulator = DayAccumulator()
+    heart_rate = HeartRateHistogram(UTC_OFFSET_MILLIS)
+
+    try:
+        tables = _table_names(conn)
+
+        for table, key, date_column, value_columns in TABLE_COLUMNS:
+            if table not in tables:
+                continue
+
+            columns = ([date_column] if date_column else []) + list(value_columns)
+            if not _has_columns(conn, table, columns):
+                continue
+
+            conditions = [f'"{c}" IS NOT NULL' for c in columns]
+            day_range, params = _day_range_conditions(date_column, since_day, until_day)
+            conditions += day_range
+
+            if date_column is None and HEART_RATE_SERIES_STATS:
+                # 심박수 series: (날짜, bpm)별 개수만 가져와 히스토그램으로 집계
+                # → Python으로 넘어오는 행 = 날짜 × 서로 다른 bpm 값
+                sql = (
+                    f'SELECT {_local_day_sql("epoch_millis", UTC_OFFSET_MILLIS)} AS day, '
+                    f'"beats_per_minute", COUNT(*) FROM "{table}" '
+                    f'WHERE {" AND ".join(conditions)} '
+                    f'AND "epoch_millis" != 0 AND "beats_per_minute" != 0 '
+                    f'GROUP BY day, "beats_per_minute";'
+                )
+                for rows in _iter_chunks(conn, sql, DB_STREAM_CHUNK_ROWS, params):
+                    heart_rate.add_counts(*zip(*rows))
+                continue
+
+            value_sql, extra_where = _SQL_VALUES[key]
+            if extra_where:
+                conditions.append(extra_where)
+
+            day_sql = (
+                f'"{date_column}"'
+                if date_column
+                else _local_day_sql("epoch_millis", UTC_OFFSET_MILLIS)
+            )
+            sql = (
+                f"SELECT {day_sql} AS day, SUM({value_sql}), COUNT(*) "
+                f'FROM "{table}" WHERE {" AND ".join(conditions)} GROUP BY day;'
+            )
+            for day, total, count in conn.execute(sql, params):
+                accumulator.add_aggregate(day, key, total, count)
+
+        _add_heart_rate(accumulator, heart_rate)
+    finally:
+        conn.close()
+
+    return accumulator, tables
+
+
+# ------------------------------------------------
+# 5) 파싱 방식 선택
+# ------------------------------------------------
+def ingest_db_file(db_path: str, mode: str = DB_PARSE_MODE, since_day: int = None) -> tuple:
+    """
+    Args:
+        since_day: 이 local_date 이후만 읽음 (None이면 전체, incremental_start_day 참고)
+
+    Returns:
+        (날짜별 raw_json, {원본 테이블: 마지막 local_date 또는 None})
+        json 방식은 워터마크를 돌려주지 않음 (빈 dict)
+    """
+    if mode not in DB_PARSE_MODES:
+        raise ValueError(
+            f"❌ 지원하지 않는 DB 파싱 방식: {mode} (사용 가능: {', '.join(DB_PARSE_MODES)})"
+        )
+
+    if mode == "json":
+        raw_by_day = parse_db_json_to_raw_data_by_day(db_to_json(db_path))
+        if since_day is not None:
+            raw_by_day = {day: raw for day, raw in raw_by_day.items() if day >= since_day}
+        return raw_by_day, {}
+
+    return accumulator_result(*accumulate_db_file(db_path, mode, since_day))
+
+
+def accumulate_db_file(
+    db_path: str, mode: str, since_day: int = None, until_day: int = None
+) -> tuple:
+    """
+    sql / stream 방식 날짜별 누적 ([since_day, until_day) 범위, 병렬 파싱 워커에서도 사용)
+
+    Returns:
+        (DayAccumulator, DB 테이블 이름 집합)
+    """
+    if mode == "sql":
+        return _sql_accumulate(db_path, since_day, until_day)
+    return _stream_accumulate(db_path, DB_STREAM_CHUNK_ROWS, since_day, until_day)
+
+
+def accumulator_result(accumulator: DayAccumulator, tables: set) -> tuple:
+    """누적 결과 → (날짜별 raw_json, {원본 테이블: 마지막 local_date 또는 None})"""
+    return accumulator.to_raw_by_day(), _last_days_by_table(accumulator, tables)
+
+
+def incremental_start_day(
+    watermarks: dict, tables: set, recheck_days: int = INGEST_RECHECK_DAYS
+):
+    """
+    워터마크 → 이번 업로드에서 읽기 시작할 local_date (None이면 전체)
+
+    - DB에 있는 파싱 대상 테이블 중 워터마크가 없는 테이블이 있으면 전체
+      (처음 보는 테이블은 과거 데이터까지 한꺼번에 들어올 수 있음)
+    - 가장 최근 워터마크 − recheck_days부터 모든 테이블을 읽음
+      → 읽은 날짜는 모든 테이블 값이 다시 집계되므로 저장된 날짜를
+        일부 값만으로 덮어쓰지 않음
+      → 드물게 기록되는 테이블(키 등)의 오래된 워터마크 때문에 전체를 읽지 않음
+    """
+    parsed = [table for table, _, _, _ in TABLE_COLUMNS if table in tables]
+    if not parsed or any(table not in watermarks for table in parsed):
+        return None
+
+    days = [watermarks[table] for table in parsed if watermarks[table] is not None]
+    if not days:
+        return None
+    return max(days) - recheck_days
@@ -2,6 +2,8 @@ import statistics
 from typing import Dict
 from datetime import datetime, timezone, timedelta
 
+from app.config import HEALTH_DATA_UTC_OFFSET_MINUTES
+
 
 # =============================================================
 # 내부 유틸
@@ -35,13 +37,13 @@ def _epoch_millis_to_local_date(epoch_millis: int) -> int:
     # UTC 기준 datetime
     dt = datetime.fromtimestamp(epoch_seconds, tz=timezone.utc)
 
-    # 한국 시간 (UTC+9) 적용
-    kst = timezone(timedelta(hours=9))
-    dt_kst = dt.astimezone(kst)
+    # 현지 시간 적용 (기본: 한국 시간 UTC+9, HEALTH_DATA_UTC_OFFSET_MINUTES)
+    local_tz = timezone(timedelta(minutes=HEALTH_DATA_UTC_OFFSET_MINUTES))
+    dt_local = dt.astimezone(local_tz)
 
     # Epoch Day 계산 (1970-01-01부터의 일수)
-    epoch = datetime(1970, 1, 1, tzinfo=kst)
-    days = (dt_kst.date() - epoch.date()).days
+    epoch = datetime(1970, 1, 1, tzinfo=local_tz)
+    days = (dt_local.date() - epoch.date()).days
 
     return days
 
@@ -71,6 +73,102 @@ def _init_day_bucket():
     }
 
 
+def _build_raw_json(total, mean) -> dict:
+    """
+    bucket 항목별 합계/평균 함수 → raw_json (12개 항목)
+
+    total(key), mean(key): _init_day_bucket의 키를 받아 값 반환
+    """
+    sleep_min = total("sleep")
+
+    return {
+        # Sleep
+        "sleep": sleep_min,
+        "sleep_hr": sleep_min / 60 if sleep_min > 0 else 0,
+        # Body
+        "weight": mean("weight"),
+        "height": mean("height"),
+        # Activity
+        "steps": total("steps"),
+        "distance": total("distance"),
+        "stepsCadence": mean("steps_cadence"),
+        # Calories
+        "totalCaloriesBurned": total("total_calories"),
+        "calories": total("active_calories"),
+        # Vitals
+        "heartRate": mean("heart_rate"),
+        "restingHeartRate": mean("resting_heart_rate"),
+        "oxygenSaturation": mean("oxygen_saturation"),
+    }
+
+
+class DayAccumulator:
+    """
+    날짜별 running 합계/개수 (값 목록을 보관하지 않음)
+
+    - 메모리 = 날짜 수 × 항목 수 (행 수와 무관)
+    - to_raw_by_day()는 parse_db_json_to_raw_data_by_day와 같은 형식
+      (+ set_extra로 넣은 추가 항목)
+    """
+
+    def __init__(self):
+        self._sums = {}  # local_date → {항목: 합계}
+        self._counts = {}  # local_date → {항목: 개수}
+        self._extras = {}  # local_date → {raw_json 추가 항목: 값}
+        self._last_days = {}  # 항목 → 값이 있는 마지막 local_date
+
+    def add(self, date_key: int, key: str, value):
+        self.add_aggregate(date_key, key, value, 1)
+
+    def add_aggregate(self, date_key: int, key: str, total, count: int):
+        """이미 집계된 합계/개수 누적 (SQL GROUP BY 결과 등)"""
+        if date_key not in self._sums:
+            self._sums[date_key] = dict.fromkeys(_init_day_bucket(), 0)
+            self._counts[date_key] = dict.fromkeys(_init_day_bucket(), 0)
+        self._sums[date_key][key] += total
+        self._counts[date_key][key] += count
+        if count and date_key > self._last_days.get(key, date_key - 1):
+            self._last_days[key] = date_key
+
+    def set_extra(self, date_key: int, values: dict):
+        """12개 항목 외에 raw_json에 그대로 넣을 값 (심박수 최소/최대/백분위수 등)"""
+        self._extras.setdefault(date_key, {}).update(values)
+
+    def merge(self, other: "DayAccumulator"):
+        """다른 누적기 결과 합치기 (날짜 범위를 나눠 따로 읽은 결과 등)"""
+        for date_key, sums in other._sums.items():
+            if date_key not in self._sums:
+                self._sums[date_key] = dict.fromkeys(_init_day_bucket(), 0)
+                self._counts[date_key] = dict.fromkeys(_init_day_bucket(), 0)
+            counts = other._counts[date_key]
+            for key, total in sums.items():
+                self._sums[date_key][key] += total
+                self._counts[date_key][key] += counts[key]
+        for date_key, values in other._extras.items():
+            self.set_extra(date_key, values)
+        for key, date_key in other._last_days.items():
+            if date_key > self._last_days.get(key, date_key - 1):
+                self._last_days[key] = date_key
+
+    def last_days(self) -> dict:
+        """{bucket 항목: 값이 있는 마지막 local_date} (업로드 증분 워터마크용)"""
+        return dict(self._last_days)
+
+    def __len__(self):
+        return len(self._sums)
+
+    def to_raw_by_day(self) -> Dict[int, dict]:
+        result_by_day = {}
+        for date_key, sums in self._sums.items():
+            counts = self._counts[date_key]
+            result_by_day[date_key] = _build_raw_json(
+                lambda key: sums[key],
+                lambda key: sums[key] / counts[key] if counts[key] else 0,
+            )
+            result_by_day[date_key].update(self._extras.get(date_key, {}))
+        return result_by_day
+
+
 # =============================================================
 # 날짜별 raw_json 생성 (Samsung Health Connect ZIP 전용)
 # =============================================================
@@ -229,32 +327,12 @@ def parse_db_json_to_raw_data_by_day(db_json: dict) -> Dict[int, dict[str, float
     # ---------------------------------------------------------
     # 날짜별 raw_json 생성 (12개 항목)
     # ---------------------------------------------------------
-    result_by_day = {}
-
-    for date_key, d in grouped.items():
-        sleep_min = _total(d["sleep"])
-
-        result_by_day[date_key] = {
-            # Sleep
-            "sleep": sleep_min,
-            "sleep_hr": sleep_min / 60 if sleep_min > 0 else 0,
-            # Body
-            "weight": _mean(d["weight"]),
-            "height": _mean(d["height"]),
-            # Activity
-            "steps": _total(d["steps"]),
-            "distance": _total(d["distance"]),
-            "stepsCadence": _mean(d["steps_cadence"]),
-            # Calories
-            "totalCaloriesBurned": _total(d["total_calories"]),
-            "calories": _total(d["active_calories"]),
-            # Vitals
-            "heartRate": _mean(d["heart_rate"]),
-            "restingHeartRate": _mean(d["resting_heart_rate"]),
-            "oxygenSaturation": _mean(d["oxygen_saturation"]),
-        }
-
-    return result_by_day
+    return {
+        date_key: _build_raw_json(
+            lambda key: _total(d[key]), lambda key: _mean(d[key])
+        )
+        for date_key, d in grouped.items()
+    }
 
 
 # ---------------------------------------------------------
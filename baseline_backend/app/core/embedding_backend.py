@@ -0,0 +1,140 @@
+"""
+임베딩 백엔드 (설정으로 선택)
+- openai: OpenAI Embedding API (text-embedding-3-small, EMBEDDING_DIMENSIONS 차원)
+- local : 해시 문자 n-gram + NumPy 투영 (네트워크 없음, 결정적, CPU만 사용)
+
+EMBEDDING_BACKEND 환경변수로 선택한다.
+local 백엔드는 평가 러너/적재 벤치마크/부하 테스트를 오프라인으로 돌릴 때 사용한다.
+"""
+
+import zlib
+import numpy as np
+
+from app.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_NATIVE_DIMENSIONS,
+    LOCAL_EMBEDDING_DIM,
+)
+from app.core.openai_client import get_openai_client
+
+
+class EmbeddingBackend:
+    """
+    임베딩 백엔드 공통 인터페이스
+
+    - name : 백엔드 이름 (컬렉션 구분용)
+    - model: 캐시 키에 들어가는 모델 식별자 (백엔드/차원이 다르면 달라야 함)
+    """
+
+    name = "base"
+    model = ""
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        raise NotImplementedError
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """
+    OpenAI Embedding API
+
+    dimensions가 원본보다 작으면 API에서 줄인 벡터를 받는다
+    (앞쪽 차원만 남기고 정규화한 것과 같음 → 기존 벡터를 잘라서 이전 가능)
+    """
+
+    name = "openai"
+
+    def __init__(
+        self, model: str = EMBEDDING_MODEL, dimensions: int = EMBEDDING_DIMENSIONS
+    ):
+        self.api_model = model
+        self.dimensions = dimensions
+        self.reduced = dimensions != EMBEDDING_NATIVE_DIMENSIONS
+        self.model = f"{model}-{dimensions}d" if self.reduced else model
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        client = get_openai_client()
+        options = {"dimensions": self.dimensions} if self.reduced else {}
+        response = client.embeddings.create(
+            input=texts, model=self.api_model, **options
+        )
+        return [item.embedding for item in response.data]
+
+
+class LocalHashEmbeddingBackend(EmbeddingBackend):
+    """
+    로컬 CPU 임베딩 (feature hashing)
+
+    - 문자 1~3-gram을 crc32로 해시 → dim 차원 인덱스 + 부호(±1)
+    - NumPy로 한 번에 누적 후 L2 정규화 (코사인 거리 사용 가능)
+    - 같은 텍스트는 항상 같은 벡터 (프로세스/머신 무관)
+    """
+
+    name = "local"
+
+    def __init__(self, dim: int = LOCAL_EMBEDDING_DIM, max_ngram: int = 3):
+        self.dim = dim
+        self.max_ngram = max_ngram
+        self.model = f"local-hash-ngram{max_ngram}-{dim}"
+
+    def _hash_ngrams(self, text: str) -> list[int]:
+        text = " ".join(text.lower().split())
+        hashes = []
+        for n in range(1, self.max_ngram + 1):
+            for i in range(len(text) - n + 1):
+                hashes.append(zlib.crc32(text[i : i + n].encode("utf-8")))
+        return hashes
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        rows = []
+        hashes = []
+        for row, text in enumerate(texts):
+            text_hashes = self._hash_ngrams(text)
+            hashes.extend(text_hashes)
+            rows.extend([row] * len(text_hashes))
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = (hashes % self.dim).astype(np.int64)
+        signs = np.where((hashes >> np.uint64(20)) & np.uint64(1), 1.0, -1.0)
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (rows, columns), signs.astype(np.float32))
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        return matrix.tolist()
+
+
+EMBEDDING_BACKENDS = {
+    "openai": OpenAIEmbeddingBackend,
+    "local": LocalHashEmbeddingBackend,
+}
+
+_backend = None
+
+
+def create_embedding_backend(name: str) -> EmbeddingBackend:
+    """이름으로 백엔드 생성"""
+    backend_cls = EMBEDDING_BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(
+            f"❌ 지원하지 않는 EMBEDDING_BACKEND: {name} "
+            f"(사용 가능: {', '.join(EMBEDDING_BACKENDS)})"
+        )
+    return backend_cls()
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    """설정(EMBEDDING_BACKEND)에 따른 백엔드 (프로세스당 1개)"""
+    global _backend
+    if _backend is None:
+        _backend = create_embedding_backend(EMBEDDING_BACKEND)
+        print(f"[INFO] 임베딩 백엔드: {_backend.name} ({_backend.model})")
+    return _backend
@@ -0,0 +1,167 @@
+"""
+임베딩 영구 캐시 (SQLite)
+- 텍스트 내용 해시(sha256) 기반 키 → 같은 문장은 다시 임베딩하지 않음
+- 디스크 저장: 서버 재시작 후에도 유지, uvicorn 워커 간 공유 (WAL 모드)
+- LRU 방식 eviction: 최대 개수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+from app.utils.vector_quantization import check_dtype, encode_vector, decode_vector
+
+
+class EmbeddingCache:
+    """
+    content-hash 키 기반 임베딩 캐시
+
+    - 벡터는 dtype 형식 BLOB으로 저장 (1536차원 기준 float32 약 6KB, int8 약 1.5KB)
+      행마다 저장 형식을 기록 → 설정을 바꿔도 예전 항목을 그대로 읽음
+    - 연결은 스레드별로 생성 (executor 스레드에서 안전하게 사용)
+    - 첫 사용 시점에 파일/테이블 생성 (import 시 디스크 접근 없음)
+    """
+
+    def __init__(self, path: str, max_entries: int, dtype: str = "float32"):
+        self.path = path
+        self.max_entries = max_entries
+        self.dtype = check_dtype(dtype)
+        self._local = threading.local()
+
+    # ------------------------------------------------
+    # 내부: 연결 관리
+    # ------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used "
+            "ON embedding_cache(last_used)"
+        )
+
+        # 저장 형식 컬럼 추가 이전에 만든 캐시 파일 (모두 float32)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embedding_cache)")}
+        if "dtype" not in columns:
+            conn.execute(
+                "ALTER TABLE embedding_cache "
+                "ADD COLUMN dtype TEXT NOT NULL DEFAULT 'float32'"
+            )
+        conn.commit()
+
+        self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(text: str, model: str) -> str:
+        """모델명 + 텍스트 내용 해시 (모델이 다르면 다른 키)"""
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------
+    def get_many(self, keys: list[str]) -> dict:
+        """
+        여러 키를 한 번에 조회
+
+        Returns:
+            {key: vector} (캐시에 있는 항목만)
+        """
+        if not keys:
+            return {}
+
+        conn = self._connect()
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+
+        # SQLite 변수 개수 제한(999)을 넘지 않도록 나눠서 조회
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, vector, dtype FROM embedding_cache "
+                f"WHERE key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for key, blob, dtype in rows:
+                found[key] = decode_vector(blob, dtype)
+
+        # LRU: 사용 시간 갱신
+        if found:
+            now = time.time()
+            conn.executemany(
+                "UPDATE embedding_cache SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            conn.commit()
+
+        return found
+
+    def put_many(self, items: list[tuple[str, list]]):
+        """
+        (key, vector) 목록 저장 후 최대 개수 초과분 정리
+        """
+        if not items:
+            return
+
+        conn = self._connect()
+        now = time.time()
+        conn.executemany(
+            "INSERT OR REPLACE INTO embedding_cache (key, vector, dtype, last_used) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (key, encode_vector(vector, self.dtype), self.dtype, now)
+                for key, vector in items
+            ],
+        )
+        conn.commit()
+
+        self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """최대 개수를 넘으면 가장 오래 사용되지 않은 항목 삭제"""
+        (count,) = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        conn.execute(
+            "DELETE FROM embedding_cache WHERE key IN ("
+            "SELECT key FROM embedding_cache ORDER BY last_used LIMIT ?)",
+            (overflow,),
+        )
+        conn.commit()
+        print(f"[INFO] 임베딩 캐시 정리: {overflow}개 삭제 (최대 {self.max_entries}개)")
+
+    def stats(self) -> dict:
+        """캐시 현황 (디버깅용)"""
+        conn = self._connect()
+        count, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+        ).fetchone()
+        return {
+            "path": self.path,
+            "entries": count,
+            "max_entries": self.max_entries,
+            "dtype": self.dtype,
+            "vector_bytes": size,
+        }
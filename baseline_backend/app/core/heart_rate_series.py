@@ -0,0 +1,117 @@
+"""
+심박수 series 날짜별 집계 (NumPy)
+
+- 현지 날짜 = (epoch_millis + UTC 오프셋) // 하루 millis (정수 연산, datetime 생성 없음)
+- 샘플을 날짜별 (bpm 값 → 개수) 히스토그램으로 모아 둠
+  → 메모리 = 날짜 수 × 서로 다른 bpm 값 수 (샘플 수와 무관)
+  → SQL에서 GROUP BY 날짜, bpm으로 미리 센 결과도 그대로 넣을 수 있음
+- 날짜별 합계 / 개수 / 최소 / 최대 / 백분위수(np.percentile linear와 같은 보간)를
+  정렬된 히스토그램에서 reduceat / searchsorted로 한 번에 계산
+"""
+
+import numpy as np
+
+DAY_MILLIS = 86_400_000
+
+# 마지막 병합 이후 쌓인 (날짜, bpm, 개수) 항목이 이보다 많으면 합쳐서 줄임
+_COMPACT_THRESHOLD = 100_000
+
+
+def local_epoch_days(epoch_millis, offset_millis: int) -> np.ndarray:
+    """epoch millis 배열 → 현지 Epoch Day 배열 (음수도 내림)"""
+    return (np.asarray(epoch_millis, dtype=np.int64) + offset_millis) // DAY_MILLIS
+
+
+def _reduce(days: np.ndarray, bpm: np.ndarray, counts: np.ndarray) -> tuple:
+    """(날짜, bpm) 순으로 정렬하고 같은 항목의 개수를 합침"""
+    order = np.lexsort((bpm, days))
+    days, bpm, counts = days[order], bpm[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, (days[1:] != days[:-1]) | (bpm[1:] != bpm[:-1])])
+    return days[starts], bpm[starts], np.add.reduceat(counts, starts)
+
+
+class HeartRateHistogram:
+    def __init__(self, offset_millis: int):
+        self.offset_millis = offset_millis
+        self._chunks = []  # [(days, bpm, counts)]
+        self._pending = 0  # 마지막 병합 이후 추가된 항목 수
+
+    # ------------------------------------------------
+    # 누적
+    # ------------------------------------------------
+    def add_samples(self, epoch_millis, bpm):
+        """원본 샘플 (0 / 빈 값은 건너뜀, 기존 파서와 같은 규칙)"""
+        epoch_millis = np.asarray(epoch_millis, dtype=np.int64)
+        bpm = np.asarray(bpm, dtype=np.float64)
+        valid = (epoch_millis != 0) & (bpm != 0)
+        if not valid.any():
+            return
+        days = local_epoch_days(epoch_millis[valid], self.offset_millis)
+        self.add_counts(days, bpm[valid], np.ones(days.size, dtype=np.int64))
+
+    def add_counts(self, days, bpm, counts):
+        """이미 센 (날짜, bpm, 개수) 배열 (chunk 안에서 먼저 합친 뒤 보관)"""
+        days = np.asarray(days, dtype=np.int64)
+        if not days.size:
+            return
+        chunk = _reduce(
+            days, np.asarray(bpm, dtype=np.float64), np.asarray(counts, dtype=np.int64)
+        )
+        self._chunks.append(chunk)
+        self._pending += chunk[0].size
+        if self._pending > _COMPACT_THRESHOLD:
+            self._compact()
+
+    def _compact(self):
+        """보관 중인 chunk를 하나로 합침"""
+        if len(self._chunks) > 1:
+            self._chunks = [
+                _reduce(*(np.concatenate(column) for column in zip(*self._chunks)))
+            ]
+        self._pending = 0
+
+    # ------------------------------------------------
+    # 날짜별 통계
+    # ------------------------------------------------
+    def day_stats(self, percentiles=()) -> dict:
+        """
+        Returns:
+            {local_date: {"sum", "count", "min", "max", "p<q>"...}}
+        """
+        if not self._chunks:
+            return {}
+        self._compact()
+        days, bpm, counts = self._chunks[0]
+
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        ends = np.r_[starts[1:], days.size]
+        day_counts = np.add.reduceat(counts, starts)
+        day_sums = np.add.reduceat(bpm * counts, starts)
+
+        # 날짜 안에서 k번째(0부터) 값 = 누적 개수가 처음으로 k를 넘는 항목
+        cumulative = np.cumsum(counts)
+        base = cumulative[starts] - counts[starts]
+
+        def value_at(rank):
+            return bpm[np.searchsorted(cumulative, base + rank, side="right")]
+
+        columns = {
+            "sum": day_sums,
+            "count": day_counts,
+            "min": bpm[starts],
+            "max": bpm[ends - 1],
+        }
+        for q in percentiles:
+            position = q / 100 * (day_counts - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, day_counts - 1)
+            low_value = value_at(lower)
+            columns[f"p{q:g}"] = low_value + (value_at(upper) - low_value) * (
+                position - lower
+            )
+
+        lists = {name: values.tolist() for name, values in columns.items()}
+        return {
+            day: {name: values[i] for name, values in lists.items()}
+            for i, day in enumerate(days[starts].tolist())
+        }
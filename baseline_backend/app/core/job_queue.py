@@ -0,0 +1,338 @@
+"""
+백그라운드 작업 대기열 (SQLite, WAL 모드)
+
+- 작업 1개 = 1행 (상태 / 현재 단계 / 단계별 소요 시간 / 결과 / 오류)
+- 상태: queued → running → succeeded | failed
+- 파일에 기록되므로 서버가 재시작돼도 대기 중인 작업은 그대로 남음
+- 작업을 가져가는(claim) 쪽은 BEGIN IMMEDIATE 트랜잭션 안에서 확인 후 상태 변경
+  → 같은 파일을 쓰는 여러 프로세스가 동시에 가져가도 한 작업은 한 워커만 실행
+  - 실행 중 작업 수가 max_running 이상이면 가져가지 않음 (노드 전체 동시 처리 수 제한)
+  - 같은 사용자의 작업이 실행 중이면 그 사용자의 다음 작업은 기다림 (사용자별 순서 보장)
+- 결과를 먼저 기록하고(publish_result) 남은 단계를 이어서 실행할 수 있음 (완료 전에도 결과 조회 가능)
+- 실행 중인 워커는 주기적으로 heartbeat 기록
+  → lease_sec 동안 heartbeat가 없으면 (프로세스 종료 등) 다시 대기열로,
+    시도 횟수가 max_attempts를 넘으면 실패 처리
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+def _iso(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
+
+
+class JobQueue:
+    def __init__(self, path: str, lease_sec: float, max_attempts: int):
+        self.path = path
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+
+    # ------------------------------------------------
+    # 연결 / 스키마
+    # ------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        """스레드별 연결 (첫 사용 시 파일/테이블 생성)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: 트랜잭션을 직접 BEGIN IMMEDIATE로 시작
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                params_json TEXT NOT NULL,
+                stage TEXT,
+                timings_json TEXT,
+                result_json TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                heartbeat_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, seq);
+            CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, status);
+            """
+        )
+
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (예외 시 rollback)"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # ------------------------------------------------
+    # 등록 / 가져가기
+    # ------------------------------------------------
+    def enqueue(self, kind: str, user_id: str, params: dict) -> str:
+        """작업 등록 → job_id"""
+        job_id = uuid.uuid4().hex
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, kind, user_id, status, params_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    user_id,
+                    STATUS_QUEUED,
+                    json.dumps(params, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+        return job_id
+
+    def _recover_stale(self, conn: sqlite3.Connection, now: float):
+        """heartbeat가 끊긴 실행 중 작업 → 다시 대기열 / 시도 한도 초과면 실패"""
+        expired = now - self.lease_sec
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL, stage = NULL "
+            "WHERE status = ? AND heartbeat_at < ? AND attempts < ?",
+            (STATUS_QUEUED, STATUS_RUNNING, expired, self.max_attempts),
+        )
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL, finished_at = ?, "
+            "error = '작업이 중단되었고 재시도 한도를 넘었습니다.' "
+            "WHERE status = ? AND heartbeat_at < ?",
+            (STATUS_FAILED, now, STATUS_RUNNING, expired),
+        )
+
+    def claim(self, worker_id: str, max_running: int) -> dict | None:
+        """
+        가장 오래된 대기 작업 1개를 worker_id 실행 상태로 변경
+
+        Returns:
+            {"job_id", "kind", "user_id", "params", "attempts", "result"} 또는 None
+            (result = 이전 시도에서 publish_result로 먼저 기록한 결과, 없으면 None)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._recover_stale(conn, now)
+
+            running = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (STATUS_RUNNING,)
+            ).fetchone()[0]
+            if running >= max_running:
+                return None
+
+            row = conn.execute(
+                "SELECT job_id, kind, user_id, params_json, attempts, result_json FROM jobs AS j "
+                "WHERE status = ? AND NOT EXISTS ("
+                "    SELECT 1 FROM jobs WHERE user_id = j.user_id AND status = ?"
+                ") ORDER BY seq LIMIT 1",
+                (STATUS_QUEUED, STATUS_RUNNING),
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ?, error = NULL WHERE job_id = ?",
+                (STATUS_RUNNING, worker_id, now, now, row["job_id"]),
+            )
+
+        return {
+            "job_id": row["job_id"],
+            "kind": row["kind"],
+            "user_id": row["user_id"],
+            "params": json.loads(row["params_json"]),
+            "attempts": row["attempts"] + 1,
+            "result": json.loads(row["result_json"]) if row["result_json"] else None,
+        }
+
+    # ------------------------------------------------
+    # 진행 상황 / 종료 (worker_id가 맞을 때만 반영)
+    # ------------------------------------------------
+    def heartbeat(self, worker_id: str):
+        """worker_id가 실행 중인 모든 작업의 heartbeat 갱신"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE worker_id = ? AND status = ?",
+                (time.time(), worker_id, STATUS_RUNNING),
+            )
+
+    def set_stage(self, job_id: str, worker_id: str, stage: str, timings: dict) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET stage = ?, timings_json = ?, heartbeat_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (
+                    stage,
+                    json.dumps(timings),
+                    time.time(),
+                    job_id,
+                    worker_id,
+                    STATUS_RUNNING,
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def publish_result(
+        self, job_id: str, worker_id: str, result: dict, timings: dict
+    ) -> bool:
+        """실행 중 작업의 결과를 먼저 기록 (상태는 running 유지, 남은 단계는 계속 진행)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET result_json = ?, timings_json = ?, heartbeat_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (
+                    json.dumps(result, ensure_ascii=False, default=str),
+                    json.dumps(timings),
+                    time.time(),
+                    job_id,
+                    worker_id,
+                    STATUS_RUNNING,
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, worker_id: str, result: dict, timings: dict) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, stage = NULL, result_json = ?, "
+                "timings_json = ?, finished_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (
+                    STATUS_SUCCEEDED,
+                    json.dumps(result, ensure_ascii=False, default=str),
+                    json.dumps(timings),
+                    time.time(),
+                    job_id,
+                    worker_id,
+                    STATUS_RUNNING,
+                ),
+            )
+        return cursor.rowcount > 0
+
+    def fail(
+        self, job_id: str, worker_id: str, error: str, timings: dict, retry: bool
+    ) -> str | None:
+        """
+        실패 기록 (retry이고 시도 횟수가 남았으면 다시 대기열로)
+
+        Returns:
+            바뀐 상태 (queued / failed) 또는 None (이미 다른 워커로 넘어간 작업)
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (job_id, worker_id, STATUS_RUNNING),
+            ).fetchone()
+            if row is None:
+                return None
+
+            status = (
+                STATUS_QUEUED if retry and row["attempts"] < self.max_attempts else STATUS_FAILED
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = NULL, worker_id = NULL, error = ?, "
+                "timings_json = ?, finished_at = ? WHERE job_id = ?",
+                (
+                    status,
+                    error,
+                    json.dumps(timings),
+                    time.time() if status == STATUS_FAILED else None,
+                    job_id,
+                ),
+            )
+        return status
+
+    def release(self, worker_id: str) -> int:
+        """
+        worker_id가 실행 중인 작업을 대기열로 되돌림 (정상 종료 시, 시도 횟수는 되돌림)
+
+        Returns:
+            되돌린 작업 수
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, stage = NULL, "
+                "attempts = MAX(attempts - 1, 0) WHERE worker_id = ? AND status = ?",
+                (STATUS_QUEUED, worker_id, STATUS_RUNNING),
+            )
+        return cursor.rowcount
+
+    # ------------------------------------------------
+    # 조회
+    # ------------------------------------------------
+    def get(self, job_id: str) -> dict | None:
+        """작업 상태 (대기 중이면 앞에 남은 작업 수 포함)"""
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            "job_id": row["job_id"],
+            "kind": row["kind"],
+            "user_id": row["user_id"],
+            "status": row["status"],
+            "stage": row["stage"],
+            "attempts": row["attempts"],
+            "timings": json.loads(row["timings_json"]) if row["timings_json"] else {},
+            "created_at": _iso(row["created_at"]),
+            "started_at": _iso(row["started_at"]),
+            "finished_at": _iso(row["finished_at"]),
+            "error": row["error"],
+            "result": json.loads(row["result_json"]) if row["result_json"] else None,
+        }
+        if row["status"] == STATUS_QUEUED:
+            job["queue_position"] = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND seq < ?",
+                (STATUS_QUEUED, row["seq"]),
+            ).fetchone()[0]
+        return job
+
+    def active_params(self, user_id: str) -> list:
+        """사용자의 대기 / 실행 중 작업 params 목록"""
+        rows = self._connect().execute(
+            "SELECT params_json FROM jobs WHERE user_id = ? AND status IN (?, ?)",
+            (user_id, STATUS_QUEUED, STATUS_RUNNING),
+        ).fetchall()
+        return [json.loads(row["params_json"]) for row in rows]
+
+    def stats(self) -> dict:
+        """상태별 작업 수"""
+        rows = self._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        ).fetchall()
+        return {status: count for status, count in rows}
@@ -8,16 +8,14 @@ LLM Analysis - 운동 추천 엔진 (개선 버전)
 4. 체중 동적 계산 (raw → BMI 역산 → 통계 기반 추정)
 """
 
-import os
 import json
-from dotenv import load_dotenv
-from openai import OpenAI
 
 from app.config import LLM_MODEL_MAIN, LLM_TEMPERATURE, LLM_MAX_TOKENS
 from app.core.rag_query import (
     build_rag_query,
     classify_rag_strength,
 )
+from app.core.openai_client import get_openai_client
 from app.core.vector_store import search_similar_summaries
 from app.core.health_interpreter import (
     interpret_health_data,
@@ -28,9 +26,6 @@ from app.core.health_interpreter import (
     calculate_health_score,
 )
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
 
 # ==========================================================
 # 1) 유틸 함수들
@@ -855,7 +850,7 @@ def run_llm_analysis(
 JSON만 출력. 시간/칼로리 계산 정확히!"""
 
     try:
-        resp = client.chat.completions.create(
+        resp = get_openai_client().chat.completions.create(
             model=LLM_MODEL_MAIN,
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -0,0 +1,30 @@
+"""
+OpenAI 클라이언트 (지연 생성)
+
+- import 시점에는 openai 패키지도 불러오지 않음 (CLI/평가 스크립트 import가 빠름)
+- 첫 호출 때 1번 만들고 재사용 (httpx 연결 풀 공유)
+- API 키가 없으면 import가 아니라 실제 호출 시점에 에러
+"""
+
+import threading
+
+from app.config import OPENAI_API_KEY
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_openai_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                if not OPENAI_API_KEY:
+                    raise ValueError(
+                        "❌ OPENAI_API_KEY가 설정되지 않았습니다. .env 파일을 확인하세요."
+                    )
+
+                from openai import OpenAI
+
+                _client = OpenAI(api_key=OPENAI_API_KEY)
+    return _client
@@ -0,0 +1,142 @@
+"""
+업로드 파싱 / 전처리 병렬 처리 (프로세스 풀)
+
+- DB 파싱과 날짜별 전처리는 순수 Python 작업이라 스레드로는 GIL 때문에 나뉘지 않음
+  → 별도 프로세스에서 실행 (INGEST_PROCESS_WORKERS개, 서버 전체가 풀 1개를 공유)
+- DB 파싱: local_date 범위를 워커 수만큼 나눠 각 프로세스가 자기 범위만 읽고 집계
+  (sql / stream 방식). 심박수 series도 같은 현지 날짜 경계로 나누므로
+  하루치 샘플은 한 프로세스에만 들어감 → 최소 / 최대 / 백분위수까지 그대로 합칠 수 있음
+  → 부모 프로세스는 날짜별 누적기(DayAccumulator)만 합침
+- 전처리: 날짜 목록을 연속 구간으로 나눠 구간마다 preprocess_health_json_batch 실행
+- 날짜 수가 INGEST_PARALLEL_MIN_DAYS보다 적으면 (증분 업로드 등) 프로세스 간 전달
+  비용이 더 커서 기존처럼 현재 프로세스에서 처리
+- 결과는 기존 ingest_db_file / preprocess_health_json_batch와 같음
+  (evaluation/scripts/benchmark_parallel_ingest.py에서 비교)
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import DB_PARSE_MODE, INGEST_PARALLEL_MIN_DAYS, INGEST_PROCESS_WORKERS
+from app.core.db_ingest import (
+    accumulate_db_file,
+    accumulator_result,
+    day_bounds,
+    ingest_db_file,
+)
+from app.core.db_parser import DayAccumulator
+from app.utils.preprocess import preprocess_health_json_batch
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ------------------------------------------------
+# 1) 프로세스 풀
+# ------------------------------------------------
+def get_process_pool(workers: int = INGEST_PROCESS_WORKERS) -> ProcessPoolExecutor:
+    """
+    공유 프로세스 풀 (첫 사용 시 생성)
+
+    spawn 방식: 서버 프로세스의 스레드 / 열린 연결을 복사하지 않음
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_process_pool():
+    """서버 종료 시 호출"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def split_range(start: int, end: int, parts: int) -> list:
+    """[start, end)를 거의 같은 길이의 연속 구간 parts개로 (빈 구간 제외)"""
+    parts = max(1, min(parts, end - start))
+    step, extra = divmod(end - start, parts)
+    ranges, low = [], start
+    for i in range(parts):
+        high = low + step + (1 if i < extra else 0)
+        ranges.append((low, high))
+        low = high
+    return ranges
+
+
+# ------------------------------------------------
+# 2) DB 파싱 (날짜 범위 분할)
+# ------------------------------------------------
+def ingest_db_file_parallel(
+    db_path: str,
+    mode: str = DB_PARSE_MODE,
+    since_day: int = None,
+    workers: int = INGEST_PROCESS_WORKERS,
+    pool: ProcessPoolExecutor = None,
+) -> tuple:
+    """
+    ingest_db_file과 같은 결과 (날짜별 raw_json, 테이블별 마지막 local_date)
+
+    workers가 1 이하 / json 방식 / 날짜 수가 적으면 ingest_db_file 그대로 실행
+    """
+    if workers <= 1 or mode == "json":
+        return ingest_db_file(db_path, mode, since_day)
+
+    bounds = day_bounds(db_path, since_day)
+    if bounds is None or bounds[1] - bounds[0] < INGEST_PARALLEL_MIN_DAYS:
+        return ingest_db_file(db_path, mode, since_day)
+
+    pool = pool or get_process_pool(workers)
+    futures = [
+        # 워커 프로세스: [low, high) 범위만 읽어 날짜별 누적
+        pool.submit(accumulate_db_file, db_path, mode, low, high)
+        for low, high in split_range(*bounds, workers)
+    ]
+
+    accumulator = DayAccumulator()
+    for future in futures:
+        part, tables = future.result()
+        accumulator.merge(part)
+    return accumulator_result(accumulator, tables)
+
+
+# ------------------------------------------------
+# 3) 날짜별 전처리 (날짜 구간 분할)
+# ------------------------------------------------
+def _preprocess_days(items: list, platform: str) -> list:
+    """워커 프로세스: [(date_int, raw_json)] → summary 목록 (같은 순서)"""
+    return preprocess_health_json_batch(dict(items), platform)
+
+
+def preprocess_days_parallel(
+    raw_by_day: dict,
+    platform: str,
+    workers: int = INGEST_PROCESS_WORKERS,
+    pool: ProcessPoolExecutor = None,
+) -> list:
+    """
+    날짜별 raw_json → summary 목록 (raw_by_day 순서)
+
+    workers가 1 이하 / 날짜 수가 적으면 현재 프로세스에서 처리
+    """
+    items = list(raw_by_day.items())
+    if workers <= 1 or len(items) < INGEST_PARALLEL_MIN_DAYS:
+        return _preprocess_days(items, platform)
+
+    pool = pool or get_process_pool(workers)
+    futures = [
+        pool.submit(_preprocess_days, items[low:high], platform)
+        for low, high in split_range(0, len(items), workers)
+    ]
+
+    summaries = []
+    for future in futures:
+        summaries.extend(future.result())
+    return summaries
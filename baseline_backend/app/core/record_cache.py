@@ -0,0 +1,186 @@
+"""
+파싱된 일별 기록 캐시 (LRU, 프로세스별)
+
+- 기록 1개 = (user_id, doc_id, updated_at) 키
+  → 다시 저장되면 updated_at이 바뀌므로 예전 항목은 조회되지 않음
+- 조회 결과(최근 N일, 특정 날짜, 날짜 범위)는 기록 키 목록으로 보관
+  → 같은 조회가 반복되면 SQLite 쿼리 / JSON 파싱 없이 dict 조회로 끝
+- 저장/삭제 시 해당 사용자의 조회 결과 + 기록 무효화 (세대 번호 증가)
+  → 무효화 전에 시작한 조회 결과는 캐시에 넣지 않음
+- 다른 서버 프로세스의 저장/삭제는 version_of(user_id)(공유 세대 번호)로 확인
+  → 조회 결과를 꺼내기 전에 번호가 바뀌었으면 해당 사용자 캐시 무효화
+- 기록 / 조회 결과 키는 사용자별로도 모아 둠 → 무효화는 해당 사용자 항목 수에 비례
+- 최대 기록 수를 넘으면 가장 오래 사용하지 않은 기록부터 제거
+  (기록이 빠진 조회 결과는 다음 조회 때 다시 읽음)
+- 반환값은 복사본 (호출자가 항목을 수정해도 캐시는 그대로)
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def _copy_record(record: dict) -> dict:
+    return {**record, "raw": dict(record.get("raw") or {})}
+
+
+class RecordCache:
+    def __init__(self, max_records: int, max_views: int, version_of=None):
+        self.max_records = max_records
+        self.max_views = max_views
+        self.version_of = version_of  # user_id → 공유 세대 번호 (없으면 프로세스 안에서만 무효화)
+        self._shared_versions = {}  # user_id → 마지막으로 확인한 공유 세대 번호
+        self._records = OrderedDict()  # (user_id, doc_id, updated_at) → record
+        self._views = OrderedDict()  # (user_id, view_key) → (세대, [기록 키])
+        self._user_records = {}  # user_id → {기록 키}
+        self._user_views = {}  # user_id → {(user_id, view_key)}
+        self._generations = {}  # user_id → 세대 번호
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    @staticmethod
+    def record_key(record: dict) -> tuple:
+        return record["user_id"], record["document_id"], record["updated_at"]
+
+    # ------------------------------------------------
+    # 기록 단위 (유사 검색 결과 파싱용)
+    # ------------------------------------------------
+    def get_records(self, keys: list) -> dict:
+        """캐시에 있는 기록만 {키: 복사본}으로 반환"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                record = self._records.get(key)
+                if record is None:
+                    self._stats["misses"] += 1
+                    continue
+                self._records.move_to_end(key)
+                self._stats["hits"] += 1
+                found[key] = _copy_record(record)
+        return found
+
+    def put_records(self, records: list):
+        with self._lock:
+            self._put_records(records)
+
+    def _put_records(self, records: list):
+        for record in records:
+            key = self.record_key(record)
+            self._records[key] = _copy_record(record)
+            self._records.move_to_end(key)
+            self._user_records.setdefault(key[0], set()).add(key)
+        while len(self._records) > self.max_records:
+            key, _ = self._records.popitem(last=False)
+            self._discard(self._user_records, key)
+            self._stats["evictions"] += 1
+
+    @staticmethod
+    def _discard(index: dict, key: tuple):
+        keys = index.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[key[0]]
+
+    # ------------------------------------------------
+    # 조회 결과 단위 (최근 N일 / 날짜 / 날짜 범위)
+    # ------------------------------------------------
+    def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def sync(self, user_id: str):
+        """
+        공유 세대 번호 확인 → 마지막 확인 이후 바뀌었으면 (다른 프로세스의 저장/삭제) 무효화
+
+        이 프로세스에서 무효화한 뒤 처음 확인할 때는 기록만 함 (이미 비어 있음)
+        """
+        if self.version_of is None:
+            return
+        version = self.version_of(user_id)
+        with self._lock:
+            seen = self._shared_versions.get(user_id)
+            if seen is not None and seen != version:
+                self._invalidate({user_id})
+            self._shared_versions[user_id] = version
+
+    def get_view(self, user_id: str, view_key: tuple):
+        """캐시된 조회 결과 (없거나 무효화됐거나 기록이 빠졌으면 None)"""
+        self.sync(user_id)
+        with self._lock:
+            entry = self._views.get((user_id, view_key))
+            generation = self._generations.get(user_id, 0)
+
+            records = None
+            if entry is not None and entry[0] == generation:
+                records = [self._records.get(key) for key in entry[1]]
+                if any(record is None for record in records):
+                    records = None
+
+            if records is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._views.move_to_end((user_id, view_key))
+            for key in entry[1]:
+                self._records.move_to_end(key)
+            self._stats["hits"] += 1
+            return [_copy_record(record) for record in records]
+
+    def put_view(self, user_id: str, view_key: tuple, records: list, generation: int):
+        """
+        조회 결과 저장
+
+        generation: 조회 시작 전에 읽은 세대 번호 (그 사이 저장/삭제가 있었으면 버림)
+        """
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return
+            self._put_records(records)
+            self._views[(user_id, view_key)] = (
+                generation,
+                [self.record_key(record) for record in records],
+            )
+            self._views.move_to_end((user_id, view_key))
+            self._user_views.setdefault(user_id, set()).add((user_id, view_key))
+            while len(self._views) > self.max_views:
+                key, _ = self._views.popitem(last=False)
+                self._discard(self._user_views, key)
+
+    # ------------------------------------------------
+    # 무효화
+    # ------------------------------------------------
+    def invalidate(self, user_ids: set):
+        if not user_ids:
+            return
+        with self._lock:
+            self._invalidate(user_ids)
+
+    def _invalidate(self, user_ids: set):
+        for user_id in user_ids:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._shared_versions.pop(user_id, None)
+            for key in self._user_views.pop(user_id, ()):
+                del self._views[key]
+            for key in self._user_records.pop(user_id, ()):
+                del self._records[key]
+        self._stats["invalidations"] += len(user_ids)
+
+    def clear(self):
+        with self._lock:
+            for user_id in self._generations:
+                self._generations[user_id] += 1
+            self._shared_versions.clear()
+            self._views.clear()
+            self._records.clear()
+            self._user_views.clear()
+            self._user_records.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "records": len(self._records),
+                "views": len(self._views),
+            }
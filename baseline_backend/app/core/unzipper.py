@@ -1,14 +1,24 @@
 import zipfile
 import os
+import shutil
+import struct
 import tempfile
 
+from app.config import UPLOAD_CHUNK_BYTES
+
+SQLITE_SIGNATURE = b"SQLite format 3"
+
+# ZIP local file header: 고정 30바이트 + 파일명 + extra field
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
 
 def is_sqlite_file(path: str) -> bool:
     """SQLite 파일인지 시그니처로 검사"""
     try:
         with open(path, "rb") as f:
             header = f.read(16)
-            return header.startswith(b"SQLite format 3")
+            return header.startswith(SQLITE_SIGNATURE)
     except:
         return False
 
@@ -17,6 +27,9 @@ def extract_zip_to_temp(zip_path: str) -> str:
     """
     ZIP 파일을 임시 폴더에 압축해제하고,
     그 안에서 SQLite DB 파일(.db 확장자 여부와 상관 없음)을 찾아 반환한다.
+
+    (기존 방식: 모든 멤버 해제 → 파일마다 시그니처 검사. 업로드 경로는
+     extract_sqlite_member 사용, 벤치마크 비교용으로 남겨 둠)
     """
 
     # 1) 임시 디렉토리 생성
@@ -37,3 +50,105 @@ def extract_zip_to_temp(zip_path: str) -> str:
 
     # 못 찾으면 에러
     raise FileNotFoundError("ZIP 안에서 SQLite DB 파일을 찾지 못했습니다.")
+
+
+# ------------------------------------------------
+# 필요한 멤버만 추출
+# ------------------------------------------------
+def find_sqlite_member(zip_ref: zipfile.ZipFile):
+    """
+    central directory(infolist)에서 SQLite 멤버 찾기
+
+    - 멤버마다 앞 16바이트만 읽어 시그니처 검사 (압축 멤버도 앞부분만 해제)
+    - .db 이름 → 큰 파일 순으로 검사 (보통 첫 후보에서 찾음)
+
+    Returns:
+        ZipInfo 또는 None
+    """
+    candidates = [
+        info
+        for info in zip_ref.infolist()
+        if not info.is_dir() and info.file_size >= len(SQLITE_SIGNATURE)
+    ]
+    candidates.sort(
+        key=lambda info: (not info.filename.lower().endswith(".db"), -info.file_size)
+    )
+
+    for info in candidates:
+        try:
+            with zip_ref.open(info) as member:
+                if member.read(16).startswith(SQLITE_SIGNATURE):
+                    return info
+        except (RuntimeError, NotImplementedError, zipfile.BadZipFile):
+            # 암호화 / 지원하지 않는 압축 방식 멤버는 건너뜀
+            continue
+    return None
+
+
+def _member_data_offset(f, info: zipfile.ZipInfo) -> int:
+    """ZIP 파일 안에서 멤버 데이터가 시작하는 위치 (local header 뒤)"""
+    f.seek(info.header_offset)
+    signature, name_length, extra_length = _LOCAL_HEADER.unpack(
+        f.read(_LOCAL_HEADER.size)
+    )
+    if signature != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"잘못된 local header: {info.filename}")
+    return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+
+
+def _copy_stored_member(zip_path: str, info: zipfile.ZipInfo, dest_path: str):
+    """
+    무압축(STORED) 멤버: ZIP 안의 바이트 범위를 그대로 복사
+
+    - os.copy_file_range로 커널 안에서 복사 (파이썬 버퍼 / CRC 계산 없음)
+    - 지원하지 않는 환경이면 seek 후 chunk 복사
+    """
+    with open(zip_path, "rb") as src, open(dest_path, "wb") as dst:
+        offset = _member_data_offset(src, info)
+        remaining = info.file_size
+        try:
+            while remaining:
+                copied = os.copy_file_range(
+                    src.fileno(),
+                    dst.fileno(),
+                    min(remaining, 1 << 30),
+                    offset_src=offset + info.file_size - remaining,
+                )
+                if not copied:
+                    raise OSError("copy_file_range가 0바이트를 반환")
+                remaining -= copied
+        except (AttributeError, OSError):
+            src.seek(offset + info.file_size - remaining)
+            dst.seek(info.file_size - remaining)
+            while remaining:
+                chunk = src.read(min(remaining, UPLOAD_CHUNK_BYTES))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"멤버 데이터가 잘렸습니다: {info.filename}")
+                dst.write(chunk)
+                remaining -= len(chunk)
+
+
+def extract_sqlite_member(zip_path: str, dest_dir: str) -> str:
+    """
+    ZIP 안의 SQLite DB 멤버 하나만 dest_dir에 추출하고 경로 반환
+
+    - 다른 멤버는 해제하지 않음
+    - 무압축 멤버는 바이트 범위 복사, 압축 멤버는 UPLOAD_CHUNK_BYTES씩 스트리밍 해제
+    - 파일명은 멤버 경로의 마지막 부분만 사용 (ZIP 안 경로로 dest_dir 밖에 쓰지 않음)
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        info = find_sqlite_member(zip_ref)
+        if info is None:
+            raise FileNotFoundError("ZIP 안에서 SQLite DB 파일을 찾지 못했습니다.")
+
+        dest_path = os.path.join(
+            dest_dir, os.path.basename(info.filename) or "health_data.db"
+        )
+
+        if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            _copy_stored_member(zip_path, info, dest_path)
+        else:
+            with zip_ref.open(info) as member, open(dest_path, "wb") as dst:
+                shutil.copyfileobj(member, dst, UPLOAD_CHUNK_BYTES)
+
+    return dest_path
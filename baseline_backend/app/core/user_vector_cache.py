@@ -0,0 +1,195 @@
+"""
+사용자별 임베딩 행렬 캐시 (NumPy brute-force 검색)
+
+- 사용자 1명의 문서는 많아야 수천 개 → HNSW + where 필터 대신
+  (문서 수 × 차원) 행렬 1번 곱셈 + argpartition으로 정확한 top-k 계산
+- 첫 검색 시 ChromaDB에서 해당 사용자 대표 기록(is_canonical)만 읽어 적재
+- 저장/삭제 시 해당 사용자 캐시 무효화 (다음 검색 때 다시 적재)
+- 최대 사용자 수를 넘으면 가장 오래 사용하지 않은 사용자부터 제거 (LRU)
+- 캐시는 프로세스별 → 검색할 때마다 version_of(user_id)(공유 세대 번호)를 확인해
+  적재 시점과 다르면 (다른 서버 프로세스의 저장/삭제) 다시 적재
+- 행렬 저장 형식: float32 | float16 | int8 (행별 스케일, float32 대비 메모리 1/4)
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.utils.vector_quantization import check_dtype, quantize_matrix
+
+
+# float16/int8 행렬은 BLAS 곱셈이 없어서 이 행 수만큼씩 float32로 바꿔 곱함
+# (임시 메모리는 블록 크기로 제한)
+SCORE_BLOCK_ROWS = 2048
+
+
+class _UserMatrix:
+    """사용자 1명의 정규화된 임베딩 행렬 + 필터/결과용 메타데이터"""
+
+    def __init__(self, ids: list, embeddings, metadatas: list, dtype):
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        self.ids = list(ids)
+        self.metadatas = list(metadatas)
+        self.matrix, self.scales = quantize_matrix(matrix / norms, dtype)
+        self.timestamps = np.array(
+            [m.get("timestamp", 0) for m in metadatas], dtype=np.int64
+        )
+        self.health_scores = np.array(
+            [m.get("health_score", 0) or 0 for m in metadatas], dtype=np.float32
+        )
+        self.platforms = np.array([m.get("platform", "") for m in metadatas])
+        self.version = None  # 적재 전에 읽은 공유 세대 번호
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """정규화된 질의와의 코사인 유사도 (float32)"""
+        if self.matrix.dtype == np.float32:
+            return self.matrix @ query
+
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), SCORE_BLOCK_ROWS):
+            block = self.matrix[start : start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start : start + SCORE_BLOCK_ROWS] = block @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+
+class UserVectorCache:
+    """
+    user_id → _UserMatrix
+
+    loader(user_id)는 collection.get() 결과 형식
+    {"ids": [...], "embeddings": [...], "metadatas": [...]}을 반환해야 한다.
+    version_of(user_id)는 프로세스 간 공유 세대 번호 (없으면 invalidate()로만 무효화)
+    """
+
+    def __init__(self, loader, max_users: int, dtype: str = "float32", version_of=None):
+        self.loader = loader
+        self.version_of = version_of
+        self.max_users = max_users
+        self.dtype = check_dtype(dtype)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "loads": 0, "invalidations": 0}
+
+    # ------------------------------------------------
+    # 적재 / 무효화
+    # ------------------------------------------------
+    def _get(self, user_id: str) -> _UserMatrix:
+        # 적재 전에 읽음 → 적재 중에 저장이 있었으면 다음 검색 때 번호가 달라 다시 적재
+        version = self.version_of(user_id) if self.version_of is not None else None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(user_id)
+                self._stats["hits"] += 1
+                return entry
+
+        # 적재는 락 밖에서 (다른 사용자 검색을 막지 않도록)
+        loaded = self.loader(user_id)
+        ids = loaded.get("ids") or []
+        embeddings = loaded.get("embeddings")
+        if embeddings is None:
+            embeddings = []
+        entry = _UserMatrix(ids, embeddings, loaded.get("metadatas") or [], self.dtype)
+        entry.version = version
+
+        with self._lock:
+            self._entries[user_id] = entry
+            self._entries.move_to_end(user_id)
+            self._stats["loads"] += 1
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_ids):
+        """저장/삭제된 사용자 캐시 제거"""
+        with self._lock:
+            for user_id in user_ids:
+                if self._entries.pop(user_id, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # ------------------------------------------------
+    # 검색
+    # ------------------------------------------------
+    def query(
+        self,
+        user_id: str,
+        query_embedding,
+        n_results: int,
+        platform: str = None,
+        health_score_range: tuple = None,
+    ) -> dict:
+        """
+        코사인 거리 기준 정확한 top-k (ChromaDB query() 결과와 같은 형식)
+
+        Returns:
+            {"ids": [[...]], "metadatas": [[...]], "distances": [[...]]}
+        """
+        entry = self._get(user_id)
+        empty = {"ids": [[]], "metadatas": [[]], "distances": [[]]}
+        if len(entry) == 0 or n_results <= 0:
+            return empty
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        similarities = entry.scores(query.astype(np.float32))
+
+        # 메타데이터 필터는 마스크로 (필터 때문에 결과가 빠지는 일 없음)
+        candidates = np.arange(len(entry))
+        mask = np.ones(len(entry), dtype=bool)
+        if platform:
+            mask &= entry.platforms == platform
+        if health_score_range:
+            min_score, max_score = health_score_range
+            mask &= (entry.health_scores >= min_score) & (
+                entry.health_scores <= max_score
+            )
+        if not mask.all():
+            candidates = candidates[mask]
+            if len(candidates) == 0:
+                return empty
+
+        k = min(n_results, len(candidates))
+        scores = similarities[candidates]
+        if k < len(candidates):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        rows = candidates[top]
+        return {
+            "ids": [[entry.ids[i] for i in rows]],
+            "metadatas": [[entry.metadatas[i] for i in rows]],
+            "distances": [[float(1.0 - similarities[i]) for i in rows]],
+        }
+
+    def stats(self) -> dict:
+        """캐시 현황 (디버깅용)"""
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "max_users": self.max_users,
+                "documents": sum(len(e) for e in self._entries.values()),
+                "bytes": sum(
+                    e.matrix.nbytes + (0 if e.scales is None else e.scales.nbytes)
+                    for e in self._entries.values()
+                ),
+                "dtype": self.dtype,
+                **self._stats,
+            }
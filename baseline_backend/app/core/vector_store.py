@@ -1,14 +1,62 @@
 """
 VectorDB 중복 방지 + 검색 개선 버전
 - 같은 날짜, 같은 출처의 데이터는 덮어쓰기
-- 검색 시 같은 날짜 중복 제거 + 최신 날짜 우선 정렬
+- 같은 날짜에 출처가 여러 개면 저장 시점에 대표 기록 지정 (is_canonical)
+  → 검색/조회는 대표 기록만 읽음 (읽을 때 중복 제거 없음)
+- 유사 검색은 유사도 + 최신성 점수로 재정렬, 거리 상한을 넘는 결과는 제외
+- 사용자별 샤드 컬렉션으로 분할 가능 (COLLECTION_PARTITIONING)
 - 날짜 필터링 함수 추가 (개선)
+- ChromaDB / 임베딩 백엔드는 첫 사용 시 생성 (import 시 디스크/네트워크 접근 없음)
+- 파싱된 기록은 LRU 캐시에 보관, 저장/삭제 시 해당 사용자만 무효화
+- 앱 자동 업로드는 지연 저장 가능 (사용자별로 모아서 임베딩/upsert 1번)
+- 오래된 날짜는 보관소(cold tier)로 이동, 날짜/기간 조회는 보관소까지 읽음
 """
 
-import os, json, chromadb
-from chromadb import PersistentClient
-from openai import OpenAI
-from datetime import datetime
+import json, time, random, hashlib, threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from app.config import (
+    CHROMA_PERSIST_DIR,
+    CHROMA_COLLECTION_NAME,
+    COLLECTION_PARTITIONING,
+    COLLECTION_HASH_BUCKETS,
+    SOURCE_PRECEDENCE,
+    RAG_FETCH_MULTIPLIER,
+    RAG_MAX_DISTANCE,
+    RAG_SIMILARITY_WEIGHT,
+    RAG_RECENCY_WEIGHT,
+    RAG_RECENCY_HALF_LIFE_DAYS,
+    VECTOR_SEARCH_MODE,
+    USER_VECTOR_CACHE_MAX_USERS,
+    USER_VECTOR_CACHE_DTYPE,
+    RECORD_CACHE_MAX_RECORDS,
+    RECORD_CACHE_MAX_VIEWS,
+    CACHE_VERSION_CHECK_SEC,
+    WRITE_BEHIND_WINDOW_SEC,
+    WRITE_BEHIND_MAX_DELAY_SEC,
+    WRITE_BEHIND_MAX_ITEMS,
+    RETENTION_HOT_DAYS,
+    ARCHIVE_DIR,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_NATIVE_DIMENSIONS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_TOKENS_PER_BATCH,
+    EMBEDDING_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_RETRY_BASE_DELAY,
+)
+from app.core.collection_router import CollectionRouter
+from app.core.embedding_cache import EmbeddingCache
+from app.core.user_vector_cache import UserVectorCache
+from app.core.record_cache import RecordCache
+from app.core.write_behind import WriteBehindBuffer
+from app.core.archive_store import ArchiveStore
+from app.core.embedding_backend import get_embedding_backend
+from app.core import day_store
+from app.utils.singleflight import SingleFlight
+from app.utils.vector_quantization import truncate_vectors
 from app.utils.preprocess_for_embedding import summary_to_natural_text
 from app.core.health_interpreter import (
     calculate_health_score,
@@ -17,139 +65,681 @@ from app.core.health_interpreter import (
 
 
 # ------------------------------------------------
-# 1) OpenAI Client
+# 1) 임베딩 백엔드 (EMBEDDING_BACKEND: openai | local)
+#    get_embedding_backend(): 첫 호출 시 생성
+# ------------------------------------------------
+
+
 # ------------------------------------------------
-def get_openai_client():
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("❌ OPENAI_API_KEY가 설정되지 않았습니다.")
-    return OpenAI(api_key=api_key)
+# 2) ChromaDB Client (첫 사용 시 생성)
+# ------------------------------------------------
+_collection_router = None
+_init_lock = threading.Lock()
+
+
+def _collection_name(backend_name: str, dimensions: int = None) -> str:
+    """
+    백엔드/차원별 기본 컬렉션 이름 (벡터 차원이 다르면 컬렉션을 분리)
+
+    - openai 원본 차원: 기존 컬렉션 그대로 (summaries)
+    - openai 축소 차원: summaries_openai512 등
+    - 그 외 백엔드: summaries_local 등
+    """
+    if backend_name != "openai":
+        return f"{CHROMA_COLLECTION_NAME}_{backend_name}"
+    if dimensions and dimensions != EMBEDDING_NATIVE_DIMENSIONS:
+        return f"{CHROMA_COLLECTION_NAME}_openai{dimensions}"
+    return CHROMA_COLLECTION_NAME
+
+
+def get_collection_router() -> CollectionRouter:
+    """
+    사용자 → 샤드 컬렉션 라우터 (COLLECTION_PARTITIONING: single | hash | user)
+
+    첫 호출 때 chromadb를 import하고 PersistentClient를 연다.
+    """
+    global _collection_router
+    if _collection_router is None:
+        with _init_lock:
+            if _collection_router is None:
+                from chromadb import PersistentClient
+
+                backend = get_embedding_backend()
+
+                _collection_router = CollectionRouter(
+                    PersistentClient(path=CHROMA_PERSIST_DIR),
+                    _collection_name(backend.name, getattr(backend, "dimensions", None)),
+                    mode=COLLECTION_PARTITIONING,
+                    buckets=COLLECTION_HASH_BUCKETS,
+                    metadata={"hnsw:space": "cosine"},
+                )
+    return _collection_router
+
+
+def get_collection():
+    """기본 컬렉션 (single 모드 저장소, 분할 전 예전 문서)"""
+    return get_collection_router().base()
+
+
+def warm_up():
+    """
+    무거운 리소스를 미리 준비 (서버 시작 시 선택적으로 호출)
+
+    - 임베딩 백엔드, ChromaDB 클라이언트/기본 컬렉션
+    - day_store / 임베딩 캐시 SQLite 연결
+    """
+    started = time.perf_counter()
+    get_embedding_backend()
+    get_collection()
+    day_store.warm_up()
+    embedding_cache.stats()
+    print(f"[INFO] VectorDB 준비 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
 
 
 # ------------------------------------------------
-# 2) ChromaDB Client
+# 2-1) 사용자별 임베딩 행렬 캐시 (VECTOR_SEARCH_MODE=numpy)
 # ------------------------------------------------
-chroma_client = PersistentClient(path="./chroma_data")
+def _load_user_vectors(user_id: str) -> dict:
+    """사용자 대표 기록의 임베딩 + 메타데이터 (user_vector_cache 적재용)"""
+    return get_collection_router().for_user(user_id).get(
+        where={"$and": [{"user_id": user_id}, {"is_canonical": True}]},
+        include=["embeddings", "metadatas"],
+    )
+
 
-collection = chroma_client.get_or_create_collection(
-    name="summaries", metadata={"hnsw:space": "cosine"}
+# user_id → (확인 시각, 공유 세대 번호)
+_cache_versions = {}
+
+
+def _shared_cache_version(user_id: str) -> int:
+    """
+    day_store 공유 세대 번호 (CACHE_VERSION_CHECK_SEC 동안은 마지막으로 읽은 값)
+
+    → 캐시 hit마다 SQLite를 조회하지 않음, 다른 프로세스의 저장은 최대 이 간격만큼 늦게 반영
+    """
+    now = time.monotonic()
+    checked = _cache_versions.get(user_id)
+    if checked is not None and now - checked[0] < CACHE_VERSION_CHECK_SEC:
+        return checked[1]
+    version = day_store.get_cache_version(user_id)
+    _cache_versions[user_id] = (now, version)
+    return version
+
+
+user_vector_cache = UserVectorCache(
+    _load_user_vectors,
+    USER_VECTOR_CACHE_MAX_USERS,
+    USER_VECTOR_CACHE_DTYPE,
+    version_of=_shared_cache_version,
 )
 
+# 동시에 들어온 같은 조회(같은 사용자 + 같은 인자)는 한 번만 실행
+read_flights = SingleFlight()
+
 
 # ------------------------------------------------
-# 3) 임베딩 + 캐싱
+# 2-2) 파싱된 일별 기록 캐시 (저장/삭제 시 사용자 단위 무효화)
 # ------------------------------------------------
-embedding_cache = {}
+record_cache = RecordCache(
+    RECORD_CACHE_MAX_RECORDS,
+    RECORD_CACHE_MAX_VIEWS,
+    version_of=_shared_cache_version,
+)
 
 
-def embed_text(text: str):
-    """단일 텍스트 임베딩"""
-    if not text or not text.strip():
-        text = "데이터 없음"
+def _invalidate_user_caches(user_ids: set):
+    """
+    저장/삭제된 사용자의 행렬 캐시 / 기록 캐시 무효화
+
+    day_store의 공유 세대 번호도 올림 → 같은 저장소를 쓰는 다른 서버 프로세스의
+    캐시는 다음 조회 때 번호가 바뀐 것을 보고 다시 읽음
+    """
+    if not user_ids:
+        return
+    day_store.bump_cache_versions(user_ids)
+    # 이 프로세스는 올린 번호를 바로 다시 읽음 (간격이 지난 뒤 한 번 더 무효화되지 않도록)
+    for user_id in user_ids:
+        _cache_versions.pop(user_id, None)
+    user_vector_cache.invalidate(user_ids)
+    record_cache.invalidate(user_ids)
+
+
+def _clear_user_caches():
+    """전체 사용자 캐시 무효화 (마이그레이션 등, 다른 프로세스는 전체 세대 번호로)"""
+    day_store.bump_cache_versions(None)
+    _cache_versions.clear()
+    user_vector_cache.clear()
+    record_cache.clear()
+
+
+def _cached_view(user_id: str, view_key: tuple, loader) -> list:
+    """조회 결과 캐시 확인 → 없으면 loader()로 읽고 저장"""
+    records = record_cache.get_view(user_id, view_key)
+    if records is not None:
+        return records
+
+    generation = record_cache.generation(user_id)
+    records = loader()
+    record_cache.put_view(user_id, view_key, records, generation)
+    return records
+
+
+def get_record_cache_stats() -> dict:
+    """파싱된 기록 캐시 hit/miss 현황"""
+    return record_cache.stats()
+
+
+# ------------------------------------------------
+# 2-3) 보관소 (RETENTION_HOT_DAYS보다 오래된 날짜)
+# ------------------------------------------------
+archive_store = ArchiveStore(ARCHIVE_DIR)
+
+
+def _merge_archived(hot: list, archived: list) -> list:
+    """hot 기록 + 보관 기록 (같은 날짜는 hot 우선, 최신 날짜순)"""
+    if not archived:
+        return hot
+
+    hot_days = {record["timestamp"] for record in hot}
+    merged = hot + [
+        {k: v for k, v in record.items() if k != "is_canonical"}
+        for record in archived
+        if record["timestamp"] not in hot_days
+    ]
+    return sorted(merged, key=lambda record: record["timestamp"], reverse=True)
+
+
+def retention_cutoff(hot_days: int = RETENTION_HOT_DAYS, today=None) -> int | None:
+    """이 날짜(YYYYMMDD 정수)보다 오래된 기록은 보관 대상 (보관하지 않으면 None)"""
+    if hot_days <= 0:
+        return None
+    today = today or datetime.now()
+    return int((today - timedelta(days=hot_days)).strftime("%Y%m%d"))
+
 
+def get_user_records(user_id: str, platform: str = None, limit: int = None) -> list:
+    """
+    day_store.get_user_records + 보관된 기록 (출처별 원본 모두, 같은 형식)
+
+    - 최신 날짜순, 같은 날짜는 최근 업데이트순
+    - 같은 doc_id는 hot 기록 우선
+    """
+    records = day_store.get_user_records(user_id, platform=platform, limit=limit)
+    if (limit and len(records) >= limit) or not archive_store.months(user_id):
+        return records
+
+    hot_ids = {record["document_id"] for record in records}
+    archived = [
+        {k: v for k, v in record.items() if k != "is_canonical"}
+        for record in archive_store.read_range(user_id, 0, 99991231, canonical_only=False)
+        if record["document_id"] not in hot_ids
+        and (
+            not platform
+            or record.get("platform") == platform
+            or platform in (record.get("source") or "")
+        )
+    ]
+    merged = sorted(
+        records + archived,
+        key=lambda record: (record["timestamp"], record.get("updated_at") or ""),
+        reverse=True,
+    )
+    return merged[:limit] if limit else merged
+
+
+# ------------------------------------------------
+# 3) 임베딩 + 캐싱 (디스크 영구 캐시)
+# ------------------------------------------------
+embedding_cache = EmbeddingCache(
+    EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_DTYPE
+)
+
+
+def _prepare_embedding_text(text: str) -> str:
+    """빈 문자열/과도한 길이 보정"""
+    if not text or not text.strip():
+        return "데이터 없음"
     if len(text) > 8000:
-        text = text[:8000]
+        return text[:8000]
+    return text
+
 
-    client = get_openai_client()
-    response = client.embeddings.create(input=text, model="text-embedding-3-small")
-    return response.data[0].embedding
+def embed_text(text: str):
+    """단일 텍스트 임베딩"""
+    text = _prepare_embedding_text(text)
+    return get_embedding_backend().embed([text])[0]
 
 
 def get_cached_embedding(text: str):
-    """캐시된 임베딩 반환"""
-    if text not in embedding_cache:
-        embedding_cache[text] = embed_text(text)
-    return embedding_cache[text]
+    """캐시된 임베딩 반환 (없으면 생성 후 캐시에 저장)"""
+    text = _prepare_embedding_text(text)
+    key = EmbeddingCache.make_key(text, get_embedding_backend().model)
+
+    cached = embedding_cache.get_many([key])
+    if key in cached:
+        return cached[key]
+
+    embedding = embed_text(text)
+    embedding_cache.put_many([(key, embedding)])
+    return embedding
 
 
 def batch_embed_texts(texts: list[str]):
-    """배치 임베딩"""
+    """배치 임베딩 (캐시에 없는 텍스트만 백엔드 호출)"""
     if not texts:
         return []
 
-    processed_texts = []
-    for text in texts:
-        if not text or not text.strip():
-            processed_texts.append("데이터 없음")
-        elif len(text) > 8000:
-            processed_texts.append(text[:8000])
-        else:
-            processed_texts.append(text)
+    processed_texts = [_prepare_embedding_text(text) for text in texts]
+    keys = [
+        EmbeddingCache.make_key(text, get_embedding_backend().model)
+        for text in processed_texts
+    ]
+
+    cached = embedding_cache.get_many(keys)
+    hit_count = sum(1 for key in keys if key in cached)
+
+    # 캐시 미스 텍스트만 모아서 요청 (중복 제거)
+    missing = {}
+    for key, text in zip(keys, processed_texts):
+        if key not in cached and key not in missing:
+            missing[key] = text
+
+    if missing:
+        new_vectors = _embed_in_chunks(list(missing.values()))
+        new_items = list(zip(missing.keys(), new_vectors))
+        cached.update(new_items)
+
+    print(f"[INFO] 임베딩 캐시: {hit_count}개 적중, {len(missing)}개 신규 생성")
+
+    return [cached[key] for key in keys]
+
+
+# ------------------------------------------------
+# 3-1) 청크 단위 병렬 임베딩 (EMBEDDING_BATCH_SIZE 준수)
+# ------------------------------------------------
+embedding_executor = ThreadPoolExecutor(max_workers=EMBEDDING_CONCURRENCY)
 
-    client = get_openai_client()
-    response = client.embeddings.create(
-        input=processed_texts, model="text-embedding-3-small"
+# 마지막 배치 임베딩의 청크별 지연시간 (배치 크기 튜닝용)
+last_embedding_stats = {"chunks": [], "total_sec": 0.0}
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    토큰 수 상한 추정
+    BPE 토큰은 최소 1바이트이므로 UTF-8 바이트 수가 항상 상한이 된다.
+    """
+    return len(text.encode("utf-8"))
+
+
+def _split_embedding_chunks(texts: list[str]) -> list[list[int]]:
+    """
+    개수(EMBEDDING_BATCH_SIZE) + 토큰(EMBEDDING_MAX_TOKENS_PER_BATCH) 기준으로
+    텍스트 인덱스를 청크로 분할
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for idx, text in enumerate(texts):
+        tokens = _estimate_tokens(text)
+        if current and (
+            len(current) >= EMBEDDING_BATCH_SIZE
+            or current_tokens + tokens > EMBEDDING_MAX_TOKENS_PER_BATCH
+        ):
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+
+        current.append(idx)
+        current_tokens += tokens
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """요청 자체가 잘못된 경우(4xx)는 재시도하지 않음 (408/409/429 제외)"""
+    # openai.APIStatusError (openai 패키지를 여기서 import하지 않기 위해 속성으로 확인)
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in (408, 409, 429) or status_code >= 500
+    return True
+
+
+def _embed_chunk(chunk_texts: list[str], chunk_no: int, total_chunks: int) -> tuple:
+    """
+    청크 1개 임베딩 (실패 시 지수 백오프 재시도) + 캐시 저장
+
+    Returns:
+        (임베딩 리스트, 지연시간(초), 시도 횟수)
+    """
+    started = time.perf_counter()
+
+    for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+        try:
+            embeddings = get_embedding_backend().embed(chunk_texts)
+            break
+        except Exception as e:
+            if attempt >= EMBEDDING_MAX_RETRIES or not _is_retryable_error(e):
+                print(f"[ERROR] 임베딩 청크 {chunk_no}/{total_chunks} 실패: {e}")
+                raise
+
+            delay = EMBEDDING_RETRY_BASE_DELAY * (2**attempt)
+            delay += random.uniform(0, EMBEDDING_RETRY_BASE_DELAY)
+            print(
+                f"[WARN] 임베딩 청크 {chunk_no}/{total_chunks} 재시도 "
+                f"({attempt + 1}/{EMBEDDING_MAX_RETRIES}, {delay:.1f}초 후): {e}"
+            )
+            time.sleep(delay)
+
+    latency = time.perf_counter() - started
+
+    # 청크 단위로 바로 캐시 저장 → 뒤 청크가 실패해도 재시도 시 재사용
+    embedding_cache.put_many(
+        [
+            (EmbeddingCache.make_key(text, get_embedding_backend().model), vector)
+            for text, vector in zip(chunk_texts, embeddings)
+        ]
+    )
+
+    print(
+        f"[INFO] 임베딩 청크 {chunk_no}/{total_chunks}: "
+        f"{len(chunk_texts)}개, {latency:.2f}초 (시도 {attempt + 1}회)"
     )
+    return embeddings, latency, attempt + 1
+
 
-    return [item.embedding for item in response.data]
+def _embed_in_chunks(texts: list[str]) -> list:
+    """
+    텍스트를 청크로 나눠 EMBEDDING_CONCURRENCY개씩 병렬 요청 후
+    원래 순서대로 재조립
+    """
+    global last_embedding_stats
+
+    chunks = _split_embedding_chunks(texts)
+    total_chunks = len(chunks)
+    started = time.perf_counter()
+
+    futures = [
+        embedding_executor.submit(
+            _embed_chunk, [texts[i] for i in chunk], chunk_no, total_chunks
+        )
+        for chunk_no, chunk in enumerate(chunks, 1)
+    ]
+
+    results = [None] * len(texts)
+    chunk_stats = []
+    for chunk_no, (chunk, future) in enumerate(zip(chunks, futures), 1):
+        embeddings, latency, attempts = future.result()
+        for idx, vector in zip(chunk, embeddings):
+            results[idx] = vector
+        chunk_stats.append(
+            {
+                "chunk": chunk_no,
+                "size": len(chunk),
+                "latency_sec": round(latency, 4),
+                "attempts": attempts,
+            }
+        )
+
+    total_sec = time.perf_counter() - started
+    last_embedding_stats = {"chunks": chunk_stats, "total_sec": round(total_sec, 4)}
+
+    if total_chunks > 1:
+        latencies = [c["latency_sec"] for c in chunk_stats]
+        print(
+            f"[INFO] 배치 임베딩 완료: {len(texts)}개 / {total_chunks}청크, "
+            f"총 {total_sec:.2f}초 (청크 평균 {sum(latencies) / total_chunks:.2f}초, "
+            f"최대 {max(latencies):.2f}초)"
+        )
+
+    return results
+
+
+def get_embedding_stats() -> dict:
+    """마지막 배치 임베딩의 청크별 지연시간 조회"""
+    return last_embedding_stats
 
 
 # ------------------------------------------------
-# 4) Summary 단일 저장 (중복 방지!)
+# 4) 저장 공통: 문서 생성 + 변경 감지
 # ------------------------------------------------
-def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
+# 변경 감지 시 비교에서 제외하는 메타데이터 (저장할 때마다 바뀌는 값)
+_VOLATILE_METADATA_KEYS = {"updated_at"}
+
+# 문서 저장과 별도로 관리하는 메타데이터 (대표 기록 여부, 7) 참고)
+_MANAGED_METADATA_KEYS = {"is_canonical"}
+
+
+def _content_hash(embedding_text: str) -> str:
+    """임베딩 대상 텍스트 해시 (백엔드 모델이 바뀌면 다른 해시)"""
+    return EmbeddingCache.make_key(embedding_text, get_embedding_backend().model)
+
+
+def _record_hash(summary: dict) -> str:
+    """summary 전체 해시 (raw 지표만 바뀐 경우 감지용)"""
+    try:
+        payload = json.dumps(summary, ensure_ascii=False, sort_keys=True, default=str)
+    except Exception as e:
+        print(f"[WARN] Summary JSON 직렬화 실패: {e}")
+        payload = str(summary)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _build_document(summary: dict, user_id: str, source: str, update_timestamp: str):
     """
-    단일 요약 데이터를 VectorDB에 저장 (중복 방지 개선!)
+    summary → (doc_id, embedding_text, metadata, record)
 
-    개선 사항:
     - doc_id에서 timestamp 제거 → 같은 날짜/출처는 덮어쓰기
-    - upsert 사용으로 자동 중복 방지
+    - metadata: ChromaDB 필터용 작은 필드만 (summary 원본은 day_store에 저장)
+    - record: day_store 저장용 (raw 지표는 타입 있는 컬럼으로 저장됨)
+    - created_at이 없으면 None 반환
     """
-    raw = summary.get("raw", {})
+    created_at = summary.get("created_at")
+    if not created_at:
+        return None
 
+    raw = summary.get("raw", {})
     health_score = calculate_health_score(raw)
     intensity = recommend_exercise_intensity(raw)
 
-    created_at = summary.get("created_at")
-    if not created_at:
-        raise ValueError("❌ summary['created_at']가 존재하지 않습니다.")
-
     date = created_at[:10]  # yyyy-mm-dd
     platform = summary.get("platform", "unknown")
 
-    # ✅ 개선: timestamp 제거 - 중복 방지!
-    # 같은 날짜, 같은 출처는 하나만 저장
-    doc_id = f"{user_id}_{date}_{source}"
     # 예: "user_1@aaa.com_2024-10-01_zip_samsung"
+    doc_id = f"{user_id}_{date}_{source}"
 
     # Natural embedding 텍스트 생성
     embedding_text = summary_to_natural_text(summary)
 
-    # 임베딩 생성
-    embedding = get_cached_embedding(embedding_text)
-
-    # Metadata 준비
-    try:
-        summary_json = json.dumps(summary, ensure_ascii=False)
-    except Exception as e:
-        print(f"[WARN] Summary JSON 직렬화 실패: {e}")
-        summary_json = str(summary)
-
-    # 현재 시간 (업데이트 시간)
-    update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-
     metadata = {
         "user_id": user_id,
         "date": date,
         "timestamp": int(date.replace("-", "")),
         "health_score": health_score.get("score", 0),
         "recommended_intensity": intensity.get("recommended_level", "중"),
-        "fallback": False,
-        "summary_json": summary_json,
         "source": source,
         "platform": platform,
+        "content_hash": _content_hash(embedding_text),
+        "record_hash": _record_hash(summary),
         "updated_at": update_timestamp,  # ✅ 마지막 업데이트 시간
     }
 
-    # ✅ upsert: 같은 doc_id면 덮어쓰기, 없으면 추가
-    collection.upsert(
-        ids=[doc_id],
-        embeddings=[embedding],
-        documents=[embedding_text],
-        metadatas=[metadata],
+    record = {
+        "doc_id": doc_id,
+        "user_id": user_id,
+        "date": date,
+        "source": source,
+        "timestamp": metadata["timestamp"],
+        "platform": platform,
+        "created_at": created_at,
+        "summary_text": summary.get("summary_text", ""),
+        "health_score": metadata["health_score"],
+        "recommended_intensity": metadata["recommended_intensity"],
+        "updated_at": update_timestamp,
+        "raw": raw,
+    }
+
+    return doc_id, embedding_text, metadata, record
+
+
+def _metadata_changed(old: dict, new: dict) -> bool:
+    """updated_at / is_canonical을 제외한 메타데이터 비교"""
+    keys = (set(old) | set(new)) - _VOLATILE_METADATA_KEYS - _MANAGED_METADATA_KEYS
+    return any(old.get(key) != new.get(key) for key in keys)
+
+
+def _upsert_documents(documents: list[tuple]) -> dict:
+    """
+    사용자별 샤드 컬렉션으로 나눠서 저장 (_upsert_user_documents)
+
+    Returns:
+        {"embedded": [...], "metadata_updated": [...], "unchanged": [...]} (doc_id 목록)
+    """
+    by_user = {}
+    for document in documents:
+        by_user.setdefault(document[2]["user_id"], []).append(document)
+
+    changes = {"embedded": [], "metadata_updated": [], "unchanged": []}
+    for user_id, user_documents in by_user.items():
+        shard = get_collection_router().for_user(user_id)
+        for kind, doc_ids in _upsert_user_documents(shard, user_documents).items():
+            changes[kind].extend(doc_ids)
+    return changes
+
+
+def _upsert_user_documents(shard, documents: list[tuple]) -> dict:
+    """
+    변경 감지 후 필요한 문서만 저장
+
+    1. 기존 문서의 content_hash / record_hash를 한 번에 조회
+    2. 텍스트가 같고 메타데이터도 같으면 → 건너뜀
+    3. 텍스트가 같고 메타데이터만 다르면 → 메타데이터만 update (임베딩 없음)
+    4. 텍스트가 다르면 → 배치 내 중복 텍스트 제거 후 임베딩 + upsert
+    5. 바뀐 문서는 day_store에도 저장
+    6. 바뀐 날짜의 대표 기록 다시 선택
+
+    Args:
+        shard: 사용자 샤드 컬렉션
+        documents: [(doc_id, embedding_text, metadata, record), ...] (doc_id 중복 없음)
+
+    Returns:
+        {"embedded": [...], "metadata_updated": [...], "unchanged": [...]} (doc_id 목록)
+    """
+    ids = [doc_id for doc_id, _, _, _ in documents]
+    existing = shard.get(ids=ids, include=["metadatas"])
+    existing_meta = dict(zip(existing.get("ids", []), existing.get("metadatas", [])))
+
+    to_embed = []
+    to_update = []
+    unchanged = []
+
+    for doc_id, text, metadata, record in documents:
+        old = existing_meta.get(doc_id)
+        if old is not None:
+            # 예전 스키마 필드(summary_json 등)는 None으로 지정해서 삭제
+            for key in old:
+                if key not in metadata and key not in _MANAGED_METADATA_KEYS:
+                    metadata[key] = None
+
+        if old is None or old.get("content_hash") != metadata["content_hash"]:
+            to_embed.append((doc_id, text, metadata, record))
+        elif _metadata_changed(old, metadata):
+            to_update.append((doc_id, text, metadata, record))
+        else:
+            unchanged.append(doc_id)
+
+    if to_embed:
+        # 배치 내 같은 텍스트는 한 번만 임베딩
+        unique_texts = list(dict.fromkeys(text for _, text, _, _ in to_embed))
+        vectors = dict(zip(unique_texts, batch_embed_texts(unique_texts)))
+
+        shard.upsert(
+            ids=[doc_id for doc_id, _, _, _ in to_embed],
+            embeddings=[vectors[text] for _, text, _, _ in to_embed],
+            documents=[text for _, text, _, _ in to_embed],
+            metadatas=[metadata for _, _, metadata, _ in to_embed],
+        )
+
+    if to_update:
+        shard.update(
+            ids=[doc_id for doc_id, _, _, _ in to_update],
+            metadatas=[metadata for _, _, metadata, _ in to_update],
+        )
+
+    changed_records = [record for _, _, _, record in to_embed + to_update]
+    day_store.upsert_records(changed_records)
+    _refresh_canonical_days(
+        {(record["user_id"], record["timestamp"]) for record in changed_records}
     )
 
-    print(f"[INFO] VectorDB 저장: {doc_id} (플랫폼: {platform})")
+    print(
+        f"[INFO] 변경 감지: 임베딩 {len(to_embed)}개, 메타데이터만 갱신 {len(to_update)}개, "
+        f"변경 없음 {len(unchanged)}개"
+    )
+
+    return {
+        "embedded": [doc_id for doc_id, _, _, _ in to_embed],
+        "metadata_updated": [doc_id for doc_id, _, _, _ in to_update],
+        "unchanged": unchanged,
+    }
+
+
+def _refresh_canonical_days(days: set):
+    """
+    날짜별 대표 기록을 다시 선택하고 ChromaDB is_canonical 플래그 반영
+
+    - 선택 규칙: day_store.canonical_rank (SOURCE_PRECEDENCE → 최근 업데이트)
+    - 해당 날짜의 모든 출처 문서에 True/False를 명시적으로 기록
+    """
+    by_user = {}
+    for user_id, timestamp in days:
+        by_user.setdefault(user_id, set()).add((user_id, timestamp))
+
+    for user_id, user_days in by_user.items():
+        flags = day_store.refresh_canonical_days(user_days)
+        shard = get_collection_router().for_user(user_id)
+
+        doc_ids = list(flags)
+        for start in range(0, len(doc_ids), 1000):
+            chunk = doc_ids[start : start + 1000]
+            shard.update(
+                ids=chunk,
+                metadatas=[{"is_canonical": flags[doc_id]} for doc_id in chunk],
+            )
+
+    # 저장/삭제가 있었던 사용자의 행렬 캐시 / 기록 캐시는 다음 조회 때 다시 적재
+    _invalidate_user_caches({user_id for user_id, _ in days})
+
+
+# ------------------------------------------------
+# 5) Summary 단일 저장 (중복 방지!)
+# ------------------------------------------------
+def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
+    """
+    단일 요약 데이터를 VectorDB에 저장 (중복 방지 개선!)
+
+    개선 사항:
+    - doc_id에서 timestamp 제거 → 같은 날짜/출처는 덮어쓰기
+    - upsert 사용으로 자동 중복 방지
+    - 내용이 같으면 임베딩/저장 생략 (content_hash 비교)
+    """
+    if not summary.get("created_at"):
+        raise ValueError("❌ summary['created_at']가 존재하지 않습니다.")
+
+    # 현재 시간 (업데이트 시간)
+    update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    document = _build_document(summary, user_id, source, update_timestamp)
+    doc_id, _, metadata, _ = document
+    date = metadata["date"]
+    platform = metadata["platform"]
+
+    changes = _upsert_documents([document])
+    change = next(kind for kind, doc_ids in changes.items() if doc_ids)
+
+    print(f"[INFO] VectorDB 저장: {doc_id} (플랫폼: {platform}, {change})")
 
     return {
         "status": "saved",
@@ -158,118 +748,246 @@ def save_daily_summary(summary: dict, user_id: str, source: str = "api"):
         "user_id": user_id,
         "source": source,
         "platform": platform,
+        "change": change,
     }
 
 
 # ------------------------------------------------
-# 5) Summary 배치 저장 (중복 방지!)
+# 5-1) Summary 배치 저장 (중복 방지 + 변경 감지)
 # ------------------------------------------------
 def save_daily_summaries_batch(
     summaries: list[dict], user_id: str, source: str = "zip"
 ):
     """
     여러 요약 데이터를 한 번에 VectorDB에 저장 (중복 방지 개선!)
+
+    - 같은 ZIP을 다시 올려도 바뀐 날짜만 임베딩 (나머지는 건너뜀)
     """
     if not summaries:
         print("[WARN] summaries가 비어 있어서 저장하지 않습니다.")
         return {"status": "skipped", "reason": "empty summaries"}
 
-    ids = []
-    embeddings_list = []
-    documents = []
-    metadatas = []
-    embedding_texts = []
-
     update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
-    # 1단계: 데이터 준비
+    # 1단계: 데이터 준비 (같은 doc_id는 마지막 것만 유지)
+    documents = {}
     for summary in summaries:
-        raw = summary.get("raw", {})
-        health_score = calculate_health_score(raw)
-        intensity = recommend_exercise_intensity(raw)
-
-        created_at = summary.get("created_at")
-        if not created_at:
+        document = _build_document(summary, user_id, source, update_timestamp)
+        if document is None:
             print(f"[WARN] summary에 created_at이 없어서 건너뜁니다")
             continue
+        documents[document[0]] = document
 
-        date = created_at[:10]
-        platform = summary.get("platform", "unknown")
-
-        # ✅ 개선: timestamp 제거 - 중복 방지!
-        doc_id = f"{user_id}_{date}_{source}"
-        ids.append(doc_id)
-
-        # Natural embedding 텍스트
-        embedding_text = summary_to_natural_text(summary)
-        embedding_texts.append(embedding_text)
-        documents.append(embedding_text)
-
-        # Metadata
-        try:
-            summary_json = json.dumps(summary, ensure_ascii=False)
-        except Exception as e:
-            print(f"[WARN] Summary JSON 직렬화 실패: {e}")
-            summary_json = str(summary)
-
-        metadata = {
-            "user_id": user_id,
-            "date": date,
-            "timestamp": int(date.replace("-", "")),
-            "health_score": health_score.get("score", 0),
-            "recommended_intensity": intensity.get("recommended_level", "중"),
-            "fallback": False,
-            "summary_json": summary_json,
-            "source": source,
-            "platform": platform,
-            "updated_at": update_timestamp,
-        }
-        metadatas.append(metadata)
-
-    if not ids:
+    if not documents:
         print("[WARN] 유효한 summary가 없어서 저장하지 않습니다.")
         return {"status": "skipped", "reason": "no valid summaries"}
 
-    # 2단계: 배치 임베딩 생성
-    print(f"[INFO] 배치 임베딩 생성 중... ({len(embedding_texts)}개)")
-    embeddings_list = batch_embed_texts(embedding_texts)
-
-    # 3단계: ChromaDB에 한 번에 저장 (upsert로 중복 방지)
-    print(f"[INFO] ChromaDB에 {len(ids)}개 데이터 저장 중...")
-    collection.upsert(
-        ids=ids,
-        embeddings=embeddings_list,
-        documents=documents,
-        metadatas=metadatas,
-    )
+    # 2단계: 변경 감지 → 바뀐 문서만 임베딩 + ChromaDB 저장
+    print(f"[INFO] ChromaDB에 {len(documents)}개 데이터 저장 중...")
+    changes = _upsert_documents(list(documents.values()))
 
     # ✅ 중복 체크
+    metadatas = [metadata for _, _, metadata, _ in documents.values()]
     unique_dates = len(set([m["date"] for m in metadatas]))
-    print(f"[SUCCESS] {len(ids)}개 데이터 VectorDB 저장 완료")
+    print(f"[SUCCESS] {len(documents)}개 데이터 VectorDB 저장 완료")
     print(
         f"[INFO] 고유 날짜: {unique_dates}개 (플랫폼: {metadatas[0].get('platform', 'unknown')})"
     )
 
     return {
         "status": "batch_saved",
-        "count": len(ids),
+        "count": len(documents),
         "unique_dates": unique_dates,
+        "embedded": len(changes["embedded"]),
+        "metadata_updated": len(changes["metadata_updated"]),
+        "unchanged": len(changes["unchanged"]),
+        "user_id": user_id,
+        "source": source,
+    }
+
+
+# ------------------------------------------------
+# 5-2) Summary 지연 저장 (앱 자동 업로드용 write-behind)
+# ------------------------------------------------
+def _flush_deferred_documents(documents: list):
+    """지연 저장 버퍼 flush: 한 사용자의 문서를 임베딩 1번 + upsert 1번으로 저장"""
+    changes = _upsert_documents(documents)
+
+    # 변경 없음으로 분류된 문서도 queue_daily_summary가 day_store 대표 기록을 다시 골랐을 수 있음
+    # → 이 flush가 다룬 날짜는 모두 ChromaDB is_canonical을 day_store와 맞춤
+    unchanged = set(changes["unchanged"])
+    if unchanged:
+        _refresh_canonical_days(
+            {
+                (metadata["user_id"], metadata["timestamp"])
+                for doc_id, _, metadata, _ in documents
+                if doc_id in unchanged
+            }
+        )
+    print(
+        f"[INFO] 지연 저장 flush: {len(documents)}개 "
+        f"(임베딩 {len(changes['embedded'])}개, 메타데이터 {len(changes['metadata_updated'])}개)"
+    )
+    # 저장이 다시 되면 이 사용자가 예전에 버려진 문서도 이어서 저장
+    retry_pending_vectors(documents[0][2]["user_id"])
+
+
+def _record_dropped_documents(user_id: str, documents: list):
+    """재시도 한도를 넘어 버린 문서 → day_store에 표시 (retry_pending_vectors가 다시 저장)"""
+    day_store.mark_pending_vectors(user_id, [document[0] for document in documents])
+    print(f"[WARN] 벡터 저장 실패 문서 {len(documents)}개 기록 → 다음 저장 성공 / 서버 시작 때 다시 저장")
+
+
+write_buffer = WriteBehindBuffer(
+    _flush_deferred_documents,
+    WRITE_BEHIND_WINDOW_SEC,
+    WRITE_BEHIND_MAX_DELAY_SEC,
+    WRITE_BEHIND_MAX_ITEMS,
+    on_drop=_record_dropped_documents,
+)
+
+
+def retry_pending_vectors(user_id: str = None) -> int:
+    """
+    day_store에는 있지만 ChromaDB 저장에 실패한 문서를 day_store 기록으로 다시 만들어 저장
+
+    - user_id가 없으면 전체 (서버 시작 시)
+    - 그 사이 삭제 / 보관된 문서는 표시만 지움
+    - 저장이 또 실패하면 표시를 남겨 두고 다음에 다시 시도 (예외를 올리지 않음)
+
+    Returns:
+        다시 저장한 문서 수
+    """
+    retried = 0
+    for pending_user, doc_ids in day_store.get_pending_vectors(user_id).items():
+        documents = []
+        for record in day_store.get_records_by_ids(doc_ids).values():
+            summary = {
+                "created_at": record["created_at"] or record["date"],
+                "summary_text": record["summary_text"],
+                "raw": record["raw"],
+                "platform": record["platform"],
+            }
+            document = _build_document(
+                summary, pending_user, record["source"], record["updated_at"]
+            )
+            if document is not None:
+                documents.append(document)
+
+        try:
+            if documents:
+                _upsert_documents(documents)
+        except Exception as e:
+            # 표시는 남겨 두고 다음 기회에 다시 시도
+            print(f"[WARN] 벡터 저장 실패 문서 다시 저장 실패 ({pending_user}): {e}")
+            continue
+        day_store.clear_pending_vectors(doc_ids)
+        retried += len(documents)
+
+    if retried:
+        print(f"[INFO] 벡터 저장 실패 문서 {retried}개 다시 저장")
+    return retried
+
+
+# day_store 기록과 비교하는 필드 (updated_at 제외)
+_QUEUED_COMPARE_KEYS = (
+    "created_at",
+    "summary_text",
+    "health_score",
+    "recommended_intensity",
+    "platform",
+    "raw",
+)
+
+
+def queue_daily_summary(summary: dict, user_id: str, source: str = "api"):
+    """
+    단일 요약 데이터 지연 저장
+
+    - 날짜별 기록(day_store) + 대표 기록 선택은 바로 반영
+      → 같은 사용자의 최근/날짜 조회는 flush 전에도 새 값을 봄
+    - 임베딩 + ChromaDB upsert는 write_buffer가 사용자별로 모아서 처리
+      → 유사 검색에는 flush 후 반영 (최대 WRITE_BEHIND_MAX_DELAY_SEC)
+    - day_store 기록과 내용이 같으면 아무것도 바꾸지 않음 (updated_at 유지)
+      → 같은 값 재동기화가 대표 기록 선택을 바꾸지 않음 (save_daily_summary와 같은 동작)
+    """
+    if not summary.get("created_at"):
+        raise ValueError("❌ summary['created_at']가 존재하지 않습니다.")
+
+    update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    document = _build_document(summary, user_id, source, update_timestamp)
+    doc_id, _, metadata, record = document
+
+    existing = day_store.get_records_by_ids([doc_id]).get(doc_id)
+    if existing is not None and all(
+        existing[key] == record[key] for key in _QUEUED_COMPARE_KEYS
+    ):
+        print(f"[INFO] VectorDB 지연 저장 생략 (변경 없음): {doc_id}")
+        return {
+            "status": "unchanged",
+            "document_id": doc_id,
+            "date": metadata["date"],
+            "user_id": user_id,
+            "source": source,
+            "platform": metadata["platform"],
+        }
+
+    day_store.upsert_records([record])
+    day_store.refresh_canonical_days({(user_id, record["timestamp"])})
+    _invalidate_user_caches({user_id})
+
+    write_buffer.submit(user_id, document)
+    print(f"[INFO] VectorDB 지연 저장 대기: {doc_id} (플랫폼: {metadata['platform']})")
+
+    return {
+        "status": "queued",
+        "document_id": doc_id,
+        "date": metadata["date"],
         "user_id": user_id,
         "source": source,
+        "platform": metadata["platform"],
     }
 
 
+def flush_pending_writes():
+    """지연 저장 대기 중인 문서를 모두 저장 (서버 종료 시)"""
+    write_buffer.close()
+
+
+def get_write_buffer_stats() -> dict:
+    """지연 저장 현황"""
+    return write_buffer.stats()
+
+
 # ------------------------------------------------
-# 6) 유사 Summary 검색 (개선: 중복 제거 + 최신 우선)
+# 6) 유사 Summary 검색 (대표 기록 + 유사도/최신성 재정렬)
 # ------------------------------------------------
-def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) -> dict:
+@read_flights.wrap
+def search_similar_summaries(
+    query_dict: dict,
+    user_id: str,
+    top_k: int = 3,
+    platform: str = None,
+    health_score_range: tuple = None,
+    max_distance: float = RAG_MAX_DISTANCE,
+) -> dict:
     """
     유사한 과거 Summary 검색 (개선 버전)
 
     개선 사항:
-    1. 같은 날짜에 여러 데이터가 있으면 updated_at이 최신인 것만 유지
-    2. 결과를 최신 날짜순으로 정렬
-    3. top_k 개수만큼 반환
+    1. 날짜별 대표 기록(is_canonical)만 검색 → 중복 제거용 추가 조회 없음
+    2. 플랫폼 / 건강 점수 구간은 ChromaDB where 필터로 적용
+    3. 거리 상한(max_distance)을 넘는 약한 후보는 제외
+    4. 유사도 + 최신성 점수로 재정렬 후 top_k 개수만큼 반환
+    5. hot 후보가 top_k보다 적으면 보관소 최근 대표 기록으로 채움 (최신성만 반영)
+
+    Args:
+        query_dict: 검색 조건 (key: value)
+        user_id: 사용자 ID
+        top_k: 가져올 개수
+        platform: 플랫폼 필터 (samsung, apple 등)
+        health_score_range: 건강 점수 구간 (최소, 최대) - 양 끝 포함
+        max_distance: 코사인 거리 상한 (None이면 제한 없음)
     """
     try:
         query_parts = []
@@ -281,63 +999,57 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
 
         query_embedding = get_cached_embedding(query_text)
 
-        # 더 많이 가져와서 중복 제거 후 top_k 반환
-        fetch_count = max(top_k * 3, 10)
-
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=fetch_count,
-            where={"user_id": user_id},
-        )
-
-        # 1단계: 결과 파싱
-        raw_results = []
+        # 필터: 사용자 + 대표 기록 (+ 플랫폼 / 건강 점수 구간)
+        conditions = [{"user_id": user_id}, {"is_canonical": True}]
+        if platform:
+            conditions.append({"platform": platform})
+        if health_score_range:
+            min_score, max_score = health_score_range
+            conditions.append({"health_score": {"$gte": min_score}})
+            conditions.append({"health_score": {"$lte": max_score}})
+
+        if VECTOR_SEARCH_MODE == "numpy":
+            # 사용자 행렬 brute-force (정확한 top-k, 필터로 인한 누락 없음)
+            results = user_vector_cache.query(
+                user_id,
+                query_embedding,
+                top_k * RAG_FETCH_MULTIPLIER,
+                platform=platform,
+                health_score_range=health_score_range,
+            )
+        else:
+            results = get_collection_router().for_user(user_id).query(
+                query_embeddings=[query_embedding],
+                n_results=top_k * RAG_FETCH_MULTIPLIER,
+                where={"$and": conditions},
+            )
+
+        # 1단계: 결과 파싱 (raw 지표는 day_store에서 한 번에 조회)
+        candidates = []
         if results and results["ids"] and len(results["ids"][0]) > 0:
-            for i in range(len(results["ids"][0])):
-                doc_id = results["ids"][0][i]
-                metadata = results["metadatas"][0][i]
-                distance = (
-                    results["distances"][0][i] if "distances" in results else None
-                )
-
-                summary_json = metadata.get("summary_json", "{}")
-                try:
-                    summary_dict = json.loads(summary_json)
-                except:
-                    summary_dict = {}
-
-                raw = summary_dict.get("raw", {})
-                summary_text = summary_dict.get("summary_text", "")
-
-                raw_results.append(
-                    {
-                        "document_id": doc_id,
-                        "user_id": metadata.get("user_id"),
-                        "date": metadata.get("date"),
-                        "timestamp": metadata.get("timestamp", 0),
-                        "health_score": metadata.get("health_score"),
-                        "recommended_intensity": metadata.get("recommended_intensity"),
-                        "source": metadata.get("source", "unknown"),
-                        "platform": metadata.get("platform", "unknown"),
-                        "updated_at": metadata.get("updated_at", ""),
-                        "raw": raw,
-                        "summary_text": summary_text,
-                        "similarity_distance": distance,
-                    }
-                )
-
-        # 2단계: 같은 날짜 중복 제거 (updated_at 최신 유지)
-        deduplicated = _deduplicate_by_date(raw_results)
-
-        # 3단계: 최신 날짜순 정렬
-        sorted_results = sorted(
-            deduplicated,
-            key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
-            reverse=True,
-        )
-
-        # 4단계: top_k 개수만큼 반환
-        similar_days = sorted_results[:top_k]
+            distances = results.get("distances") or [[None] * len(results["ids"][0])]
+            candidates = _parse_collection_results(
+                {"ids": results["ids"][0], "metadatas": results["metadatas"][0]}
+            )
+            for item, distance in zip(candidates, distances[0]):
+                item["similarity_distance"] = distance
+            candidates = _resolve_canonical_candidates(
+                candidates, user_id, platform, health_score_range
+            )
+
+        # hot 후보가 부족하면 보관소 대표 기록으로 채움
+        # (보관 기간 밖의 내보내기만 올린 사용자도 과거 기록을 참고하도록)
+        if len(candidates) < top_k:
+            candidates += _archived_candidates(
+                user_id,
+                top_k - len(candidates),
+                {item["timestamp"] for item in candidates},
+                platform,
+                health_score_range,
+            )
+
+        # 2단계: 재정렬 (유사도 + 최신성) 후 top_k
+        similar_days = _rank_candidates(candidates, top_k, max_distance)
 
         return {"similar_days": similar_days, "query": query_text}
 
@@ -349,57 +1061,158 @@ def search_similar_summaries(query_dict: dict, user_id: str, top_k: int = 3) ->
         return {"similar_days": [], "query": query_dict, "error": str(e)}
 
 
-def _deduplicate_by_date(results: list) -> list:
+def _archived_candidates(
+    user_id: str,
+    limit: int,
+    exclude_timestamps: set,
+    platform: str = None,
+    health_score_range: tuple = None,
+) -> list:
     """
-    같은 날짜의 데이터가 여러 개면 updated_at이 최신인 것만 유지
+    보관소의 최근 대표 기록을 검색 후보로 (임베딩 없음 → 거리 None, 최신성으로만 정렬)
 
-    Args:
-        results: 검색 결과 리스트
+    - 보관된 날짜가 없는 사용자는 월 목록 확인만 (파일 읽기 없음)
+    - 플랫폼 / 건강 점수 조건은 검색과 같게 적용
+    """
+    if limit <= 0 or not archive_store.months(user_id):
+        return []
+
+    found = []
+    for record in archive_store.read_latest(user_id, limit * RAG_FETCH_MULTIPLIER):
+        if record["timestamp"] in exclude_timestamps:
+            continue
+        if platform and record.get("platform") != platform:
+            continue
+        if health_score_range and not (
+            health_score_range[0]
+            <= (record.get("health_score") or 0)
+            <= health_score_range[1]
+        ):
+            continue
+        item = {k: v for k, v in record.items() if k != "is_canonical"}
+        found.append({**item, "similarity_distance": None})
+        if len(found) >= limit:
+            break
+    return found
+
+
+def _resolve_canonical_candidates(
+    candidates: list,
+    user_id: str,
+    platform: str = None,
+    health_score_range: tuple = None,
+) -> list:
+    """
+    검색 후보를 day_store의 현재 대표 기록으로 맞춤
+
+    - 지연 저장(queue_daily_summary)은 day_store 대표 기록을 바로 바꾸고
+      ChromaDB is_canonical은 flush 때 반영 → 그 사이 검색은 예전 대표 기록을 찾을 수 있음
+    - 대표 기록이 바뀐 날짜는 현재 대표 기록으로 교체 (거리는 찾은 문서 값 유지)
+    - 교체한 기록이 플랫폼 / 건강 점수 조건에 맞지 않으면 제외, 날짜당 1개
+    """
+    canonical = day_store.get_canonical_doc_ids(
+        user_id, {item["timestamp"] for item in candidates}
+    )
+    replaced = [
+        canonical[item["timestamp"]]
+        for item in candidates
+        if canonical.get(item["timestamp"], item["document_id"]) != item["document_id"]
+    ]
+    if not replaced:
+        return candidates
+
+    records = day_store.get_records_by_ids(replaced)
+    resolved = []
+    seen_days = set()
+    for item in candidates:
+        doc_id = canonical.get(item["timestamp"], item["document_id"])
+        if item["timestamp"] in seen_days:
+            continue
+        if doc_id != item["document_id"]:
+            record = records.get(doc_id)
+            if record is None:
+                continue
+            if platform and record["platform"] != platform:
+                continue
+            if health_score_range and not (
+                health_score_range[0]
+                <= (record["health_score"] or 0)
+                <= health_score_range[1]
+            ):
+                continue
+            item = {**record, "similarity_distance": item["similarity_distance"]}
+        seen_days.add(item["timestamp"])
+        resolved.append(item)
+    return resolved
+
+
+def _rank_candidates(candidates: list, top_k: int, max_distance: float = None) -> list:
+    """
+    검색 후보 재정렬
+
+    - 유사도: 1 - 코사인 거리 (0 미만은 0)
+    - 최신성: 후보 중 가장 최근 날짜 기준 반감기 감쇠 (RAG_RECENCY_HALF_LIFE_DAYS)
+    - 점수 = 유사도 × RAG_SIMILARITY_WEIGHT + 최신성 × RAG_RECENCY_WEIGHT
+    - max_distance를 넘는 후보는 점수 계산 전에 제외
 
     Returns:
-        중복 제거된 리스트
+        점수 높은 순 top_k개 (각 항목에 rank_score 추가)
     """
-    if not results:
+    if max_distance is not None:
+        candidates = [
+            item
+            for item in candidates
+            if item.get("similarity_distance") is None
+            or item["similarity_distance"] <= max_distance
+        ]
+    if not candidates:
         return []
 
-    # 날짜별로 그룹화
-    date_groups = {}
-    for item in results:
-        date = item.get("date", "")
-        if not date:
-            continue
+    dates = {}
+    for item in candidates:
+        try:
+            dates[item["document_id"]] = datetime.strptime(item["date"], "%Y-%m-%d")
+        except (KeyError, TypeError, ValueError):
+            dates[item["document_id"]] = None
+
+    known_dates = [date for date in dates.values() if date is not None]
+    newest = max(known_dates) if known_dates else None
 
-        if date not in date_groups:
-            date_groups[date] = []
-        date_groups[date].append(item)
+    for item in candidates:
+        distance = item.get("similarity_distance")
+        similarity = max(0.0, 1.0 - distance) if distance is not None else 0.0
 
-    # 각 날짜에서 최신 데이터만 선택
-    deduplicated = []
-    for date, items in date_groups.items():
-        if len(items) == 1:
-            deduplicated.append(items[0])
+        date = dates[item["document_id"]]
+        if date is None or newest is None:
+            recency = 0.0
         else:
-            # updated_at 기준 최신 선택
-            latest = max(items, key=lambda x: x.get("updated_at", ""))
-            deduplicated.append(latest)
+            age_days = (newest - date).days
+            recency = 0.5 ** (age_days / RAG_RECENCY_HALF_LIFE_DAYS)
 
-            # 로그 출력 (디버깅용)
-            sources = [
-                f"{i.get('source')}({i.get('updated_at', '')[:8]})" for i in items
-            ]
-            print(f"[INFO] {date} 중복 제거: {sources} → {latest.get('source')}")
+        item["rank_score"] = round(
+            similarity * RAG_SIMILARITY_WEIGHT + recency * RAG_RECENCY_WEIGHT, 4
+        )
 
-    return deduplicated
+    ranked = sorted(
+        candidates,
+        key=lambda x: (x["rank_score"], x.get("timestamp", 0)),
+        reverse=True,
+    )
+    return ranked[:top_k]
 
 
 # ------------------------------------------------
 # 7) 최신 데이터 조회 (고정형 챗봇용)
 # ------------------------------------------------
+@read_flights.wrap
 def get_recent_summaries(user_id: str, limit: int = 7) -> list:
     """
     최신 날짜순으로 데이터 조회 (유사도 검색 없이)
     고정형 챗봇의 주간 리포트 등에 사용
 
+    day_store 날짜 인덱스로 최근 limit개 날짜의 대표 기록만 읽는다.
+    (사용자 기록이 늘어나도 조회 비용 일정, 중복 제거 불필요)
+
     Args:
         user_id: 사용자 ID
         limit: 가져올 개수 (기본 7일)
@@ -408,29 +1221,17 @@ def get_recent_summaries(user_id: str, limit: int = 7) -> list:
         최신 날짜순 정렬된 summary 리스트
     """
     try:
-        # 전체 데이터 조회 (해당 사용자)
-        results = collection.get(
-            where={"user_id": user_id},
-            include=["metadatas", "documents"],
-        )
-
-        if not results or not results["ids"]:
-            return []
-
-        # 파싱
-        all_items = _parse_collection_results(results)
-
-        # 중복 제거
-        deduplicated = _deduplicate_by_date(all_items)
-
-        # 최신 날짜순 정렬
-        sorted_items = sorted(
-            deduplicated,
-            key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
-            reverse=True,
-        )
-
-        return sorted_items[:limit]
+        def load():
+            records = day_store.get_latest_days(user_id, limit)
+            if len(records) >= limit:
+                return records
+            # hot 날짜가 부족하면 보관소에서 이어서
+            oldest = records[-1]["timestamp"] if records else None
+            archived = archive_store.read_latest(user_id, limit - len(records), oldest)
+            return _merge_archived(records, archived)
+
+        # 최신 날짜순 정렬된 대표 기록 (반복 조회는 캐시)
+        return _cached_view(user_id, ("latest", limit), load)
 
     except Exception as e:
         print(f"[ERROR] 최신 데이터 조회 실패: {str(e)}")
@@ -443,6 +1244,7 @@ def get_recent_summaries(user_id: str, limit: int = 7) -> list:
 # ------------------------------------------------
 # 8) 특정 날짜 데이터 조회 (NEW)
 # ------------------------------------------------
+@read_flights.wrap
 def get_summaries_by_date(user_id: str, target_date: str) -> list:
     """
     특정 날짜의 데이터 조회
@@ -452,28 +1254,21 @@ def get_summaries_by_date(user_id: str, target_date: str) -> list:
         target_date: YYYY-MM-DD 형식
 
     Returns:
-        해당 날짜의 summary 리스트
+        해당 날짜의 summary 리스트 (대표 기록 1개, 없으면 빈 리스트)
     """
     try:
         # timestamp 변환 (YYYYMMDD 정수)
         target_timestamp = int(target_date.replace("-", ""))
 
-        results = collection.get(
-            where={"$and": [{"user_id": user_id}, {"timestamp": target_timestamp}]},
-            include=["metadatas", "documents"],
+        return _cached_view(
+            user_id,
+            ("date", target_timestamp),
+            lambda: _merge_archived(
+                day_store.get_records_on_date(user_id, target_timestamp),
+                archive_store.read_range(user_id, target_timestamp, target_timestamp),
+            ),
         )
 
-        if not results or not results["ids"]:
-            return []
-
-        # 파싱
-        all_items = _parse_collection_results(results)
-
-        # 중복 제거 (같은 날짜에 여러 소스가 있을 수 있음)
-        deduplicated = _deduplicate_by_date(all_items)
-
-        return deduplicated
-
     except Exception as e:
         print(f"[ERROR] 특정 날짜 데이터 조회 실패: {str(e)}")
         import traceback
@@ -485,6 +1280,7 @@ def get_summaries_by_date(user_id: str, target_date: str) -> list:
 # ------------------------------------------------
 # 9) 날짜 범위 데이터 조회 (NEW)
 # ------------------------------------------------
+@read_flights.wrap
 def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) -> list:
     """
     날짜 범위 내 데이터 조회
@@ -502,35 +1298,18 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
         start_timestamp = int(start_date.replace("-", ""))
         end_timestamp = int(end_date.replace("-", ""))
 
-        results = collection.get(
-            where={
-                "$and": [
-                    {"user_id": user_id},
-                    {"timestamp": {"$gte": start_timestamp}},
-                    {"timestamp": {"$lte": end_timestamp}},
-                ]
-            },
-            include=["metadatas", "documents"],
-        )
-
-        if not results or not results["ids"]:
-            return []
-
-        # 파싱
-        all_items = _parse_collection_results(results)
-
-        # 중복 제거
-        deduplicated = _deduplicate_by_date(all_items)
-
-        # 최신순 정렬
-        sorted_items = sorted(
-            deduplicated,
-            key=lambda x: (x.get("timestamp", 0), x.get("updated_at", "")),
-            reverse=True,
+        # 최신순 정렬된 대표 기록 (오래된 날짜는 보관소에서, 반복 조회는 캐시)
+        return _cached_view(
+            user_id,
+            ("range", start_timestamp, end_timestamp),
+            lambda: _merge_archived(
+                day_store.get_records_in_range(
+                    user_id, start_timestamp, end_timestamp
+                ),
+                archive_store.read_range(user_id, start_timestamp, end_timestamp),
+            ),
         )
 
-        return sorted_items
-
     except Exception as e:
         print(f"[ERROR] 날짜 범위 데이터 조회 실패: {str(e)}")
         import traceback
@@ -540,47 +1319,456 @@ def get_summaries_by_date_range(user_id: str, start_date: str, end_date: str) ->
 
 
 # ------------------------------------------------
-# 10) 공통 파싱 함수 (NEW)
+# 10) 공통 파싱 함수 (day_store 결합)
 # ------------------------------------------------
 def _parse_collection_results(results: dict) -> list:
     """
-    ChromaDB 결과를 통일된 포맷으로 파싱
+    ChromaDB 결과(ids + metadatas)를 통일된 포맷으로 파싱
+
+    raw/summary_text는 기록 캐시 → 없으면 day_store에서 doc_id로 한 번에 조회한다.
+    아직 이전되지 않은 예전 문서는 metadata의 summary_json을 사용한다.
 
     Args:
-        results: collection.get() 결과
+        results: collection.get() 결과 (또는 같은 형식의 dict)
 
     Returns:
-        파싱된 리스트
+        파싱된 리스트 (ChromaDB 결과 순서 유지)
     """
+    keys = [
+        (metadata.get("user_id"), doc_id, metadata.get("updated_at", ""))
+        for doc_id, metadata in zip(results["ids"], results["metadatas"])
+    ]
+    cached = record_cache.get_records(keys)
+
+    missing = [key[1] for key in keys if key not in cached]
+    records = day_store.get_records_by_ids(missing) if missing else {}
+
     all_items = []
+    loaded = []
+    for key, metadata in zip(keys, results["metadatas"]):
+        record = cached.get(key)
+        if record is None:
+            doc_id = key[1]
+            record = records.get(doc_id) or _legacy_record_from_metadata(
+                doc_id, metadata
+            )
+            loaded.append(record)
+        all_items.append(record)
+
+    record_cache.put_records(loaded)
+    return all_items
 
-    for i in range(len(results["ids"])):
-        doc_id = results["ids"][i]
-        metadata = results["metadatas"][i]
 
-        summary_json = metadata.get("summary_json", "{}")
-        try:
-            summary_dict = json.loads(summary_json)
-        except:
-            summary_dict = {}
+def _legacy_record_from_metadata(doc_id: str, metadata: dict) -> dict:
+    """예전 스키마(summary_json을 metadata에 저장) 문서 파싱"""
+    summary_json = metadata.get("summary_json", "{}")
+    try:
+        summary_dict = json.loads(summary_json)
+    except:
+        summary_dict = {}
+
+    return {
+        "document_id": doc_id,
+        "user_id": metadata.get("user_id"),
+        "date": metadata.get("date"),
+        "timestamp": metadata.get("timestamp", 0),
+        "health_score": metadata.get("health_score"),
+        "recommended_intensity": metadata.get("recommended_intensity"),
+        "source": metadata.get("source", "unknown"),
+        "platform": metadata.get("platform", "unknown"),
+        "updated_at": metadata.get("updated_at", ""),
+        "created_at": summary_dict.get("created_at", ""),
+        "raw": summary_dict.get("raw", {}),
+        "summary_text": summary_dict.get("summary_text", ""),
+    }
 
-        raw = summary_dict.get("raw", {})
-        summary_text = summary_dict.get("summary_text", "")
 
-        all_items.append(
-            {
-                "document_id": doc_id,
-                "user_id": metadata.get("user_id"),
-                "date": metadata.get("date"),
-                "timestamp": metadata.get("timestamp", 0),
-                "health_score": metadata.get("health_score"),
-                "recommended_intensity": metadata.get("recommended_intensity"),
-                "source": metadata.get("source", "unknown"),
-                "platform": metadata.get("platform", "unknown"),
-                "updated_at": metadata.get("updated_at", ""),
-                "raw": raw,
-                "summary_text": summary_text,
-            }
+# ------------------------------------------------
+# 11) 삭제 (ChromaDB + day_store)
+# ------------------------------------------------
+def delete_daily_summaries(doc_ids: list[str]):
+    """doc_id 목록을 ChromaDB와 day_store에서 함께 삭제 (해당 날짜 대표 기록 재선택)"""
+    if not doc_ids:
+        return
+
+    router = get_collection_router()
+    records = day_store.get_records_by_ids(doc_ids)
+
+    # 샤드별로 삭제 (day_store에 없는 예전 문서는 기본 컬렉션에서)
+    by_shard = {}
+    for doc_id in doc_ids:
+        record = records.get(doc_id)
+        name = (
+            router.shard_name(record["user_id"])
+            if record
+            else router.base_name
         )
+        by_shard.setdefault(name, []).append(doc_id)
+    for name, shard_doc_ids in by_shard.items():
+        router.get(name).delete(ids=shard_doc_ids)
 
-    return all_items
+    day_store.delete_records(doc_ids)
+    _refresh_canonical_days(
+        {(record["user_id"], record["timestamp"]) for record in records.values()}
+    )
+    print(f"[INFO] VectorDB 삭제: {len(doc_ids)}개")
+
+
+# ------------------------------------------------
+# 12) 마이그레이션: metadata summary_json → day_store
+# ------------------------------------------------
+SUMMARY_JSON_MIGRATION = "summary_json_to_day_store"
+
+
+def migrate_summary_json_to_day_store(page_size: int = 500) -> int:
+    """
+    예전 문서의 metadata summary_json을 day_store로 옮기고 ChromaDB에서 제거
+
+    - 한 번 완료되면 day_store에 기록되어 다시 실행하지 않음
+    - 서버 시작 시 호출
+
+    Returns:
+        이전한 문서 수
+    """
+    if day_store.is_migration_applied(SUMMARY_JSON_MIGRATION):
+        return 0
+
+    collection = get_collection()
+    migrated = 0
+    offset = 0
+
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        ids = page.get("ids", [])
+        if not ids:
+            break
+
+        legacy = [
+            (doc_id, metadata)
+            for doc_id, metadata in zip(ids, page["metadatas"])
+            if "summary_json" in metadata
+        ]
+
+        if legacy:
+            records = []
+            for doc_id, metadata in legacy:
+                item = _legacy_record_from_metadata(doc_id, metadata)
+                records.append(
+                    {
+                        "doc_id": doc_id,
+                        "user_id": item["user_id"],
+                        "date": item["date"],
+                        "source": item["source"],
+                        "timestamp": item["timestamp"],
+                        "platform": item["platform"],
+                        "created_at": item["created_at"],
+                        "summary_text": item["summary_text"],
+                        "health_score": item["health_score"],
+                        "recommended_intensity": item["recommended_intensity"],
+                        "updated_at": item["updated_at"],
+                        "raw": item["raw"],
+                    }
+                )
+
+            day_store.upsert_records(records)
+            _clear_user_caches()
+            collection.update(
+                ids=[doc_id for doc_id, _ in legacy],
+                metadatas=[{"summary_json": None, "fallback": None} for _ in legacy],
+            )
+            migrated += len(legacy)
+
+        offset += len(ids)
+
+    day_store.mark_migration_applied(SUMMARY_JSON_MIGRATION)
+    print(f"[INFO] summary_json → day_store 이전 완료: {migrated}개")
+    return migrated
+
+
+# ------------------------------------------------
+# 13) 마이그레이션: 날짜별 대표 기록 지정
+# ------------------------------------------------
+def migrate_canonical_days() -> int:
+    """
+    저장된 모든 날짜의 대표 기록을 선택하고 is_canonical 플래그 기록
+
+    - 선택 규칙(SOURCE_PRECEDENCE)이 바뀌면 다시 실행됨
+    - 보관소(cold tier) 날짜도 같은 규칙으로 다시 선택
+      (보관된 날짜는 day_store에 없어 canonical_days 대신 보관 기록의 is_canonical에 반영)
+    - 서버 시작 시 호출 (migrate_summary_json_to_day_store 다음)
+
+    Returns:
+        대표 기록을 다시 선택한 날짜 수 (보관된 날짜 포함)
+    """
+    migration = f"canonical_days+archive:{','.join(SOURCE_PRECEDENCE)}"
+    if day_store.is_migration_applied(migration):
+        return 0
+
+    days = day_store.get_all_day_keys()
+    _refresh_canonical_days(days)
+    archived_days = archive_store.rerank_canonical(
+        lambda record: day_store.canonical_rank(record["source"], record["updated_at"])
+    )
+    if archived_days:
+        _clear_user_caches()
+
+    day_store.mark_migration_applied(migration)
+    print(
+        f"[INFO] 날짜별 대표 기록 지정 완료: {len(days)}일 "
+        f"(보관된 날짜 {archived_days}일)"
+    )
+    return len(days) + archived_days
+
+
+# ------------------------------------------------
+# 14) 컬렉션 분할: 기본 컬렉션 → 사용자 샤드 이전
+# ------------------------------------------------
+def migrate_collection_partitions(page_size: int = 500) -> int:
+    """
+    기본 컬렉션에 남아 있는 문서를 사용자 샤드로 옮김 (임베딩 재계산 없음)
+
+    - COLLECTION_PARTITIONING이 single이면 아무것도 하지 않음
+    - 페이지 단위로 샤드에 upsert 후 기본 컬렉션에서 삭제 (중간에 멈춰도 다시 실행 가능)
+    - 서버 시작 시 호출 (migrate_summary_json_to_day_store 다음)
+
+    Returns:
+        옮긴 문서 수
+    """
+    router = get_collection_router()
+    if router.mode == "single":
+        return 0
+
+    collection = router.base()
+    moved = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "metadatas", "documents"], limit=page_size
+        )
+        ids = page.get("ids", [])
+        if not ids:
+            break
+
+        by_user = {}
+        for index, metadata in enumerate(page["metadatas"]):
+            by_user.setdefault((metadata or {}).get("user_id", ""), []).append(index)
+
+        for user_id, rows in by_user.items():
+            router.for_user(user_id).upsert(
+                ids=[ids[i] for i in rows],
+                embeddings=[page["embeddings"][i] for i in rows],
+                documents=[page["documents"][i] for i in rows],
+                metadatas=[page["metadatas"][i] for i in rows],
+            )
+
+        collection.delete(ids=ids)
+        moved += len(ids)
+
+    if moved:
+        _clear_user_caches()
+        print(
+            f"[INFO] 컬렉션 분할 이전 완료: {moved}개 → "
+            f"{len(router.list_shards())}개 샤드 ({router.mode})"
+        )
+    return moved
+
+
+def list_collection_shards() -> list:
+    """현재 분할 방식의 샤드 목록 [{"name", "count"}]"""
+    return get_collection_router().list_shards()
+
+
+# ------------------------------------------------
+# 15) 마이그레이션: openai 벡터 차원 축소 (EMBEDDING_DIMENSIONS)
+# ------------------------------------------------
+def migrate_embedding_dimensions(
+    source_dimensions: int = EMBEDDING_NATIVE_DIMENSIONS, page_size: int = 500
+) -> int:
+    """
+    원본 차원 컬렉션의 벡터를 잘라서 현재 차원 컬렉션으로 이전 (재임베딩 없음)
+
+    - text-embedding-3 계열은 앞쪽 N차원 + L2 정규화 = dimensions=N 응답
+    - 원본 컬렉션(샤드 포함)은 그대로 둠 (EMBEDDING_DIMENSIONS를 되돌리면 바로 사용 가능)
+    - 잘라낸 벡터는 임베딩 캐시에도 저장 (같은 문장을 다시 임베딩하지 않음)
+    - 완료되면 day_store에 기록되어 다시 실행하지 않음
+    - 서버 시작 시 호출 (migrate_collection_partitions 다음)
+
+    Returns:
+        이전한 문서 수
+    """
+    backend = get_embedding_backend()
+    dimensions = getattr(backend, "dimensions", None)
+    if backend.name != "openai" or not dimensions or dimensions >= source_dimensions:
+        return 0
+
+    migration = f"embedding_dimensions:{source_dimensions}->{dimensions}"
+    if day_store.is_migration_applied(migration):
+        return 0
+
+    router = get_collection_router()
+    source = CollectionRouter(
+        router.client,
+        _collection_name("openai", source_dimensions),
+        mode=router.mode,
+        buckets=router.buckets,
+        metadata=router.metadata,
+    )
+    existing = {
+        collection if isinstance(collection, str) else collection.name
+        for collection in router.client.list_collections()
+    }
+    source_names = {shard["name"] for shard in source.list_shards()}
+    if source.base_name in existing:
+        source_names.add(source.base_name)
+
+    moved = 0
+    for name in sorted(source_names):
+        collection = source.get(name)
+        offset = 0
+        while True:
+            page = collection.get(
+                include=["embeddings", "metadatas", "documents"],
+                limit=page_size,
+                offset=offset,
+            )
+            ids = page.get("ids", [])
+            if not ids:
+                break
+
+            vectors = truncate_vectors(page["embeddings"], dimensions).tolist()
+
+            by_user = {}
+            for index, metadata in enumerate(page["metadatas"]):
+                by_user.setdefault((metadata or {}).get("user_id", ""), []).append(index)
+
+            for user_id, rows in by_user.items():
+                router.for_user(user_id).upsert(
+                    ids=[ids[i] for i in rows],
+                    embeddings=[vectors[i] for i in rows],
+                    documents=[page["documents"][i] for i in rows],
+                    metadatas=[page["metadatas"][i] for i in rows],
+                )
+
+            embedding_cache.put_many(
+                [
+                    (
+                        EmbeddingCache.make_key(
+                            _prepare_embedding_text(text), backend.model
+                        ),
+                        vector,
+                    )
+                    for text, vector in zip(page["documents"], vectors)
+                    if text
+                ]
+            )
+
+            moved += len(ids)
+            offset += len(ids)
+
+    day_store.mark_migration_applied(migration)
+    if moved:
+        _clear_user_caches()
+    print(
+        f"[INFO] 임베딩 차원 축소 이전 완료: {moved}개 "
+        f"({source_dimensions} → {dimensions}차원, {router.base_name})"
+    )
+    return moved
+
+
+# ------------------------------------------------
+# 16) 보관 작업: 오래된 날짜 → 보관소 (cold tier)
+# ------------------------------------------------
+def archive_old_days(hot_days: int = RETENTION_HOT_DAYS, today=None) -> dict:
+    """
+    hot_days보다 오래된 날짜를 보관소로 옮기고 ChromaDB / day_store에서 삭제
+
+    - 사용자별로: 보관소에 먼저 쓰고(월 파일 병합) 성공하면 삭제
+    - 보관된 날짜는 유사 검색 대상에서 빠지고, 날짜/기간 조회로만 읽힘
+    - 서버 시작 후 RETENTION_INTERVAL_HOURS마다 호출 → hot 데이터는 사용 기간과 무관하게 일정
+
+    Returns:
+        {"users": 사용자 수, "archived": 보관한 기록 수, "cutoff": 기준 날짜}
+    """
+    cutoff = retention_cutoff(hot_days, today)
+    if cutoff is None:
+        return {"users": 0, "archived": 0, "cutoff": None}
+
+    users = day_store.get_users_with_days_before(cutoff)
+    archived = 0
+    for user_id in users:
+        records = day_store.get_records_before(user_id, cutoff)
+        if not records:
+            continue
+
+        archive_store.write(user_id, records)
+        doc_ids = [record["document_id"] for record in records]
+        for start in range(0, len(doc_ids), 1000):
+            delete_daily_summaries(doc_ids[start : start + 1000])
+        archived += len(records)
+
+    if archived:
+        print(
+            f"[INFO] 보관 작업 완료: {len(users)}명, {archived}개 기록 "
+            f"({cutoff} 이전 → {ARCHIVE_DIR})"
+        )
+    return {"users": len(users), "archived": archived, "cutoff": cutoff}
+
+
+def archive_daily_summaries(summaries: list[dict], user_id: str, source: str = "zip") -> dict:
+    """
+    보관 기간 밖의 업로드 날짜 → 보관소에 바로 기록 (임베딩 / ChromaDB / day_store 없음)
+
+    - 전체 다시 읽기 업로드가 이미 보관된 날짜를 hot으로 되돌리지 않도록
+      (다음 보관 작업에서 다시 옮기는 반복 임베딩 방지)
+    - 같은 날짜의 대표 기록은 보관된 기록과 합쳐 canonical_rank로 다시 선택
+    """
+    update_timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    records = {}
+    for summary in summaries:
+        document = _build_document(summary, user_id, source, update_timestamp)
+        if document is None:
+            continue
+        record = document[3]
+        records[record["doc_id"]] = {
+            "document_id": record["doc_id"],
+            "user_id": user_id,
+            "date": record["date"],
+            "timestamp": record["timestamp"],
+            "health_score": record["health_score"],
+            "recommended_intensity": record["recommended_intensity"],
+            "source": record["source"],
+            "platform": record["platform"],
+            "updated_at": record["updated_at"],
+            "created_at": record["created_at"],
+            "raw": record["raw"],
+            "summary_text": record["summary_text"],
+        }
+
+    if not records:
+        return {"archived": 0}
+
+    timestamps = [record["timestamp"] for record in records.values()]
+    existing = {}
+    for record in archive_store.read_range(
+        user_id, min(timestamps), max(timestamps), canonical_only=False
+    ):
+        if record["document_id"] not in records:
+            existing.setdefault(record["timestamp"], []).append(record)
+
+    for record in records.values():
+        rivals = existing.get(record["timestamp"], [])
+        record["is_canonical"] = all(
+            day_store.canonical_rank(record["source"], record["updated_at"])
+            > day_store.canonical_rank(other["source"], other["updated_at"])
+            for other in rivals
+        )
+
+    archive_store.write(user_id, list(records.values()))
+    # 날짜/기간 조회 캐시에는 보관 기록도 포함됨
+    _invalidate_user_caches({user_id})
+    print(f"[INFO] 보관 기간 밖의 {len(records)}일치 데이터 보관소에 기록")
+    return {"archived": len(records)}
+
+
+def get_archive_stats() -> dict:
+    """보관소 현황"""
+    return archive_store.stats()
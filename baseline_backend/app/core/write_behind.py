@@ -0,0 +1,195 @@
+"""
+지연 저장 버퍼 (write-behind, 사용자별 묶음)
+
+- 사용자별로 문서를 모았다가 한 번에 flush (임베딩 1번 + upsert 1번)
+- flush 시점: 마지막 저장 후 window_sec 동안 추가 저장이 없을 때
+             / 첫 저장 후 max_delay_sec가 지났을 때 / 모은 문서가 max_items개일 때
+- 같은 doc_id가 다시 들어오면 마지막 것만 유지
+- flush는 백그라운드 스레드 1개에서 실행 (실패하면 max_retries번까지 다시 시도,
+  그래도 실패한 문서는 on_drop으로 넘겨 호출자가 나중에 다시 저장할 수 있게 함)
+- 종료 시 close()로 남은 문서를 모두 flush (atexit에도 등록)
+
+버퍼는 벡터 저장만 늦춘다. 날짜별 기록(day_store)은 호출자가 바로 저장해야
+같은 사용자의 날짜 조회가 flush 전에도 최신 값을 본다.
+"""
+
+import atexit
+import threading
+import time
+import traceback
+
+
+class WriteBehindBuffer:
+    def __init__(
+        self,
+        flush_func,
+        window_sec: float,
+        max_delay_sec: float,
+        max_items: int,
+        max_retries: int = 3,
+        on_drop=None,
+    ):
+        """
+        flush_func(documents): 한 사용자의 문서 목록을 저장 (documents[i][0]은 doc_id)
+        on_drop(user_id, documents): 재시도 한도를 넘어 버리는 문서 (선택)
+        """
+        self.flush_func = flush_func
+        self.on_drop = on_drop
+        self.window_sec = window_sec
+        self.max_delay_sec = max_delay_sec
+        self.max_items = max_items
+        self.max_retries = max_retries
+
+        self._pending = {}  # user_id → {doc_id: document}
+        self._first_at = {}  # user_id → 첫 저장 시각
+        self._last_at = {}  # user_id → 마지막 저장 시각
+        self._failures = {}  # user_id → 연속 실패 횟수
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # flush는 한 번에 하나씩 (같은 doc_id 순서 보장)
+        self._thread = None
+        self._closed = False
+        self._stats = {"submitted": 0, "flushes": 0, "flushed": 0, "errors": 0, "dropped": 0}
+
+    # ------------------------------------------------
+    # 저장 요청
+    # ------------------------------------------------
+    def submit(self, user_id: str, document: tuple):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("❌ 지연 저장 버퍼가 이미 종료되었습니다.")
+            self._ensure_thread()
+
+            now = time.monotonic()
+            self._pending.setdefault(user_id, {})[document[0]] = document
+            self._first_at.setdefault(user_id, now)
+            self._last_at[user_id] = now
+            self._stats["submitted"] += 1
+            self._cond.notify()
+
+    def pending_count(self, user_id: str = None) -> int:
+        with self._cond:
+            if user_id is not None:
+                return len(self._pending.get(user_id, {}))
+            return sum(len(documents) for documents in self._pending.values())
+
+    # ------------------------------------------------
+    # flush
+    # ------------------------------------------------
+    def _deadline(self, user_id: str) -> float:
+        if len(self._pending[user_id]) >= self.max_items:
+            return 0.0
+        return min(
+            self._last_at[user_id] + self.window_sec,
+            self._first_at[user_id] + self.max_delay_sec,
+        )
+
+    def _take(self, user_id: str) -> list:
+        self._first_at.pop(user_id, None)
+        self._last_at.pop(user_id, None)
+        return list(self._pending.pop(user_id, {}).values())
+
+    def _flush_user(self, user_id: str, documents: list):
+        """락 밖에서 호출 (flush_func는 네트워크/디스크 작업)"""
+        try:
+            with self._flush_lock:
+                self.flush_func(documents)
+        except Exception as e:
+            print(f"[ERROR] 지연 저장 실패 ({user_id}, {len(documents)}개): {e}")
+            traceback.print_exc()
+            with self._cond:
+                self._stats["errors"] += 1
+                failures = self._failures.get(user_id, 0) + 1
+                dropped = failures > self.max_retries
+                if dropped:
+                    self._failures.pop(user_id, None)
+                    self._stats["dropped"] += len(documents)
+                    print(f"[ERROR] 재시도 한도 초과로 {len(documents)}개 버림 ({user_id})")
+                else:
+                    self._failures[user_id] = failures
+            if dropped:
+                if self.on_drop is not None:
+                    try:
+                        self.on_drop(user_id, documents)
+                    except Exception as drop_error:
+                        print(f"[ERROR] 버린 문서 기록 실패 ({user_id}): {drop_error}")
+                return
+
+            with self._cond:
+                # 그 사이 새로 들어온 같은 doc_id가 있으면 새 것을 유지
+                pending = self._pending.setdefault(user_id, {})
+                for document in documents:
+                    pending.setdefault(document[0], document)
+                now = time.monotonic()
+                self._first_at.setdefault(user_id, now)
+                self._last_at[user_id] = now
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._failures.pop(user_id, None)
+            self._stats["flushes"] += 1
+            self._stats["flushed"] += len(documents)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed and not self._pending:
+                        return
+                    now = time.monotonic()
+                    due = [
+                        user_id
+                        for user_id in self._pending
+                        if self._closed or self._deadline(user_id) <= now
+                    ]
+                    if due:
+                        batches = [(user_id, self._take(user_id)) for user_id in due]
+                        break
+                    if not self._pending:
+                        self._cond.wait()
+                        continue
+                    wait = min(self._deadline(user_id) for user_id in self._pending)
+                    self._cond.wait(timeout=wait - now)
+
+            for user_id, documents in batches:
+                self._flush_user(user_id, documents)
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def flush(self, user_id: str = None):
+        """지금 바로 flush (user_id가 없으면 전체, 호출한 스레드에서 실행)"""
+        with self._cond:
+            user_ids = [user_id] if user_id is not None else list(self._pending)
+            batches = [
+                (uid, self._take(uid)) for uid in user_ids if uid in self._pending
+            ]
+        for uid, documents in batches:
+            self._flush_user(uid, documents)
+
+    def close(self, timeout: float = 60.0):
+        """남은 문서를 모두 flush하고 스레드 종료 (서버 종료 시)"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+        # 스레드가 없었거나(저장 요청 없음) 재시도로 다시 쌓인 문서
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._stats,
+                "pending": sum(len(documents) for documents in self._pending.values()),
+                "pending_users": len(self._pending),
+            }
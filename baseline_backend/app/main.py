@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse, JSONResponse
@@ -12,7 +14,29 @@ from app.api.endpoints.chat import router as chat_router
 from app.api.endpoints.user import router as user_router
 from app.api.endpoints.auth import router as auth_router
 
+from app.config import (
+    WARM_UP_ON_STARTUP,
+    RETENTION_HOT_DAYS,
+    RETENTION_INTERVAL_HOURS,
+    INGEST_JOB_QUEUE,
+)
 from app.database import init_db
+from app.core.vector_store import (
+    warm_up,
+    migrate_summary_json_to_day_store,
+    migrate_collection_partitions,
+    migrate_embedding_dimensions,
+    migrate_canonical_days,
+    flush_pending_writes,
+    retry_pending_vectors,
+    archive_old_days,
+)
+from app.core.parallel_ingest import shutdown_process_pool
+from app.services.file_upload_service import (
+    start_ingest_workers,
+    stop_ingest_workers,
+    wait_background_stores,
+)
 
 from dotenv import load_dotenv
 
@@ -35,6 +59,53 @@ async def startup_event():
     init_db()
     print("✅ 데이터베이스 테이블 생성 완료")
 
+    # VectorDB 리소스 미리 준비 (끄면 첫 요청 때 생성)
+    if WARM_UP_ON_STARTUP:
+        warm_up()
+
+    # 예전 문서의 summary_json → day_store 이전 (최초 1회)
+    migrate_summary_json_to_day_store()
+    # 기본 컬렉션 → 사용자 샤드 이전 (COLLECTION_PARTITIONING이 single이 아닐 때)
+    migrate_collection_partitions()
+    # openai 벡터 차원 축소 시 기존 벡터 이전 (EMBEDDING_DIMENSIONS가 1536보다 작을 때)
+    migrate_embedding_dimensions()
+    # 날짜별 대표 기록 지정 (최초 1회, SOURCE_PRECEDENCE 변경 시 다시)
+    migrate_canonical_days()
+    # 지연 저장이 재시도 한도를 넘어 ChromaDB에 못 들어간 문서 다시 저장
+    retry_pending_vectors()
+
+    # 오래된 날짜 보관 작업 (시작 시 1번 + RETENTION_INTERVAL_HOURS마다)
+    if RETENTION_HOT_DAYS > 0:
+        asyncio.create_task(retention_loop())
+
+    # ZIP/DB 업로드 작업 워커 (재시작 전에 남은 대기 작업도 이어서 처리)
+    if INGEST_JOB_QUEUE:
+        start_ingest_workers()
+
+
+async def retention_loop():
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, archive_old_days)
+        except Exception as e:
+            print(f"[ERROR] 보관 작업 실패: {e}")
+        await asyncio.sleep(RETENTION_INTERVAL_HOURS * 3600)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # 실행 중인 업로드 작업은 대기열로 되돌림 (다음 시작 때 다시 처리)
+    if INGEST_JOB_QUEUE:
+        await stop_ingest_workers()
+    # 분석 응답 후 남은 업로드 저장 (INGEST_PIPELINE)
+    await wait_background_stores()
+
+    # 지연 저장 대기 중인 앱 업로드 벡터 저장
+    flush_pending_writes()
+    # 업로드 파싱 / 전처리 프로세스 풀 (INGEST_PROCESS_WORKERS)
+    shutdown_process_pool()
+
 
 app.add_middleware(
     CORSMiddleware,
@@ -3,12 +3,14 @@ import asyncio
 from fastapi import HTTPException
 from concurrent.futures import ThreadPoolExecutor
 
-from app.utils.preprocess import preprocess_health_json
+from app.utils.preprocess import preprocess_health_json_batch
 from app.utils.platform_detection import detect_platform
-from app.core.vector_store import save_daily_summary
+from app.config import AUTO_UPLOAD_WRITE_BEHIND
+from app.core import async_vector_store
 from app.core.llm_analysis import run_llm_analysis
 
 
+# 전처리 / LLM 분석용 (VectorDB 저장은 async_vector_store 전용 executor 사용)
 executor = ThreadPoolExecutor(max_workers=4)
 
 
@@ -64,12 +66,14 @@ class AutoUploadService:
             # 예: "2025-12-17" → 20251217
             date_int = int(date.replace("-", ""))
 
-            latest_summary = await run_blocking(
-                preprocess_health_json,
-                json_data,
-                date_int,
-                platform,  # ✅ 자동 감지된 플랫폼 사용
-            )
+            # ZIP 업로드와 같은 배치 전처리 (이 요청은 1일치)
+            latest_summary = (
+                await run_blocking(
+                    preprocess_health_json_batch,
+                    {date_int: json_data},
+                    platform,  # ✅ 자동 감지된 플랫폼 사용
+                )
+            )[0]
 
             print(f"✅ Summary 생성 완료")
             print(f"   created_at: {latest_summary.get('created_at')}")
@@ -93,9 +97,15 @@ class AutoUploadService:
             print(f"   플랫폼: {platform}")
             print(f"   Source: {source}")
 
-            save_result = await run_blocking(
-                save_daily_summary, latest_summary, user_id, source
-            )
+            # 지연 저장: 앱이 7일치를 연달아 보내면 임베딩/upsert를 1번으로 묶음
+            if AUTO_UPLOAD_WRITE_BEHIND:
+                save_result = await async_vector_store.queue_daily_summary(
+                    latest_summary, user_id, source
+                )
+            else:
+                save_result = await async_vector_store.save_daily_summary(
+                    latest_summary, user_id, source
+                )
             print(f"✅ Vector DB 저장 완료 (source: {source}): {save_result}")
 
         except Exception as e:
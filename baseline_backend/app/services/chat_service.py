@@ -1,3 +1,4 @@
+from app.core import async_vector_store
 from app.core.chatbot_engine.chat_generator import ChatGenerator
 from app.core.chatbot_engine.fixed_responses import generate_fixed_response
 
@@ -13,6 +14,9 @@ class ChatService:
     """
     Chat 관련 비즈니스 로직을 담당하는 Service 계층.
     ChatGenerator가 실제 LLM 메시지 생성 역할을 수행한다.
+
+    응답 생성(RAG 조회 + LLM 호출)은 동기 코드라서
+    vector_store 전용 executor(VECTOR_STORE_MAX_WORKERS)에서 실행한다.
     """
 
     def __init__(self):
@@ -21,13 +25,14 @@ class ChatService:
     # -------------------------------------------
     # 1) 자유형 (intent → sentiment → RAG → LLM)
     # -------------------------------------------
-    def handle_chat(self, user_id: str, message: str, character: str):
+    async def handle_chat(self, user_id: str, message: str, character: str):
 
         # 캐릭터 정규화(허용되지 않으면 기본 → default)
         persona_key = character if character in VALID_PERSONAS else "devil_coach"
 
         # ChatGenerator 내부에서 persona_prompt + LLM 호출 수행
-        response = self.generator.generate(
+        response = await async_vector_store.run_in_vector_executor(
+            self.generator.generate,
             user_id=user_id,
             message=message,
             character=persona_key,
@@ -39,11 +44,12 @@ class ChatService:
     # 2) 고정형
     # -------------------------------------------
     @staticmethod
-    def handle_fixed_chat(user_id: str, question_type: str, character: str):
+    async def handle_fixed_chat(user_id: str, question_type: str, character: str):
 
         persona_key = character if character in VALID_PERSONAS else "devil_coach"
 
-        response = generate_fixed_response(
+        response = await async_vector_store.run_in_vector_executor(
+            generate_fixed_response,
             user_id=user_id,
             question_type=question_type,
             character=persona_key,
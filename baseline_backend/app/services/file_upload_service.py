@@ -1,19 +1,39 @@
-import os, shutil, tempfile, uuid
+import os, shutil, socket, sqlite3, tempfile, time, traceback, uuid, zipfile
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from fastapi import UploadFile, HTTPException
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from app.core.unzipper import extract_zip_to_temp
-from app.core.db_to_json import db_to_json
-from app.core.db_parser import parse_db_json_to_raw_data_by_day
-
-from app.utils.preprocess import preprocess_health_json
-from app.core.vector_store import save_daily_summaries_batch
+from app.config import (
+    DB_PARSE_MODE,
+    INGEST_INCREMENTAL,
+    UPLOAD_CHUNK_BYTES,
+    INGEST_JOB_QUEUE,
+    INGEST_JOB_DB_PATH,
+    INGEST_MAX_CONCURRENT,
+    INGEST_JOB_MAX_ATTEMPTS,
+    INGEST_JOB_LEASE_SEC,
+    INGEST_JOB_HEARTBEAT_SEC,
+    INGEST_JOB_POLL_SEC,
+    INGEST_PIPELINE,
+    INGEST_ANALYSIS_HISTORY_DAYS,
+    INGEST_STORE_MAX_ATTEMPTS,
+    INGEST_STORE_RETRY_DELAY_SEC,
+)
+from app.core.unzipper import extract_sqlite_member
+from app.core.job_queue import JobQueue, STATUS_QUEUED
+from app.core.db_ingest import incremental_start_day, list_db_tables
+from app.core.parallel_ingest import ingest_db_file_parallel, preprocess_days_parallel
+from app.core import day_store
+
+from app.core import async_vector_store
+from app.core.vector_store import retention_cutoff
 from app.core.llm_analysis import run_llm_analysis
 
-# 비동기 처리용 Executor
+# 비동기 처리용 Executor (VectorDB 저장은 async_vector_store 전용 executor 사용)
 executor = ThreadPoolExecutor(max_workers=4)
 
 # ============================================================
@@ -38,6 +58,8 @@ class FileUploadService:
     2. 플랫폼 정보 자동 감지 (Apple/Samsung)
     3. VectorDB에 정확한 날짜 저장
     4. ZIP 파일 프로젝트 폴더에 영구 저장
+    5. 업로드 후 바로 job_id 반환, 처리는 작업 대기열 워커가 진행 (INGEST_JOB_QUEUE)
+    6. 최근 기록만 저장한 뒤 LLM 분석과 나머지 저장을 동시에 진행 (INGEST_PIPELINE)
     """
 
     @staticmethod
@@ -53,10 +75,58 @@ class FileUploadService:
         return await loop.run_in_executor(executor, lambda: func(*args))
 
     @staticmethod
-    def detect_platform(filename: str, db_json: dict) -> str:
+    async def save_upload(file: UploadFile, dest_path) -> int:
+        """
+        업로드 본문을 UPLOAD_CHUNK_BYTES씩 읽어 dest_path에 바로 저장
+
+        Returns:
+            저장한 바이트 수
+        """
+        size = 0
+        with open(dest_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                buffer.write(chunk)
+                size += len(chunk)
+        return size
+
+    @staticmethod
+    def split_recent_summaries(summaries: list, latest_summary: dict, days: int) -> tuple:
+        """
+        (최신 날짜 기준 최근 days일 summary, 나머지) - 순서 유지
+
+        최근 쪽에는 최신 날짜(분석 대상) 자신이 항상 포함됨
+        """
+        cutoff = (
+            date.fromisoformat(latest_summary["created_at"][:10]) - timedelta(days=days)
+        ).isoformat()
+        recent, older = [], []
+        for summary in summaries:
+            (recent if summary["created_at"][:10] >= cutoff else older).append(summary)
+        return recent, older
+
+    @staticmethod
+    def split_retention(summaries: list) -> tuple:
+        """
+        (보관 기간 안 summary, RETENTION_HOT_DAYS보다 오래된 summary) - 순서 유지
+
+        보관하지 않으면 (RETENTION_HOT_DAYS=0) 모두 보관 기간 안
+        """
+        cutoff = retention_cutoff()
+        if cutoff is None:
+            return summaries, []
+        hot, cold = [], []
+        for summary in summaries:
+            timestamp = int(summary["created_at"][:10].replace("-", ""))
+            (hot if timestamp >= cutoff else cold).append(summary)
+        return hot, cold
+
+    @staticmethod
+    def detect_platform(filename: str, db_tables) -> str:
         """
         플랫폼 자동 감지
 
+        db_tables: DB 테이블 이름 집합 (또는 db_to_json 결과 dict)
+
         Returns:
             "apple" or "samsung" or "unknown"
         """
@@ -73,14 +143,14 @@ class FileUploadService:
             return "apple"
 
         # ✅ DB 구조로 감지 (Samsung Health Connect 특징)
-        if db_json:
+        if db_tables:
             # Samsung Health Connect는 특정 테이블 존재
             samsung_tables = [
                 "steps_record_table",
                 "distance_record_table",
                 "heart_rate_record_table",
             ]
-            if all(table in db_json for table in samsung_tables):
+            if all(table in db_tables for table in samsung_tables):
                 return "samsung"
 
             # Apple Health Export는 다른 구조
@@ -89,6 +159,47 @@ class FileUploadService:
 
         return "unknown"
 
+    # ------------------------------------------------
+    # 업로드 받기
+    # ------------------------------------------------
+    async def receive_upload(self, file: UploadFile, user_id: str) -> dict:
+        """
+        업로드 본문을 uploads/에 저장 (ZIP/DB 모두 원본 보존, 임시 사본 없이 한 번만 기록)
+
+        Returns:
+            처리 단계에 넘길 정보 {"upload_path", "filename", "upload_bytes", "upload_seconds"}
+        """
+        if not file.filename.lower().endswith((".zip", ".db")):
+            raise HTTPException(400, "ZIP 또는 DB 파일만 업로드 가능합니다.")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        user_short = self.user_short(user_id)
+        # 같은 초에 같은 사용자가 여러 번 올려도 (대기열) 서로 덮어쓰지 않도록 구분자 추가
+        original_save_path = (
+            UPLOADS_DIR / f"{user_short}_{timestamp}_{uuid.uuid4().hex[:6]}_{file.filename}"
+        )
+
+        print(f"[INFO] 파일 업로드 시작: {file.filename}")
+        started = time.perf_counter()
+
+        # 1️⃣ 파일 저장 (chunk 단위 스트리밍)
+        upload_bytes = await self.save_upload(file, original_save_path)
+        print(
+            f"[INFO] 원본 파일 저장: {original_save_path} "
+            f"({upload_bytes / 1e6:.1f}MB)"
+        )
+
+        return {
+            "upload_path": str(original_save_path),
+            "filename": file.filename,
+            "upload_bytes": upload_bytes,
+            "upload_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    @staticmethod
+    def user_short(user_id: str) -> str:
+        return user_id.replace("@", "_").replace(".", "_")
+
     async def process_file(
         self,
         file: UploadFile,
@@ -96,57 +207,158 @@ class FileUploadService:
         difficulty: str,
         duration: int,
     ):
+        """업로드를 받아 요청 안에서 끝까지 처리 (INGEST_JOB_QUEUE=0)"""
         user_id = self.get_or_create_user_id(user_id)
 
+        try:
+            upload = await self.receive_upload(file, user_id)
+            return await self.ingest_upload(
+                user_id, {**upload, "difficulty": difficulty, "duration": duration}
+            )
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"[ERROR] 처리 중 오류: {str(e)}")
+            traceback.print_exc()
+            raise HTTPException(500, f"ZIP/DB 처리 중 오류 발생: {str(e)}")
+
+    async def enqueue_file(
+        self,
+        file: UploadFile,
+        user_id: str | None,
+        difficulty: str,
+        duration: int,
+    ):
+        """업로드를 저장하고 작업 등록 후 바로 job_id 반환 (처리는 ingest 워커)"""
+        user_id = self.get_or_create_user_id(user_id)
+
+        try:
+            upload = await self.receive_upload(file, user_id)
+            job_id = await self.run_blocking(
+                job_queue.enqueue,
+                JOB_KIND_FILE_UPLOAD,
+                user_id,
+                {**upload, "difficulty": difficulty, "duration": duration},
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"[ERROR] 업로드 접수 중 오류: {str(e)}")
+            raise HTTPException(500, f"ZIP/DB 업로드 접수 중 오류 발생: {str(e)}")
+
+        print(f"[INFO] 업로드 작업 등록: {job_id} (user: {user_id})")
+        _wake_workers()
+
+        return {
+            "message": "ZIP/DB 업로드 접수 - 백그라운드에서 처리합니다.",
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": STATUS_QUEUED,
+            "status_url": f"/api/file/jobs/{job_id}",
+        }
+
+    async def get_job(self, job_id: str):
+        """작업 상태 / 단계별 소요 시간 / 완료 시 분석 결과"""
+        job = await self.run_blocking(job_queue.get, job_id)
+        if job is None or job["kind"] != JOB_KIND_FILE_UPLOAD:
+            raise HTTPException(404, "작업을 찾을 수 없습니다.")
+        return job
+
+    # ------------------------------------------------
+    # 저장된 업로드 처리 (요청 안 / ingest 워커 공통)
+    # ------------------------------------------------
+    async def ingest_upload(
+        self,
+        user_id: str,
+        params: dict,
+        timer: "StageTimings" = None,
+        published_result: dict = None,
+    ):
+        """
+        params: receive_upload 결과 + {"difficulty", "duration"}
+        timer: 단계별 소요 시간 기록 (없으면 새로 만듦, 결과의 "timings"로 반환)
+        published_result: 이전 시도에서 이미 공개한 결과
+                          (최신 날짜가 같으면 LLM 분석을 다시 하지 않고 재사용 → 저장만 다시)
+        """
+        timer = timer or StageTimings()
+        if params.get("upload_seconds") is not None:
+            timer.seconds.setdefault("upload", params["upload_seconds"])
+
+        filename = params["filename"]
+        original_save_path = Path(params["upload_path"])
+        difficulty = params["difficulty"]
+        duration = params["duration"]
+
         # 사용자별 타임스탬프 디렉토리
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        user_short = user_id.replace("@", "_").replace(".", "_")
+        user_short = self.user_short(user_id)
 
         temp_dir = str(EXTRACTED_DIR / f"{user_short}_{timestamp}")
         os.makedirs(temp_dir, exist_ok=True)
 
-        temp_path = os.path.join(temp_dir, file.filename)
-
         try:
-            print(f"[INFO] 파일 업로드 시작: {file.filename}")
-
-            # 1️⃣ 파일 저장
-            with open(temp_path, "wb") as buffer:
-                buffer.write(await file.read())
-
-            # ============================================================
-            # 📌 수정: ZIP/DB 모두 uploads/ 폴더에 원본 저장
-            # ============================================================
-            original_save_name = f"{user_short}_{timestamp}_{file.filename}"
-            original_save_path = UPLOADS_DIR / original_save_name
-            shutil.copy2(temp_path, original_save_path)
-            print(f"[INFO] 원본 파일 저장: {original_save_path}")
+            # 같은 사용자의 이전 업로드가 아직 백그라운드 저장 중이면 끝날 때까지 기다림
+            # (워터마크 / 같은 날짜 저장 순서 보장)
+            if user_id in _background_stores:
+                async with timer.stage("wait_previous_store"):
+                    await wait_background_store(user_id)
 
             # 2️⃣ ZIP 또는 DB 판별
-            if file.filename.lower().endswith(".zip"):
-                print("[INFO] ZIP 파일 압축 해제 중...")
-                db_path = await self.run_blocking(extract_zip_to_temp, temp_path)
-            elif file.filename.lower().endswith(".db"):
-                db_path = temp_path
+            if filename.lower().endswith(".zip"):
+                # central directory에서 SQLite 멤버만 찾아 추출 (나머지 멤버는 해제하지 않음)
+                print("[INFO] ZIP에서 SQLite DB 추출 중...")
+                async with timer.stage("extract"):
+                    try:
+                        db_path = await self.run_blocking(
+                            extract_sqlite_member, str(original_save_path), temp_dir
+                        )
+                    except (FileNotFoundError, zipfile.BadZipFile) as e:
+                        raise HTTPException(400, f"ZIP 파일 오류: {str(e)}")
+                print(f"[INFO] SQLite DB 추출: {db_path}")
+            elif filename.lower().endswith(".db"):
+                # 업로드 원본을 그대로 읽음 (읽기 전용 연결)
+                db_path = str(original_save_path)
             else:
                 raise HTTPException(400, "ZIP 또는 DB 파일만 업로드 가능합니다.")
 
             if not db_path:
                 raise HTTPException(500, "DB 파일 경로를 찾을 수 없습니다.")
 
-            # 3️⃣ DB → JSON (비동기 처리)
-            print("[INFO] DB 파싱 중...")
-            raw_db_json = await self.run_blocking(db_to_json, db_path)
-
-            # ✅ 개선: 플랫폼 감지
-            platform = self.detect_platform(file.filename, raw_db_json)
-            print(f"[INFO] 감지된 플랫폼: {platform}")
+            async with timer.stage("parse"):
+                # ✅ 개선: 플랫폼 감지
+                try:
+                    db_tables = await self.run_blocking(list_db_tables, db_path)
+                except sqlite3.DatabaseError as e:
+                    raise HTTPException(400, f"SQLite DB를 읽을 수 없습니다: {str(e)}")
+                platform = self.detect_platform(filename, db_tables)
+                print(f"[INFO] 감지된 플랫폼: {platform}")
+
+                # 3️⃣ DB → 날짜별 raw 추출 (DB_PARSE_MODE, 기본: SQL 집계)
+                # - 같은 사용자/플랫폼의 이전 업로드 워터마크가 있으면 그 이후만 읽음
+                # - INGEST_PROCESS_WORKERS > 1이면 날짜 범위를 나눠 프로세스 풀에서 파싱
+                since_day = None
+                if INGEST_INCREMENTAL:
+                    watermarks = await self.run_blocking(
+                        day_store.get_ingest_watermarks, user_id, platform
+                    )
+                    since_day = incremental_start_day(watermarks, db_tables)
+
+                print(
+                    "[INFO] DB 파싱 및 날짜별 데이터 추출 중..."
+                    + (f" (증분: local_date {since_day} 이후)" if since_day is not None else "")
+                )
+                raw_by_day, last_days = await self.run_blocking(
+                    ingest_db_file_parallel, db_path, DB_PARSE_MODE, since_day
+                )
 
-            # 4️⃣ 날짜별 raw 추출
-            print("[INFO] 날짜별 데이터 추출 중...")
-            raw_by_day = await self.run_blocking(
-                parse_db_json_to_raw_data_by_day, raw_db_json
-            )
+                if not raw_by_day and since_day is not None:
+                    # 워터마크 이후 데이터가 없는 파일 (예: 예전 내보내기 파일) → 전체
+                    print("[INFO] 워터마크 이후 데이터 없음 → 전체 다시 읽기")
+                    since_day = None
+                    raw_by_day, last_days = await self.run_blocking(
+                        ingest_db_file_parallel, db_path, DB_PARSE_MODE
+                    )
 
             if not raw_by_day:
                 raise HTTPException(
@@ -163,58 +375,112 @@ class FileUploadService:
 
             # 5️⃣ 최신 날짜 결정
             latest_date = max(raw_by_day.keys())
-            latest_raw = raw_by_day[latest_date]
 
-            # 6️⃣ 최신 1일치 summary (분석용)
-            print("[INFO] 최신 데이터 전처리 중...")
-            latest_summary = await self.run_blocking(
-                preprocess_health_json, latest_raw, latest_date, platform
-            )
-
-            # 7️⃣ 전체 날짜 summary → Vector DB 배치 저장
-            print(f"[INFO] VectorDB에 {total_days}일치 데이터 배치 저장 중...")
-
-            all_summaries = []
-            for date_int, raw in raw_by_day.items():
-                daily_summary = await self.run_blocking(
-                    preprocess_health_json,
-                    raw,
-                    date_int,
-                    platform,
+            async with timer.stage("preprocess"):
+                # 6️⃣ 전체 날짜 summary 한 번에 생성 (executor 호출 1번, 날짜별 로그 없음)
+                # - INGEST_PROCESS_WORKERS > 1이면 날짜 구간별로 프로세스 풀에서
+                print(f"[INFO] {total_days}일치 데이터 전처리 중...")
+                all_summaries = await self.run_blocking(
+                    preprocess_days_parallel, raw_by_day, platform
                 )
-                all_summaries.append(daily_summary)
 
+                # 7️⃣ 최신 1일치 summary (분석용) - 목록 위치가 아닌 summary 자신의 날짜로 선택
+                latest_summary = max(all_summaries, key=lambda s: s["created_at"])
+
+            # 8️⃣ 최근 기록 먼저 저장 → 9️⃣ LLM 분석 + 나머지 날짜 저장 동시 실행
+            # - 분석의 RAG 검색은 사용자 과거 기록만 필요 → 최근 기록 저장만 기다림
+            # - 분석이 끝나면 바로 반환, 나머지 저장 + 워터마크 갱신은 백그라운드
+            # - INGEST_PIPELINE=0이면 전체 저장 후 분석 (기존 순서)
+            # - 보관 기간(RETENTION_HOT_DAYS) 밖의 날짜는 임베딩하지 않고 보관소에 바로 기록
+            #   (전체 다시 읽기가 보관된 날짜를 hot으로 되돌리지 않도록)
+            # - 분석 기간 안의 보관 날짜는 분석 전에 기록 (RAG 검색이 보관소 기록으로 채움)
             source = f"zip_{platform}"
-            await self.run_blocking(
-                save_daily_summaries_batch, all_summaries, user_id, source
-            )
+            hot_summaries, cold_summaries = self.split_retention(all_summaries)
+            if INGEST_PIPELINE:
+                recent_summaries, older_summaries = self.split_recent_summaries(
+                    hot_summaries, latest_summary, INGEST_ANALYSIS_HISTORY_DAYS
+                )
+                recent_cold, cold_summaries = self.split_recent_summaries(
+                    cold_summaries, latest_summary, INGEST_ANALYSIS_HISTORY_DAYS
+                )
+            else:
+                recent_summaries, older_summaries = hot_summaries, []
+                recent_cold = []
+
+            ingest_info = {
+                "incremental": since_day is not None,
+                "since_day": since_day,
+                "days_parsed": total_days,
+                "days_before_analysis": len(recent_summaries),
+                "days_in_background": len(older_summaries),
+                "days_archived": len(recent_cold) + len(cold_summaries),
+                "embedded": 0,
+                "unchanged": 0,
+                "store_complete": False,
+            }
 
             print(
-                f"[SUCCESS] {total_days}일치 데이터 VectorDB 저장 완료 (플랫폼: {platform})"
+                f"[INFO] VectorDB에 최근 {len(recent_summaries)}일치 데이터 저장 중..."
+                f" (나머지 {len(older_summaries)}일은 분석과 동시에)"
             )
-
-            # 8️⃣ LLM 분석 (최신 데이터만)
-            print("[INFO] LLM 분석 실행 중...")
-            llm_result = await self.run_blocking(
-                run_llm_analysis,
-                latest_summary,
+            async with timer.stage("store_recent"):
+                if recent_summaries:
+                    save_result = await async_vector_store.save_daily_summaries_batch(
+                        recent_summaries, user_id, source
+                    )
+                    _add_save_counts(ingest_info, save_result)
+                if recent_cold:
+                    await async_vector_store.archive_daily_summaries(
+                        recent_cold, user_id, source
+                    )
+
+            # 실패 시 다시 실행할 수 있도록 코루틴 대신 함수로 전달
+            store = partial(
+                self.store_remaining,
                 user_id,
-                difficulty,
-                duration,
+                platform,
+                source,
+                older_summaries,
+                cold_summaries,
+                last_days,
+                ingest_info,
+                timer,
             )
+            if INGEST_PIPELINE:
+                _start_background_store(user_id, store, ingest_info)
+            else:
+                await store()
 
-            print("[SUCCESS] 분석 완료")
+            # LLM 분석 (최신 데이터만)
+            if published_result and published_result.get("latest_date") == latest_date:
+                # 저장 실패로 다시 실행된 작업 → 이미 공개한 분석 결과 재사용
+                print("[INFO] 이전 시도의 분석 결과 재사용 (저장만 다시 실행)")
+                llm_result = published_result["llm_result"]
+            else:
+                print("[INFO] LLM 분석 실행 중...")
+                async with timer.stage("analysis"):
+                    llm_result = await self.run_blocking(
+                        run_llm_analysis,
+                        latest_summary,
+                        user_id,
+                        difficulty,
+                        duration,
+                    )
+
+                print("[SUCCESS] 분석 완료")
 
             # ============================================================
             # 📌 수정: 저장 경로 정보 로그
             # ============================================================
             print(f"\n{'='*70}")
             print(f"📦 파일 저장 정보:")
-            print(f"  • 파일 타입: {file.filename.split('.')[-1].upper()}")
+            print(f"  • 파일 타입: {filename.split('.')[-1].upper()}")
             print(f"  • 원본 파일: {original_save_path}")
             print(f"  • 압축 해제: {temp_dir}")
             print(f"  • 플랫폼: {platform}")
             print(f"  • 날짜 범위: {dates[0]} ~ {dates[-1]}")
+            print(f"  • 단계별 소요 시간(s): {timer.seconds}")
+            print(f"  • 단계별 시작 ~ 끝(s): {timer.timeline()}")
             print(f"{'='*70}\n")
 
             return {
@@ -224,26 +490,21 @@ class FileUploadService:
                 "date_range": f"{dates[0]} ~ {dates[-1]}" if dates else "",
                 "latest_date": latest_date,
                 "platform": platform,
+                # 백그라운드 저장이 끝나면 같은 dict에 저장 건수 / store_complete 반영
+                "ingest": ingest_info,
+                "timings": dict(timer.seconds),
+                "timeline": timer.timeline(),
                 "summary": latest_summary,
                 "llm_result": llm_result,
                 "file_info": {
-                    "file_type": file.filename.split(".")[-1],
+                    "file_type": filename.split(".")[-1],
                     "original_path": str(original_save_path),
                     "extract_dir": temp_dir,
                 },
             }
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            print(f"[ERROR] 처리 중 오류: {str(e)}")
-            import traceback
-
-            traceback.print_exc()
-            raise HTTPException(500, f"ZIP/DB 처리 중 오류 발생: {str(e)}")
-
         finally:
-            # 9️⃣ 이전 데이터 정리 + 현재 데이터 보존
+            # 🔟 이전 데이터 정리 + 현재 데이터 보존
             try:
                 # 1. 현재 사용자의 모든 추출 디렉토리 찾기
                 user_pattern = f"{user_short}_*"
@@ -265,9 +526,15 @@ class FileUploadService:
                 file_pattern = f"{user_short}_*.*"  # 모든 확장자
                 old_files = list(UPLOADS_DIR.glob(file_pattern))
 
-                # 현재 파일 제외
-                current_file = UPLOADS_DIR / original_save_name
-                old_files = [f for f in old_files if f != current_file]
+                # 현재 파일 + 아직 처리 전인 작업의 업로드 제외
+                keep_files = {original_save_path}
+                if INGEST_JOB_QUEUE:
+                    keep_files.update(
+                        Path(p["upload_path"])
+                        for p in job_queue.active_params(user_id)
+                        if p.get("upload_path")
+                    )
+                old_files = [f for f in old_files if f not in keep_files]
 
                 for old_file in old_files:
                     print(f"[INFO] 이전 원본 파일 삭제: {old_file.name}")
@@ -278,3 +545,272 @@ class FileUploadService:
 
             except Exception as e:
                 print(f"[WARN] 이전 데이터 정리 중 오류 (무시): {str(e)}")
+
+    async def store_remaining(
+        self,
+        user_id: str,
+        platform: str,
+        source: str,
+        summaries: list,
+        cold_summaries: list,
+        last_days: dict,
+        ingest_info: dict,
+        timer: "StageTimings",
+    ):
+        """분석과 동시에 나머지 날짜 저장 (+ 보관 기간 밖 날짜는 보관소) → 모두 끝난 뒤 워터마크 갱신"""
+        async with timer.stage("store_background"):
+            if summaries:
+                save_result = await async_vector_store.save_daily_summaries_batch(
+                    summaries, user_id, source
+                )
+                _add_save_counts(ingest_info, save_result)
+            if cold_summaries:
+                await async_vector_store.archive_daily_summaries(
+                    cold_summaries, user_id, source
+                )
+
+            # 저장이 끝난 뒤 워터마크 갱신 (실패하면 다음 업로드에서 다시 읽음)
+            await self.run_blocking(
+                day_store.update_ingest_watermarks, user_id, platform, last_days
+            )
+
+        ingest_info["store_complete"] = True
+        print(
+            f"[SUCCESS] {ingest_info['days_parsed']}일치 데이터 VectorDB 저장 완료 "
+            f"(플랫폼: {platform})"
+        )
+
+    async def run_job(self, job: dict):
+        """대기열에서 가져온 작업 1개 실행 → 결과 / 실패 기록"""
+        job_id = job["job_id"]
+        print(f"[INFO] 업로드 작업 시작: {job_id} (시도 {job['attempts']})")
+
+        async def report(stage, seconds):
+            await self.run_blocking(job_queue.set_stage, job_id, _worker_id, stage, seconds)
+
+        timer = StageTimings(report)
+        try:
+            result = await self.ingest_upload(
+                job["user_id"], job["params"], timer, published_result=job.get("result")
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # HTTPException = 파일 자체 문제 (다시 해도 같음) → 바로 실패
+            retry = not isinstance(e, HTTPException)
+            error = e.detail if isinstance(e, HTTPException) else str(e)
+            status = await self.run_blocking(
+                job_queue.fail, job_id, _worker_id, error, dict(timer.seconds), retry
+            )
+            print(f"[ERROR] 업로드 작업 실패: {job_id} ({error}) → {status}")
+            if retry:
+                traceback.print_exc()
+            return
+
+        # 분석 결과는 먼저 공개 → 백그라운드 저장이 끝나면 완료 처리
+        # (그동안 running 유지 → 같은 사용자의 다음 작업은 저장이 끝난 뒤 시작)
+        if not result["ingest"]["store_complete"]:
+            await self.run_blocking(
+                job_queue.publish_result, job_id, _worker_id, result, dict(timer.seconds)
+            )
+            await wait_background_store(job["user_id"])
+            result["timings"] = dict(timer.seconds)
+            result["timeline"] = timer.timeline()
+
+            store_error = result["ingest"].get("store_error")
+            if store_error:
+                # 저장 단계만 INGEST_STORE_MAX_ATTEMPTS번 다시 시도했는데도 실패 → 작업 재시도
+                # (다시 실행할 때 공개된 분석 결과를 재사용하고, 바뀌지 않은 날짜는 임베딩 건너뜀)
+                status = await self.run_blocking(
+                    job_queue.fail, job_id, _worker_id, store_error, dict(timer.seconds), True
+                )
+                print(f"[ERROR] 업로드 작업 저장 실패: {job_id} ({store_error}) → {status}")
+                return
+
+        await self.run_blocking(
+            job_queue.complete, job_id, _worker_id, result, dict(timer.seconds)
+        )
+        print(f"[SUCCESS] 업로드 작업 완료: {job_id} {timer.seconds}")
+
+
+# ============================================================
+# 단계별 소요 시간
+# ============================================================
+class StageTimings:
+    """
+    처리 단계별 소요 시간(s) 기록
+
+    on_change(stage, seconds): 단계가 시작/끝날 때마다 호출되는 async 함수
+    (stage = 진행 중인 단계 이름, 여러 개면 ","로 연결 / 없으면 None)
+
+    동시에 실행되는 단계가 있으므로 timeline()으로 단계별 시작 ~ 끝 시각도 제공
+    (처리 시작 기준 초, 진행 중이면 끝 = None) → 응답까지의 critical path 확인용
+    """
+
+    def __init__(self, on_change=None):
+        self.seconds = {}
+        self.running = []
+        self.spans = {}
+        self._origin = time.perf_counter()
+        self._on_change = on_change
+
+    def timeline(self) -> dict:
+        return {name: list(span) for name, span in self.spans.items()}
+
+    async def _notify(self):
+        if self._on_change is None:
+            return
+        try:
+            await self._on_change(",".join(self.running) or None, dict(self.seconds))
+        except Exception as e:
+            print(f"[WARN] 진행 상황 기록 실패 (무시): {e}")
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        self.running.append(name)
+        await self._notify()
+        started = time.perf_counter()
+        self.spans[name] = [round(started - self._origin, 3), None]
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            self.seconds[name] = round(finished - started, 3)
+            self.spans[name][1] = round(finished - self._origin, 3)
+            self.running.remove(name)
+            await self._notify()
+
+
+# ============================================================
+# ingest 워커 (서버 프로세스 안의 asyncio task)
+# - 프로세스마다 INGEST_MAX_CONCURRENT개 task가 대기열을 확인
+# - 실제 동시 실행 수는 job_queue.claim이 노드 전체 기준으로 제한
+# ============================================================
+job_queue = JobQueue(INGEST_JOB_DB_PATH, INGEST_JOB_LEASE_SEC, INGEST_JOB_MAX_ATTEMPTS)
+JOB_KIND_FILE_UPLOAD = "file_upload"
+
+_worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_worker_tasks = []
+_wakeup = None  # asyncio.Event (워커 시작 후 생성)
+
+
+# ------------------------------------------------
+# 백그라운드 저장 (사용자별 최대 1개, 같은 사용자의 다음 업로드는 끝날 때까지 기다림)
+# ------------------------------------------------
+_background_stores = {}  # user_id → asyncio.Task
+
+
+def _add_save_counts(ingest_info: dict, save_result: dict):
+    ingest_info["embedded"] += save_result.get("embedded", 0)
+    ingest_info["unchanged"] += save_result.get("unchanged", 0)
+
+
+def _start_background_store(user_id: str, store, ingest_info: dict):
+    """
+    store()(코루틴 함수)를 task로 실행
+
+    - 실패하면 저장 단계만 INGEST_STORE_MAX_ATTEMPTS번까지 다시 실행
+      (이미 저장된 날짜는 바뀌지 않았으므로 임베딩 건너뜀)
+    - 마지막 시도도 실패하면 ingest_info["store_error"]에 기록
+    """
+
+    async def run():
+        for attempt in range(1, INGEST_STORE_MAX_ATTEMPTS + 1):
+            try:
+                await store()
+                ingest_info.pop("store_error", None)
+                return
+            except Exception as e:
+                ingest_info["store_error"] = str(e)
+                print(
+                    f"[ERROR] 백그라운드 저장 실패 (user: {user_id}, "
+                    f"시도 {attempt}/{INGEST_STORE_MAX_ATTEMPTS}): {str(e)}"
+                )
+                traceback.print_exc()
+                if attempt < INGEST_STORE_MAX_ATTEMPTS:
+                    await asyncio.sleep(INGEST_STORE_RETRY_DELAY_SEC * attempt)
+
+    task = asyncio.create_task(run())
+    _background_stores[user_id] = task
+
+    def forget(done):
+        if _background_stores.get(user_id) is done:
+            del _background_stores[user_id]
+
+    task.add_done_callback(forget)
+
+
+async def wait_background_store(user_id: str):
+    """사용자의 백그라운드 저장이 끝날 때까지 기다림 (기다리는 쪽이 취소돼도 저장은 계속)"""
+    task = _background_stores.get(user_id)
+    if task is not None:
+        await asyncio.shield(task)
+
+
+async def wait_background_stores():
+    """서버 종료 시 호출: 진행 중인 백그라운드 저장 마무리"""
+    tasks = list(_background_stores.values())
+    if tasks:
+        print(f"[INFO] 백그라운드 저장 {len(tasks)}개 마무리 중...")
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _wake_workers():
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _worker_loop(service: FileUploadService):
+    while True:
+        try:
+            job = await service.run_blocking(
+                job_queue.claim, _worker_id, INGEST_MAX_CONCURRENT
+            )
+        except Exception as e:
+            print(f"[WARN] 작업 대기열 확인 실패: {e}")
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_wakeup.wait(), INGEST_JOB_POLL_SEC)
+            except asyncio.TimeoutError:
+                pass
+            _wakeup.clear()
+            continue
+
+        await service.run_job(job)
+        # 같은 사용자 / 동시 처리 수 제한으로 기다리던 작업이 있을 수 있음
+        _wake_workers()
+
+
+async def _heartbeat_loop():
+    while True:
+        await asyncio.sleep(INGEST_JOB_HEARTBEAT_SEC)
+        try:
+            await FileUploadService.run_blocking(job_queue.heartbeat, _worker_id)
+        except Exception as e:
+            print(f"[WARN] 작업 heartbeat 기록 실패: {e}")
+
+
+def start_ingest_workers(count: int = INGEST_MAX_CONCURRENT):
+    """서버 시작 시 호출 (이전 실행에서 남은 대기 작업도 이어서 처리)"""
+    global _wakeup
+    if _worker_tasks:
+        return
+    _wakeup = asyncio.Event()
+    service = FileUploadService()
+    _worker_tasks.extend(asyncio.create_task(_worker_loop(service)) for _ in range(count))
+    _worker_tasks.append(asyncio.create_task(_heartbeat_loop()))
+    print(f"[INFO] 업로드 작업 워커 {count}개 시작 ({_worker_id}, 대기열: {job_queue.stats()})")
+
+
+async def stop_ingest_workers():
+    """서버 종료 시 호출: 워커 중지 + 실행 중이던 작업은 대기열로 되돌림"""
+    for task in _worker_tasks:
+        task.cancel()
+    await asyncio.gather(*_worker_tasks, return_exceptions=True)
+    _worker_tasks.clear()
+
+    released = await FileUploadService.run_blocking(job_queue.release, _worker_id)
+    if released:
+        print(f"[INFO] 실행 중이던 업로드 작업 {released}개 대기열로 되돌림")
@@ -1,5 +1,5 @@
 from fastapi import HTTPException
-from app.core.vector_store import search_similar_summaries
+from app.core import async_vector_store
 
 
 class SimilarService:
@@ -9,7 +9,7 @@ class SimilarService:
     """
 
     @staticmethod
-    def find_similar(summary: dict, user_id: str):
+    async def find_similar(summary: dict, user_id: str):
         """
         summary(dict)와 user_id를 받아서,
         VectorDB에서 유사 summary 검색을 수행한다.
@@ -19,7 +19,7 @@ class SimilarService:
         query_dict = {"query": "summary comparison", "summary": summary}
 
         try:
-            results = search_similar_summaries(
+            results = await async_vector_store.search_similar_summaries(
                 query_dict=query_dict, user_id=user_id, top_k=3
             )
         except Exception as e:
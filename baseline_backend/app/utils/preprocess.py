@@ -37,7 +37,11 @@ def normalize_raw(raw_json: dict) -> dict:
     - JavaScript에서 NaN/Infinity → JSON null
     - 빈 값 → null
     """
-    platform = raw_json.get("platform", "samsung")
+    return _normalize_raw(raw_json, raw_json.get("platform", "samsung"))
+
+
+def _normalize_raw(raw_json: dict, platform: str) -> dict:
+    """normalize_raw 본체 (platform을 raw_json에 넣지 않고 인자로 받음)"""
 
     # ✅ 안전한 값 추출 함수
     def safe_get(key, default=0):
@@ -115,7 +119,7 @@ def normalize_raw(raw_json: dict) -> dict:
     # ---------------------------------------------------------
     # 7) 나머지 필드들 (✅ 모두 safe_get 사용)
     # ---------------------------------------------------------
-    return {
+    normalized = {
         "sleep_min": sleep_min,
         "sleep_hr": sleep_hr,
         "weight": weight,
@@ -141,6 +145,22 @@ def normalize_raw(raw_json: dict) -> dict:
         "glucose": safe_get("glucose", 0),
     }
 
+    # ---------------------------------------------------------
+    # 8) 심박수 날짜별 추가 통계 (HEART_RATE_SERIES_STATS, 있을 때만)
+    #    heartRateMin / heartRateMax / heartRateP<q> → heart_rate_min / _max / _p<q>
+    # ---------------------------------------------------------
+    for key, value in raw_json.items():
+        if value is None or not key.startswith(_HEART_RATE_STAT_PREFIX):
+            continue
+        stat = key[len(_HEART_RATE_STAT_PREFIX) :]
+        if stat in ("Min", "Max") or stat[:1] == "P":
+            normalized[f"heart_rate_{stat.lower()}"] = value
+
+    return normalized
+
+
+_HEART_RATE_STAT_PREFIX = "heartRate"
+
 
 def generate_summary_text(raw: dict) -> str:
     """요약 텍스트 생성 (0이 아닌 값만)"""
@@ -172,6 +192,11 @@ def generate_summary_text(raw: dict) -> str:
     if raw["heart_rate"] > 0:
         parts.append(f"심박수 {raw['heart_rate']:.0f}bpm")
 
+    if raw.get("heart_rate_min") and raw.get("heart_rate_max"):
+        parts.append(
+            f"심박수 범위 {raw['heart_rate_min']:.0f}~{raw['heart_rate_max']:.0f}bpm"
+        )
+
     if raw["weight"] > 0:
         parts.append(f"체중 {raw['weight']:.0f}kg")
 
@@ -246,3 +271,70 @@ def preprocess_health_json(
         "raw": raw_norm,
         "platform": platform,
     }
+
+
+# =============================================================
+# 여러 날짜 한 번에 전처리 (ZIP 업로드 / 앱 업로드 공통)
+# =============================================================
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def _created_at(date_int: int) -> str | None:
+    """preprocess_health_json과 같은 created_at (로그 없음, 날짜가 없거나 잘못됐으면 None)"""
+    if not date_int:
+        return None
+
+    date_str = str(date_int)
+    if len(date_str) == 8:
+        # YYYYMMDD (앱 업로드)
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}T00:00:00+00:00"
+    if len(date_str) <= 5:
+        # Epoch Day (Samsung Health Connect ZIP)
+        try:
+            day = datetime.fromordinal(_EPOCH_ORDINAL + date_int)
+            return f"{day:%Y-%m-%d}T00:00:00+00:00"
+        except (ValueError, OverflowError):
+            return None
+    return None
+
+
+def preprocess_health_json_batch(raw_by_day: dict, platform: str = "unknown") -> list:
+    """
+    날짜별 raw_json 전체 → summary 목록 (raw_by_day 순서)
+
+    - 날짜마다 preprocess_health_json을 부르는 것과 같은 결과
+      (단, 입력 raw_json에 platform을 써 넣지 않음)
+    - 날짜별 로그 없음, 잘못된 날짜 형식은 건수만 1번 출력
+
+    Args:
+        raw_by_day: {date_int(YYYYMMDD 또는 Epoch Day): raw_json}
+        platform: 'samsung', 'apple', 'unknown'
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    summaries = []
+    invalid_dates = 0
+
+    for date_int, raw_json in raw_by_day.items():
+        created_at = _created_at(date_int)
+        if created_at is None:
+            invalid_dates += bool(date_int)
+            created_at = now
+
+        try:
+            raw_norm = _normalize_raw(raw_json, platform)
+        except Exception as e:
+            print(f"[ERROR] normalize_raw 실패 (날짜: {date_int}): {e}")
+            raise
+
+        summaries.append(
+            {
+                "created_at": created_at,
+                "summary_text": generate_summary_text(raw_norm),
+                "raw": raw_norm,
+                "platform": platform,
+            }
+        )
+
+    if invalid_dates:
+        print(f"[WARN] 잘못된 날짜 {invalid_dates}개는 현재 시간으로 저장")
+    return summaries
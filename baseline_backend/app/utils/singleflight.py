@@ -0,0 +1,111 @@
+"""
+동시 중복 요청 합치기 (single-flight)
+
+같은 키의 요청이 실행 중이면 새로 실행하지 않고 그 결과를 같이 받는다.
+- SingleFlight     : 스레드용 (executor / 동기 엔드포인트에서 호출)
+- AsyncSingleFlight: asyncio용 (기다리는 동안 스레드를 점유하지 않음)
+
+결과 캐시가 아니다: 실행이 끝나면 키가 바로 지워지므로 이후 요청은 다시 실행된다.
+먼저 온 호출자는 원본을, 합쳐진 호출자는 복사본을 받는다 (결과 수정이 서로 섞이지 않도록).
+"""
+
+import copy
+import json
+import asyncio
+import functools
+import threading
+
+
+def make_key(name: str, args: tuple, kwargs: dict) -> tuple:
+    """함수 이름 + 인자로 요청 키 생성 (dict 인자도 사용 가능)"""
+    return name, json.dumps([args, kwargs], sort_keys=True, default=str)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def wrap(self, func):
+        """함수 이름 + 인자가 같은 동시 호출을 합치는 데코레이터"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.do(make_key(func.__name__, args, kwargs), func, *args, **kwargs)
+
+        return wrapper
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._tasks = {}
+        self._stats = {"executed": 0, "coalesced": 0}
+
+    async def do(self, key, factory):
+        """
+        factory(): 코루틴을 만드는 함수 (같은 키가 실행 중이 아닐 때만 호출)
+
+        실행은 별도 task로 하고 shield로 기다리므로,
+        호출자 한 명이 취소돼도 나머지 호출자의 요청은 계속 진행된다.
+        """
+        task = self._tasks.get(key)
+        leader = task is None
+
+        if leader:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            self._stats["executed"] += 1
+
+            def _forget(done, key=key):
+                if self._tasks.get(key) is done:
+                    del self._tasks[key]
+
+            task.add_done_callback(_forget)
+        else:
+            self._stats["coalesced"] += 1
+
+        result = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+    def stats(self) -> dict:
+        return {**self._stats, "in_flight": len(self._tasks)}
@@ -0,0 +1,77 @@
+"""
+임베딩 벡터 저장 형식 변환 (스칼라 양자화 / 차원 축소)
+
+- float32: 원본 그대로 (차원당 4바이트)
+- float16: 반정밀도 (차원당 2바이트, 코사인 오차 ~1e-3)
+- int8   : 벡터(행)별 스케일 1개 + 부호 있는 8비트 (차원당 1바이트)
+           값 = int8 × scale, scale = max|v| / 127
+- truncate_vectors: 앞쪽 N차원만 남기고 다시 L2 정규화
+  (text-embedding-3 계열의 dimensions 파라미터와 같은 결과)
+"""
+
+import numpy as np
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+_SCALE_BYTES = 4  # int8 BLOB 앞에 붙는 float32 스케일
+
+
+def check_dtype(dtype: str) -> str:
+    if dtype not in VECTOR_DTYPES:
+        raise ValueError(
+            f"❌ 지원하지 않는 벡터 저장 형식: {dtype} "
+            f"(사용 가능: {', '.join(VECTOR_DTYPES)})"
+        )
+    return dtype
+
+
+# ------------------------------------------------
+# 행렬 (메모리 캐시용)
+# ------------------------------------------------
+def quantize_matrix(matrix: np.ndarray, dtype: str) -> tuple:
+    """
+    (행 수 × 차원) float 행렬 → (저장 행렬, 행별 스케일 또는 None)
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if check_dtype(dtype) != "int8":
+        return np.ascontiguousarray(matrix, dtype=dtype), None
+
+    scales = np.abs(matrix).max(axis=1) / 127.0 if matrix.size else np.zeros(0)
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    quantized = np.rint(matrix / scales[:, None]).clip(-127, 127).astype(np.int8)
+    return np.ascontiguousarray(quantized), scales
+
+
+def dequantize_matrix(matrix: np.ndarray, scales) -> np.ndarray:
+    matrix = matrix.astype(np.float32)
+    if scales is not None:
+        matrix *= scales[:, None]
+    return matrix
+
+
+def truncate_vectors(vectors, dimensions: int) -> np.ndarray:
+    """앞쪽 dimensions 차원만 남기고 L2 정규화"""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix = matrix.reshape(-1, matrix.shape[-1])[:, :dimensions]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ------------------------------------------------
+# 벡터 1개 ↔ BLOB (디스크 캐시용)
+# ------------------------------------------------
+def encode_vector(vector, dtype: str) -> bytes:
+    data, scales = quantize_matrix(np.asarray(vector, dtype=np.float32)[None, :], dtype)
+    if scales is None:
+        return data.tobytes()
+    return scales.tobytes() + data.tobytes()
+
+
+def decode_vector(blob: bytes, dtype: str) -> list:
+    if check_dtype(dtype) != "int8":
+        return np.frombuffer(blob, dtype=dtype).astype(np.float32).tolist()
+
+    scale = np.frombuffer(blob[:_SCALE_BYTES], dtype=np.float32)[0]
+    data = np.frombuffer(blob[_SCALE_BYTES:], dtype=np.int8)
+    return (data.astype(np.float32) * scale).tolist()
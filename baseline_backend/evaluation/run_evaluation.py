@@ -6,10 +6,12 @@
     python run_evaluation.py --stage baseline --dataset health
     python run_evaluation.py --stage langchain --dataset all
     python run_evaluation.py --stage finetuned --dataset all
+    python run_evaluation.py --stage baseline --embedding-backend local  # 오프라인 임베딩
 """
 
 import argparse
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -33,13 +35,24 @@ def main():
         default="all",
         help="테스트 데이터셋 선택",
     )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=["openai", "local"],
+        default=None,
+        help="임베딩 백엔드 (local: 네트워크 없이 해시 n-gram 임베딩)",
+    )
     parser.add_argument("--verbose", action="store_true", help="상세 출력")
     args = parser.parse_args()
 
+    # app.config가 import되기 전에 설정해야 적용됨
+    if args.embedding_backend:
+        os.environ["EMBEDDING_BACKEND"] = args.embedding_backend
+
     print(f"\n{'='*60}")
     print(f"🚀 {args.stage.upper()} 평가 시작")
     print(f"{'='*60}")
     print(f"데이터셋: {args.dataset}")
+    print(f"임베딩 백엔드: {os.getenv('EMBEDDING_BACKEND', 'openai')}")
 
     if args.stage == "baseline":
         runner = BaselineRunner()
@@ -170,15 +170,18 @@ class BaselineRunner:
             self.run_llm_analysis = None
 
         try:
-            from app.core.vector_store import save_daily_summary, collection
+            from app.core.vector_store import (
+                save_daily_summary,
+                delete_daily_summaries,
+            )
 
             self.save_daily_summary = save_daily_summary
-            self.chroma_collection = collection
+            self.delete_daily_summaries = delete_daily_summaries
             print("✅ vector_store 모듈 로드 성공")
         except ImportError as e:
             print(f"⚠️ vector_store 모듈 로드 실패: {e}")
             self.save_daily_summary = None
-            self.chroma_collection = None
+            self.delete_daily_summaries = None
 
     # ============================================
     # 테스트 데이터 Setup / Cleanup
@@ -228,8 +231,8 @@ class BaselineRunner:
         """
         테스트 후 샘플 데이터 삭제
         """
-        if self.chroma_collection is None:
-            print("⚠️ ChromaDB collection이 없어서 정리 불가")
+        if self.delete_daily_summaries is None:
+            print("⚠️ vector_store 모듈이 없어서 정리 불가")
             return False
 
         if not self.test_data_ids:
@@ -239,7 +242,7 @@ class BaselineRunner:
         print("\n🧹 테스트 데이터 정리 중...")
 
         try:
-            self.chroma_collection.delete(ids=self.test_data_ids)
+            self.delete_daily_summaries(self.test_data_ids)
             print(f"🧹 {len(self.test_data_ids)}개 테스트 데이터 삭제 완료\n")
             self.test_data_ids = []
             return True
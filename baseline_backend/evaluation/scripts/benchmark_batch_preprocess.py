@@ -0,0 +1,112 @@
+"""
+업로드 전처리 벤치마크: 날짜별 executor 호출 vs 배치 1번
+
+- 기존(per-day): 날짜마다 await run_in_executor(preprocess_health_json, ...) 순차 실행
+              (호출마다 event loop 왕복 + 날짜별 로그)
+- 배치(batch): await run_in_executor(preprocess_health_json_batch, raw_by_day) 1번
+- 합성 Health Connect DB(synthetic_health_connect_db.py)를 ingest_db_file로 파싱한 raw_by_day 사용
+- 로그는 서버처럼 파일로 기록 (--log로 경로 지정, 기본은 임시 파일) → 로그 줄 수도 출력
+- 결과 검증: 두 방식의 summary 목록이 같은지 (다르면 종료 코드 1)
+
+사용법:
+    python evaluation/scripts/benchmark_batch_preprocess.py
+    python evaluation/scripts/benchmark_batch_preprocess.py --days 1095 --repeat 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.db_ingest import ingest_db_file
+from app.utils.preprocess import preprocess_health_json, preprocess_health_json_batch
+from synthetic_health_connect_db import build_health_connect_db
+
+
+async def per_day(executor, raw_by_day: dict, platform: str) -> list:
+    loop = asyncio.get_running_loop()
+    summaries = []
+    for date_int, raw in raw_by_day.items():
+        summaries.append(
+            await loop.run_in_executor(
+                executor, preprocess_health_json, raw, date_int, platform
+            )
+        )
+    return summaries
+
+
+async def batch(executor, raw_by_day: dict, platform: str) -> list:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, preprocess_health_json_batch, raw_by_day, platform
+    )
+
+
+def measure(method, raw_by_day: dict, platform: str, log_path: str) -> tuple:
+    """(걸린 시간, summary 목록, 로그 줄 수)"""
+    # preprocess_health_json은 입력 raw에 platform을 써 넣으므로 매번 사본 사용
+    raw_copy = {day: dict(raw) for day, raw in raw_by_day.items()}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with open(log_path, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            started = time.perf_counter()
+            summaries = asyncio.run(method(executor, raw_copy, platform))
+            elapsed = time.perf_counter() - started
+    with open(log_path, encoding="utf-8") as log:
+        lines = sum(1 for _ in log)
+    return elapsed, summaries, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜별 전처리 vs 배치 전처리 벤치마크")
+    parser.add_argument("--days", type=int, default=1095)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--platform", default="samsung")
+    parser.add_argument("--log", default=None, help="전처리 로그 파일 (기본: 임시 파일)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_batch_preprocess_")
+    log_path = args.log or os.path.join(workdir, "preprocess.log")
+    try:
+        db_path = os.path.join(workdir, "hc.db")
+        build_health_connect_db(db_path, args.days)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            raw_by_day, _ = ingest_db_file(db_path, "sql")
+
+        print(f"\n{'='*72}")
+        print(f"업로드 전처리 벤치마크 ({len(raw_by_day):,}일, {args.repeat}회 중앙값)")
+        print(f"{'='*72}")
+        print(f"{'방식':>8} | {'executor 호출':>13} {'시간(ms)':>9} {'로그(줄)':>8} {'일치':>5}")
+
+        results = {}
+        for name, method, hops in (
+            ("per-day", per_day, len(raw_by_day)),
+            ("batch", batch, 1),
+        ):
+            runs = [measure(method, raw_by_day, args.platform, log_path) for _ in range(args.repeat)]
+            seconds = statistics.median(run[0] for run in runs)
+            results[name] = runs[-1][1]
+            same = results[name] == results["per-day"]
+            print(
+                f"{name:>8} | {hops:>13,} {seconds * 1000:>9.1f} {runs[-1][2]:>8,} "
+                f"{'O' if same else 'X':>5}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if results["batch"] != results["per-day"]:
+        print("[ERROR] 배치 전처리 결과가 날짜별 결과와 다름")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
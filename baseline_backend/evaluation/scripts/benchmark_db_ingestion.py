@@ -0,0 +1,138 @@
+"""
+업로드 DB 파싱 벤치마크: DB_PARSE_MODE별 소요 시간 / 최대 메모리(RSS)
+
+- 합성 Health Connect DB(synthetic_health_connect_db.py)를 기간별로 만들고
+  방식마다 새 프로세스에서 ingest_db_file 실행 (최대 RSS가 서로 섞이지 않도록)
+- 최대 RSS 증가분 = 파싱 후 최대 RSS − 파싱 전 RSS (import 등 기본 메모리 제외)
+- 결과 검증: 모든 방식의 날짜별 raw가 json(기존 Python 경로)과 같은지 비교
+  (상대 오차 1e-9, 합성 DB에는 건너뛰어야 하는 행 / 자정 경계 샘플 포함)
+  → 불일치가 1개라도 있으면 종료 코드 1 (방식 간 동등성 검사로 사용)
+
+사용법:
+    python evaluation/scripts/benchmark_db_ingestion.py
+    python evaluation/scripts/benchmark_db_ingestion.py --days 365 1825 --hr-per-day 1440
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.db_ingest import DB_PARSE_MODES
+from synthetic_health_connect_db import build_health_connect_db
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+# ------------------------------------------------
+# 측정 (자식 프로세스)
+# ------------------------------------------------
+def run_child(mode: str, db_path: str, out_path: str):
+    from app.core.db_ingest import ingest_db_file
+
+    before = _rss_mb()
+    started = time.perf_counter()
+    raw_by_day, _ = ingest_db_file(db_path, mode)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3  # Linux: KB
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "seconds": elapsed,
+                "peak_mb": peak,
+                "delta_mb": peak - before,
+                "raw_by_day": {str(k): v for k, v in raw_by_day.items()},
+            },
+            f,
+        )
+
+
+def measure(mode: str, db_path: str, workdir: str) -> dict:
+    out_path = os.path.join(workdir, f"{mode}.json")
+    subprocess.run(
+        [sys.executable, __file__, "--child", mode, db_path, out_path],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    with open(out_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def mismatches(expected: dict, found: dict) -> int:
+    """날짜/항목 단위로 다른 값 개수"""
+    count = len(set(expected) ^ set(found))
+    for day in set(expected) & set(found):
+        for key, value in expected[day].items():
+            if not math.isclose(value, found[day].get(key, math.nan), rel_tol=1e-9, abs_tol=1e-9):
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 DB 파싱 방식별 시간 / 메모리 벤치마크")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    parser.add_argument("--days", type=int, nargs="+", default=[365, 1095, 1825])
+    parser.add_argument("--hr-per-day", type=int, default=288, help="하루 심박수 샘플 수")
+    parser.add_argument("--modes", nargs="+", choices=DB_PARSE_MODES, default=list(DB_PARSE_MODES))
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="bench_db_ingestion_")
+    total_mismatches = 0
+    try:
+        print(f"\n{'='*96}")
+        print(f"업로드 DB 파싱 벤치마크 (심박수 {args.hr_per_day}샘플/일, 방식별 새 프로세스)")
+        print(f"{'='*96}")
+        print(
+            f"{'기간(일)':>8} {'행 수':>11} {'DB(MB)':>8} | {'방식':>7} {'시간(s)':>8} "
+            f"{'최대 RSS(MB)':>13} {'증가분(MB)':>11} {'불일치':>7}"
+        )
+
+        for days in args.days:
+            db_path = os.path.join(workdir, f"hc_{days}.db")
+            info = build_health_connect_db(db_path, days, args.hr_per_day)
+
+            results = {mode: measure(mode, db_path, workdir) for mode in args.modes}
+            expected = results.get("json", next(iter(results.values())))["raw_by_day"]
+
+            for index, (mode, result) in enumerate(results.items()):
+                mismatch = mismatches(expected, result["raw_by_day"])
+                total_mismatches += mismatch
+                head = (
+                    f"{days:>8,} {info['rows']:>11,} {info['bytes'] / 1e6:>8.1f}"
+                    if index == 0
+                    else f"{'':>8} {'':>11} {'':>8}"
+                )
+                print(
+                    f"{head} | {mode:>7} {result['seconds']:>8.2f} "
+                    f"{result['peak_mb']:>13.1f} {result['delta_mb']:>11.1f} "
+                    f"{mismatch:>7}"
+                )
+            os.remove(db_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if total_mismatches:
+        print(f"[ERROR] json 방식과 다른 값 {total_mismatches}개")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+임베딩 압축 벤치마크: 차원 축소(EMBEDDING_DIMENSIONS) × 저장 형식(float32/float16/int8)
+
+- 합성 일별 건강 데이터 → preprocess_health_json → summary_to_natural_text 문장을 임베딩
+  (실제 저장 문장과 같은 템플릿, 질의는 다른 날짜의 문장)
+- 기준: 원본 차원 float32 brute-force의 정확한 top-k
+- 유사도 손실: (정확한 top-k의 평균 유사도 − 반환된 top-k의 평균 유사도, 원본 벡터 기준)
+  템플릿 문장이라 상위 후보 유사도가 0.001 이내로 붙어 있어 recall만으로는 과소평가됨
+- 차원별: ChromaDB 인덱스 크기(디스크) / 검색 지연 / recall@k
+- 차원 × 형식별: NumPy 행렬 캐시 메모리 / 검색 지연 / recall@k, 임베딩 캐시 벡터 1개 크기
+  (ChromaDB는 항상 float32로 저장하므로 형식은 로컬 보관 벡터에만 적용)
+
+백엔드:
+- local : 차원마다 LocalHashEmbeddingBackend(dim)로 다시 임베딩 (API 키 불필요, 기본값)
+- openai: 원본 1536차원을 1번 받은 뒤 앞쪽 N차원 + 정규화
+          (dimensions 파라미터 응답과 같음, OPENAI_API_KEY 필요)
+
+사용법:
+    python evaluation/scripts/benchmark_embedding_compression.py
+    python evaluation/scripts/benchmark_embedding_compression.py --backend openai --docs 1000
+    python evaluation/scripts/benchmark_embedding_compression.py --dims 1536 512 256 128
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import chromadb
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import EMBEDDING_NATIVE_DIMENSIONS
+from app.core.embedding_backend import (
+    LocalHashEmbeddingBackend,
+    OpenAIEmbeddingBackend,
+)
+from app.core.user_vector_cache import UserVectorCache
+from app.utils.preprocess import preprocess_health_json
+from app.utils.preprocess_for_embedding import summary_to_natural_text
+from app.utils.vector_quantization import VECTOR_DTYPES, encode_vector, truncate_vectors
+
+TARGET_USER = "bench_user"
+
+
+# ------------------------------------------------
+# 데이터 준비
+# ------------------------------------------------
+def synthetic_texts(seed: int, count: int, start_date: int = 20180101) -> list:
+    """합성 일별 raw → 저장 시와 같은 임베딩 문장"""
+    rnd = random.Random(seed)
+    base_day = np.datetime64(
+        f"{str(start_date)[:4]}-{str(start_date)[4:6]}-{str(start_date)[6:]}"
+    )
+    texts = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(count):
+            day = str(base_day + np.timedelta64(i, "D")).replace("-", "")
+            raw = {
+                "steps": rnd.randint(500, 20000),
+                "distance_km": round(rnd.uniform(0.3, 15.0), 2),
+                "sleep_min": rnd.randint(240, 600),
+                "exercise_min": rnd.choice([0, 0, 15, 30, 45, 60, 90]),
+                "active_calories": rnd.randint(100, 900),
+                "weight": round(rnd.uniform(55, 90), 1),
+                "height": 172,
+                "heart_rate": rnd.randint(60, 100),
+                "resting_heart_rate": rnd.randint(50, 85),
+                "oxygen_saturation": rnd.randint(93, 100),
+            }
+            summary = preprocess_health_json(raw, int(day), "samsung")
+            texts.append(summary_to_natural_text(summary))
+    return texts
+
+
+def embed(backend, texts: list, batch: int = 100) -> np.ndarray:
+    vectors = []
+    for start in range(0, len(texts), batch):
+        vectors.extend(backend.embed(texts[start : start + batch]))
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def embed_for_dims(args, texts: list, dims: int, full: dict) -> np.ndarray:
+    if args.backend == "openai":
+        key = id(texts)
+        if key not in full:
+            full[key] = embed(OpenAIEmbeddingBackend(), texts)
+        return truncate_vectors(full[key], dims)
+    return embed(LocalHashEmbeddingBackend(dim=dims), texts)
+
+
+# ------------------------------------------------
+# 측정
+# ------------------------------------------------
+def exact_top_k(scores: np.ndarray, k: int) -> list:
+    return [set(np.argsort(-row, kind="stable")[:k].tolist()) for row in scores]
+
+
+def recall(expected: list, found: list) -> float:
+    return statistics.mean(
+        len(e & f) / max(1, len(e)) for e, f in zip(expected, found)
+    )
+
+
+def similarity_loss(scores: np.ndarray, expected: list, found: list) -> float:
+    losses = []
+    for row, e, f in zip(scores, expected, found):
+        losses.append(row[list(e)].mean() - row[list(f)].mean() if f else 1.0)
+    return float(statistics.mean(losses))
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def run_chroma(doc_vectors, query_vectors, top_k: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_embedding_compression_")
+    client = chromadb.PersistentClient(path=workdir)
+    collection = client.create_collection(
+        name="bench", metadata={"hnsw:space": "cosine"}
+    )
+    for start in range(0, len(doc_vectors), 2000):
+        chunk = doc_vectors[start : start + 2000]
+        collection.add(
+            ids=[str(start + i) for i in range(len(chunk))],
+            embeddings=chunk.tolist(),
+            metadatas=[
+                {"user_id": TARGET_USER, "is_canonical": True} for _ in range(len(chunk))
+            ],
+        )
+
+    where = {"$and": [{"user_id": TARGET_USER}, {"is_canonical": True}]}
+    latencies, found = [], []
+    for query in query_vectors:
+        started = time.perf_counter()
+        result = collection.query(
+            query_embeddings=[query.tolist()], n_results=top_k, where=where
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append({int(doc_id) for doc_id in result["ids"][0]})
+
+    size = directory_size(workdir)
+    del collection, client
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {"bytes": size, "p50": statistics.median(latencies), "found": found}
+
+
+def run_numpy(doc_vectors, query_vectors, top_k: int, dtype: str) -> dict:
+    loaded = {
+        "ids": [str(i) for i in range(len(doc_vectors))],
+        "embeddings": doc_vectors,
+        "metadatas": [{"timestamp": i} for i in range(len(doc_vectors))],
+    }
+    cache = UserVectorCache(lambda user_id: loaded, max_users=1, dtype=dtype)
+    cache.query(TARGET_USER, query_vectors[0], top_k)  # 적재
+
+    latencies, found = [], []
+    for query in query_vectors:
+        started = time.perf_counter()
+        result = cache.query(TARGET_USER, query, top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append({int(doc_id) for doc_id in result["ids"][0]})
+
+    return {
+        "bytes": cache.stats()["bytes"],
+        "p50": statistics.median(latencies),
+        "found": found,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 차원 축소 / 양자화 벤치마크")
+    parser.add_argument("--backend", choices=["local", "openai"], default="local")
+    parser.add_argument(
+        "--dims", type=int, nargs="+", default=[EMBEDDING_NATIVE_DIMENSIONS, 512, 256]
+    )
+    parser.add_argument("--dtypes", nargs="+", choices=VECTOR_DTYPES, default=VECTOR_DTYPES)
+    parser.add_argument("--docs", type=int, default=3000, help="사용자 1명의 일별 문서 수")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    doc_texts = synthetic_texts(args.seed, args.docs)
+    query_texts = synthetic_texts(args.seed + 1, args.queries, start_date=20300101)
+
+    full = {}
+    baseline_dims = EMBEDDING_NATIVE_DIMENSIONS
+    baseline_scores = embed_for_dims(
+        args, query_texts, baseline_dims, full
+    ) @ embed_for_dims(args, doc_texts, baseline_dims, full).T
+    baseline = exact_top_k(baseline_scores, args.top_k)
+
+    def quality(found: list) -> str:
+        return (
+            f"{recall(baseline, found):>7.3f} "
+            f"{similarity_loss(baseline_scores, baseline, found):>7.4f}"
+        )
+
+    print(f"\n{'='*120}")
+    print(
+        f"임베딩 압축 벤치마크 (backend={args.backend}, 문서 {args.docs:,}개, "
+        f"질의 {args.queries}개, recall@{args.top_k} 기준: {baseline_dims}차원 float32 정확 검색)"
+    )
+    print(f"{'='*120}")
+    print(
+        f"{'차원':>5} {'형식':>8} | {'chroma 크기(MB)':>15} {'p50(ms)':>8} "
+        f"{'recall':>7} {'손실':>7} | {'numpy 메모리(MB)':>16} {'p50(ms)':>8} "
+        f"{'recall':>7} {'손실':>7} | {'캐시 벡터(B)':>11}"
+    )
+
+    for dims in args.dims:
+        doc_vectors = embed_for_dims(args, doc_texts, dims, full)
+        query_vectors = embed_for_dims(args, query_texts, dims, full)
+        chroma = run_chroma(doc_vectors, query_vectors, args.top_k)
+
+        for index, dtype in enumerate(args.dtypes):
+            numpy_row = run_numpy(doc_vectors, query_vectors, args.top_k, dtype)
+            chroma_cols = (
+                f"{chroma['bytes'] / 1e6:>15.2f} {chroma['p50']:>8.3f} "
+                f"{quality(chroma['found'])}"
+                if index == 0
+                else f"{'(float32 저장)':>15} {'':>8} {'':>7} {'':>7}"
+            )
+            print(
+                f"{dims:>5} {dtype:>8} | {chroma_cols} | "
+                f"{numpy_row['bytes'] / 1e6:>16.2f} {numpy_row['p50']:>8.3f} "
+                f"{quality(numpy_row['found'])} | "
+                f"{len(encode_vector(doc_vectors[0], dtype)):>11,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
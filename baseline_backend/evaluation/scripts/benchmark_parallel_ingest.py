@@ -0,0 +1,155 @@
+"""
+업로드 파싱 / 전처리 병렬 처리 벤치마크: 프로세스 워커 수별 소요 시간
+
+- 합성 Health Connect DB(synthetic_health_connect_db.py, 기본 5년치)를 만들고
+  워커 1 / 2 / 4 / 8개로 parallel_ingest 실행
+  - 워커 1개 = 기존 경로 (현재 프로세스에서 ingest_db_file + preprocess_health_json_batch)
+  - 워커 N개 = 날짜 범위 N개로 나눠 프로세스 풀에서 파싱 / 전처리
+- 프로세스 풀은 워커 수마다 새로 만들고, 측정 전에 모든 프로세스를 미리 띄움
+  (서버에서는 풀 1개를 계속 쓰므로 프로세스 시작 비용은 따로 표시)
+- 결과 검증: 모든 워커 수의 날짜별 raw / summary가 워커 1개 결과와 같은지
+  (raw는 상대 오차 1e-9, summary는 완전히 같아야 함) → 다르면 종료 코드 1
+- 속도 향상은 CPU 코어 수까지만 기대할 수 있음 (코어 수를 함께 출력)
+
+사용법:
+    python evaluation/scripts/benchmark_parallel_ingest.py
+    python evaluation/scripts/benchmark_parallel_ingest.py --days 1095 --hr-per-day 1440 --modes stream
+"""
+
+import argparse
+import contextlib
+import math
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.parallel_ingest import ingest_db_file_parallel, preprocess_days_parallel
+from synthetic_health_connect_db import build_health_connect_db
+
+
+def _start_pool(workers: int) -> tuple:
+    """프로세스 풀 생성 + 모든 워커 프로세스 시작 → (풀, 걸린 시간)"""
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    # 워커가 모두 떠서 import까지 끝나도록 잠깐 걸리는 작업을 워커 수만큼 제출
+    wait([pool.submit(time.sleep, 0.2) for _ in range(workers)])
+    wait([pool.submit(preprocess_days_parallel, {}, "samsung", 1) for _ in range(workers)])
+    return pool, time.perf_counter() - started
+
+
+@contextlib.contextmanager
+def _quiet():
+    """날짜별 전처리 로그 숨김 (fd 1을 바꾸므로 워커 프로세스 출력도 숨김)"""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(devnull)
+        os.close(saved)
+
+
+def raw_mismatches(expected: dict, found: dict) -> int:
+    """날짜/항목 단위로 다른 값 개수"""
+    count = len(set(expected) ^ set(found))
+    for day in set(expected) & set(found):
+        for key, value in expected[day].items():
+            other = found[day].get(key, math.nan)
+            if not math.isclose(value, other, rel_tol=1e-9, abs_tol=1e-9):
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 파싱 / 전처리 워커 수별 벤치마크")
+    parser.add_argument("--days", type=int, default=1825)
+    parser.add_argument("--hr-per-day", type=int, default=288, help="하루 심박수 샘플 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--modes", nargs="+", choices=["sql", "stream"], default=["sql", "stream"])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_parallel_ingest_")
+    failed = 0
+    try:
+        db_path = os.path.join(workdir, "hc.db")
+        info = build_health_connect_db(db_path, args.days, args.hr_per_day)
+
+        print(f"\n{'='*92}")
+        print(
+            f"업로드 파싱 / 전처리 워커 수별 벤치마크 ({args.days:,}일, {info['rows']:,}행, "
+            f"{info['bytes'] / 1e6:.1f}MB, CPU 코어 {os.cpu_count()}개)"
+        )
+        print(f"{'='*92}")
+        print(
+            f"{'방식':>7} {'워커':>5} | {'풀 시작(s)':>10} {'파싱(s)':>8} {'전처리(s)':>9} "
+            f"{'합계(s)':>8} {'속도 향상':>9} {'불일치':>7}"
+        )
+
+        for mode in args.modes:
+            baseline = None
+            for workers in args.workers:
+                with _quiet():
+                    pool, pool_seconds = _start_pool(workers) if workers > 1 else (None, 0.0)
+                    try:
+                        started = time.perf_counter()
+                        raw_by_day, last_days = ingest_db_file_parallel(
+                            db_path, mode, None, workers, pool
+                        )
+                        parsed = time.perf_counter()
+                        # 파싱 결과 비교용 사본 (전처리 결과와 분리)
+                        parsed_raw = {day: dict(raw) for day, raw in raw_by_day.items()}
+                        summaries = preprocess_days_parallel(
+                            raw_by_day, "samsung", workers, pool
+                        )
+                        finished = time.perf_counter()
+                    finally:
+                        if pool is not None:
+                            pool.shutdown()
+
+                # 병합 순서에 따라 날짜 순서가 다를 수 있음 → 날짜(created_at)로 비교
+                summaries = {summary["created_at"]: summary for summary in summaries}
+
+                parse_seconds = parsed - started
+                total_seconds = finished - started
+                if baseline is None:
+                    baseline = (total_seconds, parsed_raw, last_days, summaries)
+                    mismatch = 0
+                else:
+                    mismatch = raw_mismatches(baseline[1], parsed_raw)
+                    mismatch += baseline[2] != last_days
+                    mismatch += len(set(baseline[3]) ^ set(summaries))
+                    mismatch += sum(
+                        summary != summaries.get(created_at)
+                        for created_at, summary in baseline[3].items()
+                    )
+                failed += mismatch
+
+                print(
+                    f"{mode:>7} {workers:>5} | {pool_seconds:>10.2f} {parse_seconds:>8.2f} "
+                    f"{finished - parsed:>9.2f} {total_seconds:>8.2f} "
+                    f"{baseline[0] / total_seconds:>8.2f}x {mismatch:>7}"
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failed:
+        print(f"[ERROR] 워커 1개 결과와 다른 값 {failed}개")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+시작 시간 벤치마크 (지연 초기화 효과 측정)
+
+새 파이썬 프로세스에서 각 모듈을 import하는 시간을 측정한다.
+- import만: 지연 초기화 후 CLI/평가 스크립트/테스트가 실제로 내는 비용
+- import + warm_up(): 예전처럼 import 시점에 ChromaDB/클라이언트를 만들던 비용
+또한 import만 했을 때 chromadb/openai가 로드되지 않았는지,
+chroma_data / local_store 디렉터리가 생기지 않았는지 확인한다.
+
+- OPENAI_API_KEY 없이 실행 (import 시점에 키를 요구하지 않는지 확인)
+- 임시 디렉터리를 작업 디렉터리로 사용하고 끝나면 삭제
+
+사용법:
+    python evaluation/scripts/benchmark_startup.py
+    python evaluation/scripts/benchmark_startup.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
+MODULES = [
+    "app.core.vector_store",
+    "app.core.llm_analysis",
+    "app.core.chatbot_engine.fixed_responses",
+]
+
+PROBE = """
+import json, os, sys, time
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+if {warm_up}:
+    from app.core import vector_store
+    vector_store.warm_up()
+finished = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "chromadb_loaded": "chromadb" in sys.modules,
+    "openai_loaded": "openai" in sys.modules,
+    "touched_disk": os.path.exists("chroma_data") or os.path.exists("local_store"),
+}}))
+"""
+
+
+def run_probe(module: str, warm_up: bool) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    env.setdefault("EMBEDDING_BACKEND", "local")
+
+    try:
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, warm_up=warm_up)],
+            cwd=workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 import / 시작 시간 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="모듈당 반복 횟수")
+    args = parser.parse_args()
+
+    print(f"\n{'='*86}")
+    print(f"시작 시간 벤치마크 (새 프로세스, {args.repeat}회 중앙값, OPENAI_API_KEY 없음)")
+    print(f"{'='*86}")
+    print(
+        f"{'모듈':<42} {'import만(ms)':>12} {'+warm_up(ms)':>13} "
+        f"{'chromadb/openai 로드':>20} {'디스크':>6}"
+    )
+
+    for module in MODULES:
+        lazy = [run_probe(module, warm_up=False) for _ in range(args.repeat)]
+        eager = [run_probe(module, warm_up=True) for _ in range(args.repeat)]
+
+        lazy_ms = statistics.median(r["import_ms"] for r in lazy)
+        eager_ms = statistics.median(r["total_ms"] for r in eager)
+        loaded = any(r["chromadb_loaded"] or r["openai_loaded"] for r in lazy)
+        touched = any(r["touched_disk"] for r in lazy)
+
+        print(
+            f"{module:<42} {lazy_ms:>12.0f} {eager_ms:>13.0f} "
+            f"{('예' if loaded else '아니오'):>20} {('예' if touched else '아니오'):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
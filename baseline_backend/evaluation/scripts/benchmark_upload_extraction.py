@@ -0,0 +1,243 @@
+"""
+ZIP 업로드 저장/추출 벤치마크: 기존 방식 vs 스트리밍 + SQLite 멤버만 추출
+
+- 기존(legacy): await file.read() 전체 → 임시 파일 → uploads/ 복사(copy2)
+              → extract_zip_to_temp (모든 멤버 해제 + 파일마다 시그니처 검사)
+- 스트리밍(stream): FileUploadService.save_upload (chunk 단위로 uploads/에 한 번만 기록)
+              → extract_sqlite_member (central directory에서 찾은 DB 멤버만 추출)
+- 합성 Health Connect DB + (선택) 크기 맞춤용 패딩 테이블 + DB가 아닌 부가 멤버로 ZIP 생성
+  무압축(stored) / 압축(deflated) 각각 측정
+- 방식마다 새 프로세스에서 실행 (최대 RSS가 서로 섞이지 않도록)
+  - 최대 RSS 증가분 = 실행 후 최대 RSS − 실행 전 RSS
+  - 읽기/쓰기 바이트 = /proc/self/io의 rchar / wchar 증가분 (시스템 콜 기준)
+  - 남은 파일 = 실행 후 디스크에 남는 바이트 (기존 방식의 mkdtemp 해제 폴더 포함)
+- 결과 검증: 추출된 DB가 원본 DB와 바이트 단위로 같은지 (다르면 종료 코드 1)
+
+사용법:
+    python evaluation/scripts/benchmark_upload_extraction.py
+    python evaluation/scripts/benchmark_upload_extraction.py --db-mb 500 --extra-mb 50
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic_health_connect_db import build_health_connect_db
+
+METHODS = ("legacy", "stream")
+COMPRESSIONS = {"stored": zipfile.ZIP_STORED, "deflated": zipfile.ZIP_DEFLATED}
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def _io_bytes() -> dict:
+    with open("/proc/self/io") as f:
+        return {
+            key: int(value)
+            for key, value in (line.split(": ") for line in f)
+            if key in ("rchar", "wchar")
+        }
+
+
+def _tree_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+
+def _sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ------------------------------------------------
+# 입력 만들기
+# ------------------------------------------------
+def build_export_db(path: str, days: int, db_mb: float) -> int:
+    """합성 DB + db_mb까지 채우는 패딩 테이블 (압축이 잘 안 되는 BLOB)"""
+    build_health_connect_db(path, days)
+    missing = int(db_mb * 1e6) - os.path.getsize(path)
+    if missing > 0:
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE media_cache_table (row_id INTEGER PRIMARY KEY, data BLOB)")
+        conn.executemany(
+            "INSERT INTO media_cache_table (data) VALUES (randomblob(?))",
+            [(1_000_000,)] * (missing // 1_000_000 + 1),
+        )
+        conn.commit()
+        conn.close()
+    return os.path.getsize(path)
+
+
+def build_export_zip(path: str, db_path: str, compression: int, extra_mb: float):
+    """Health Connect 내보내기와 비슷한 ZIP (DB + DB가 아닌 부가 멤버)"""
+    with zipfile.ZipFile(path, "w", compression) as zf:
+        zf.writestr("README.txt", "Health Connect export\n" * 100)
+        for i in range(int(extra_mb)):
+            zf.writestr(f"media/attachment_{i:04d}.bin", os.urandom(1_000_000))
+        zf.write(db_path, "health_connect_export.db")
+
+
+# ------------------------------------------------
+# 측정 (자식 프로세스)
+# ------------------------------------------------
+async def _legacy(upload, workdir: str) -> str:
+    from app.core.unzipper import extract_zip_to_temp
+
+    temp_path = os.path.join(workdir, "extracted", upload.filename)
+    with open(temp_path, "wb") as buffer:
+        buffer.write(await upload.read())
+    shutil.copy2(temp_path, os.path.join(workdir, "uploads", upload.filename))
+    return extract_zip_to_temp(temp_path)
+
+
+async def _stream(upload, workdir: str) -> str:
+    from app.core.unzipper import extract_sqlite_member
+    from app.services.file_upload_service import FileUploadService
+
+    saved_path = os.path.join(workdir, "uploads", upload.filename)
+    await FileUploadService.save_upload(upload, saved_path)
+    return extract_sqlite_member(saved_path, os.path.join(workdir, "extracted"))
+
+
+def run_child(method: str, zip_path: str, workdir: str, out_path: str):
+    from fastapi import UploadFile
+    from app.services import file_upload_service  # noqa: F401 (import 메모리 제외)
+
+    for name in ("uploads", "extracted"):
+        os.makedirs(os.path.join(workdir, name), exist_ok=True)
+
+    with open(zip_path, "rb") as f:
+        upload = UploadFile(file=f, filename="healthconnect_export.zip")
+        before_rss = _rss_mb()
+        before_io = _io_bytes()
+        started = time.perf_counter()
+        db_path = asyncio.run((_legacy if method == "legacy" else _stream)(upload, workdir))
+        elapsed = time.perf_counter() - started
+        after_io = _io_bytes()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3  # Linux: KB
+
+    # 기존 방식은 workdir 밖(mkdtemp)에 모든 멤버를 해제
+    extract_root = str(Path(db_path).parent)
+    if not extract_root.startswith(workdir):
+        left_bytes = _tree_bytes(workdir) + _tree_bytes(extract_root)
+    else:
+        left_bytes = _tree_bytes(workdir)
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "seconds": elapsed,
+                "peak_mb": peak,
+                "delta_mb": peak - before_rss,
+                "read_mb": (after_io["rchar"] - before_io["rchar"]) / 1e6,
+                "written_mb": (after_io["wchar"] - before_io["wchar"]) / 1e6,
+                "left_mb": left_bytes / 1e6,
+                "sha1": _sha1(db_path),
+            },
+            f,
+        )
+
+    if not extract_root.startswith(workdir):
+        shutil.rmtree(extract_root, ignore_errors=True)
+
+
+def measure(method: str, zip_path: str, workdir: str) -> dict:
+    run_dir = os.path.join(workdir, method)
+    out_path = os.path.join(workdir, f"{method}.json")
+    try:
+        subprocess.run(
+            [sys.executable, __file__, "--child", method, zip_path, run_dir, out_path],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with open(out_path, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ZIP 업로드 저장/추출 방식별 메모리 / I/O 벤치마크")
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    parser.add_argument("--days", type=int, default=365, help="합성 DB 기간(일)")
+    parser.add_argument("--db-mb", type=float, default=200, help="DB 크기 (패딩 테이블로 맞춤)")
+    parser.add_argument("--extra-mb", type=float, default=20, help="DB가 아닌 부가 멤버 크기")
+    parser.add_argument(
+        "--compressions", nargs="+", choices=list(COMPRESSIONS), default=list(COMPRESSIONS)
+    )
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="bench_upload_extraction_")
+    failed = 0
+    try:
+        db_path = os.path.join(workdir, "source.db")
+        db_bytes = build_export_db(db_path, args.days, args.db_mb)
+        expected = _sha1(db_path)
+
+        print(f"\n{'='*100}")
+        print(
+            f"ZIP 업로드 저장/추출 벤치마크 (DB {db_bytes / 1e6:.1f}MB + 부가 멤버 "
+            f"{args.extra_mb:g}MB, 방식별 새 프로세스)"
+        )
+        print(f"{'='*100}")
+        print(
+            f"{'압축':>9} {'ZIP(MB)':>8} | {'방식':>7} {'시간(s)':>8} {'최대 RSS(MB)':>13} "
+            f"{'증가분(MB)':>11} {'읽기(MB)':>9} {'쓰기(MB)':>9} {'남은 파일(MB)':>13} {'일치':>5}"
+        )
+
+        for name in args.compressions:
+            zip_path = os.path.join(workdir, f"export_{name}.zip")
+            build_export_zip(zip_path, db_path, COMPRESSIONS[name], args.extra_mb)
+            zip_mb = os.path.getsize(zip_path) / 1e6
+
+            for index, method in enumerate(METHODS):
+                result = measure(method, zip_path, workdir)
+                same = result["sha1"] == expected
+                failed += not same
+                head = f"{name:>9} {zip_mb:>8.1f}" if index == 0 else f"{'':>9} {'':>8}"
+                print(
+                    f"{head} | {method:>7} {result['seconds']:>8.2f} {result['peak_mb']:>13.1f} "
+                    f"{result['delta_mb']:>11.1f} {result['read_mb']:>9.1f} "
+                    f"{result['written_mb']:>9.1f} {result['left_mb']:>13.1f} "
+                    f"{'O' if same else 'X':>5}"
+                )
+            os.remove(zip_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failed:
+        print(f"[ERROR] 원본 DB와 다른 추출 결과 {failed}개")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+사용자별 유사 검색 벤치마크: ChromaDB(HNSW + where 필터) vs NumPy brute-force
+
+- 임시 디렉터리에 컬렉션을 만들고 무작위 단위 벡터를 적재
+  (측정 대상 사용자 1명 + 다른 사용자들 문서를 함께 넣어 공유 인덱스 상황 재현)
+- 사용자 문서 수 100 / 1,000 / 10,000에서 검색 지연(p50/p95)과
+  Chroma 결과의 recall@k(정확한 brute-force 결과 기준) 비교
+- 네트워크/API 키 불필요
+
+사용법:
+    python evaluation/scripts/benchmark_vector_search.py
+    python evaluation/scripts/benchmark_vector_search.py --sizes 100 1000 --dim 256
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import chromadb
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.core.user_vector_cache import UserVectorCache
+
+TARGET_USER = "bench_user"
+
+
+def random_unit_vectors(rng, count: int, dim: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def add_documents(collection, user_id: str, vectors: np.ndarray, batch: int = 2000):
+    for start in range(0, len(vectors), batch):
+        chunk = vectors[start : start + batch]
+        collection.add(
+            ids=[f"{user_id}_{start + i}" for i in range(len(chunk))],
+            embeddings=chunk.tolist(),
+            metadatas=[
+                {
+                    "user_id": user_id,
+                    "timestamp": 20200101 + start + i,
+                    "health_score": (start + i) % 100,
+                    "platform": "samsung",
+                    "is_canonical": True,
+                }
+                for i in range(len(chunk))
+            ],
+        )
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_size(args, size: int, rng) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_vector_search_")
+    client = chromadb.PersistentClient(path=workdir)
+    collection = client.create_collection(
+        name="bench", metadata={"hnsw:space": "cosine"}
+    )
+
+    user_vectors = random_unit_vectors(rng, size, args.dim)
+    add_documents(collection, TARGET_USER, user_vectors)
+    for other in range(args.other_users):
+        add_documents(
+            collection,
+            f"other_{other}",
+            random_unit_vectors(rng, args.docs_per_other_user, args.dim),
+        )
+
+    where = {"$and": [{"user_id": TARGET_USER}, {"is_canonical": True}]}
+
+    def loader(user_id):
+        return collection.get(
+            where={"$and": [{"user_id": user_id}, {"is_canonical": True}]},
+            include=["embeddings", "metadatas"],
+        )
+
+    cache = UserVectorCache(loader, max_users=4, dtype=args.dtype)
+
+    # 첫 적재 시간 (콜드)
+    started = time.perf_counter()
+    cache.query(TARGET_USER, user_vectors[0], args.top_k)
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    queries = random_unit_vectors(rng, args.queries, args.dim)
+    chroma_ms, numpy_ms, recalls = [], [], []
+
+    for query in queries:
+        started = time.perf_counter()
+        chroma_result = collection.query(
+            query_embeddings=[query.tolist()], n_results=args.top_k, where=where
+        )
+        chroma_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        numpy_result = cache.query(TARGET_USER, query, args.top_k)
+        numpy_ms.append((time.perf_counter() - started) * 1000)
+
+        exact = set(numpy_result["ids"][0])
+        found = set(chroma_result["ids"][0])
+        recalls.append(len(exact & found) / max(1, len(exact)))
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    total_docs = size + args.other_users * args.docs_per_other_user
+    return {
+        "size": size,
+        "total_docs": total_docs,
+        "chroma_p50": statistics.median(chroma_ms),
+        "chroma_p95": percentile(chroma_ms, 95),
+        "numpy_p50": statistics.median(numpy_ms),
+        "numpy_p95": percentile(numpy_ms, 95),
+        "numpy_cold": cold_ms,
+        "chroma_recall": statistics.mean(recalls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사용자별 유사 검색 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--dim", type=int, default=1536, help="벡터 차원")
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--other-users", type=int, default=20)
+    parser.add_argument("--docs-per-other-user", type=int, default=500)
+    parser.add_argument("--dtype", choices=["float32", "float16", "int8"], default="float32")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    print(f"\n{'='*78}")
+    print(
+        f"유사 검색 벤치마크 (dim={args.dim}, top_k={args.top_k}, "
+        f"queries={args.queries}, 다른 사용자 {args.other_users}명 × "
+        f"{args.docs_per_other_user}개, numpy {args.dtype})"
+    )
+    print(f"{'='*78}")
+    print(
+        f"{'사용자 문서':>10} {'전체 문서':>10} | {'chroma p50/p95 (ms)':>20} | "
+        f"{'numpy p50/p95 (ms)':>19} | {'적재(ms)':>8} | {'chroma recall':>13}"
+    )
+
+    for size in args.sizes:
+        row = run_size(args, size, rng)
+        print(
+            f"{row['size']:>10,} {row['total_docs']:>10,} | "
+            f"{row['chroma_p50']:>9.3f} / {row['chroma_p95']:>8.3f} | "
+            f"{row['numpy_p50']:>8.3f} / {row['numpy_p95']:>8.3f} | "
+            f"{row['numpy_cold']:>8.1f} | {row['chroma_recall']:>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
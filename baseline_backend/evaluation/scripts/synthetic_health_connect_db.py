@@ -0,0 +1,259 @@
+"""
+합성 Health Connect SQLite DB 생성 (업로드 파싱 벤치마크용)
+
+- 파서가 읽는 테이블(걸음수, 거리, 칼로리, 심박수 series, 휴식기 심박수, 산소포화도,
+  체중, 키, 수면) + 파서가 읽지 않는 테이블(수면 단계, 운동 세션, 변경 로그)
+- 행마다 uuid BLOB 등 실제 내보내기 파일과 비슷한 부가 컬럼 포함
+- local_date는 Epoch Day, 시간 컬럼은 epoch millis (Health Connect 형식)
+- 30일마다 파서가 건너뛰어야 하는 행(심박수 0, 시작 시각 0인 수면, 체중 0)과
+  KST 자정 직전/직후 심박수 샘플 포함 (파싱 방식 간 결과 비교용)
+
+사용법:
+    python evaluation/scripts/synthetic_health_connect_db.py --days 1095 --out /tmp/hc.db
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import uuid
+
+DAY_MS = 86_400_000
+KST_OFFSET_MS = 9 * 3_600_000
+START_EPOCH_DAY = 17_532  # 2018-01-01
+
+_RECORD_COLUMNS = """
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    uuid BLOB NOT NULL,
+    last_modified_time INTEGER,
+    client_record_id TEXT,
+    client_record_version INTEGER,
+    app_info_id INTEGER,
+    device_info_id INTEGER,
+    recording_method INTEGER,
+    local_date INTEGER
+"""
+
+SCHEMA = {
+    "steps_record_table": "start_time INTEGER, end_time INTEGER, count INTEGER",
+    "distance_record_table": "start_time INTEGER, end_time INTEGER, distance REAL",
+    "total_calories_burned_record_table": "start_time INTEGER, end_time INTEGER, energy REAL",
+    "active_calories_burned_record_table": "start_time INTEGER, end_time INTEGER, energy REAL",
+    "heart_rate_record_table": "start_time INTEGER, end_time INTEGER",
+    "resting_heart_rate_record_table": "time INTEGER, value REAL",
+    "oxygen_saturation_record_table": "time INTEGER, percentage REAL",
+    "weight_record_table": "time INTEGER, weight REAL",
+    "height_record_table": "time INTEGER, height REAL",
+    "sleep_session_record_table": "start_time INTEGER, end_time INTEGER, title TEXT, notes TEXT",
+    "steps_cadence_record_table": "start_time INTEGER, end_time INTEGER",
+    "exercise_session_record_table": (
+        "start_time INTEGER, end_time INTEGER, exercise_type INTEGER, title TEXT, notes TEXT"
+    ),
+}
+
+SERIES_SCHEMA = {
+    "heart_rate_record_series_table": (
+        "parent_key INTEGER, beats_per_minute INTEGER, epoch_millis INTEGER"
+    ),
+    "sleep_stages_table": (
+        "parent_key INTEGER, stage_start_time INTEGER, stage_end_time INTEGER, stage_type INTEGER"
+    ),
+    "change_logs_table": "record_type INTEGER, app_id INTEGER, uuids BLOB, operation_type INTEGER",
+    "application_info_table": "package_name TEXT, app_name TEXT, app_icon BLOB",
+}
+
+
+def _names(columns: str) -> list:
+    """"a INTEGER, b REAL" → ["a", "b"]"""
+    return [column.split()[0] for column in columns.split(",")]
+
+
+def _create_schema(conn: sqlite3.Connection):
+    for table, columns in SCHEMA.items():
+        conn.execute(f"CREATE TABLE {table} ({_RECORD_COLUMNS}, {columns})")
+    for table, columns in SERIES_SCHEMA.items():
+        conn.execute(
+            f"CREATE TABLE {table} (row_id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})"
+        )
+
+
+def build_health_connect_db(
+    path: str,
+    days: int,
+    hr_per_day: int = 288,
+    seed: int = 42,
+    start_epoch_day: int = START_EPOCH_DAY,
+) -> dict:
+    """
+    합성 DB 파일 생성 (기존 파일은 덮어씀)
+
+    hr_per_day: 하루 심박수 샘플 수 (288 = 5분 간격)
+
+    Returns:
+        {"path", "days", "rows", "bytes"}
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    _create_schema(conn)
+
+    rows = 0
+
+    def record(table: str, local_date: int, extra: tuple):
+        nonlocal rows
+        placeholders = ", ".join("?" * (8 + len(extra)))
+        conn.execute(
+            f"INSERT INTO {table} (uuid, last_modified_time, client_record_id, "
+            f"client_record_version, app_info_id, device_info_id, recording_method, "
+            f"local_date, {', '.join(_names(SCHEMA[table]))}) "
+            f"VALUES ({placeholders})",
+            (
+                uuid.UUID(int=rnd.getrandbits(128)).bytes,
+                local_date * DAY_MS,
+                f"com.sec.android.app.shealth.{rows}",
+                1,
+                1,
+                1,
+                1,
+                local_date,
+                *extra,
+            ),
+        )
+        rows += 1
+        return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+    conn.execute(
+        "INSERT INTO application_info_table (package_name, app_name, app_icon) VALUES (?, ?, ?)",
+        ("com.sec.android.app.shealth", "Samsung Health", os.urandom(4096)),
+    )
+
+    for offset in range(days):
+        local_date = start_epoch_day + offset
+        day_start = local_date * DAY_MS - KST_OFFSET_MS  # KST 자정 (UTC millis)
+
+        # 활동: 1시간 단위 기록
+        for hour in range(24):
+            start = day_start + hour * 3_600_000
+            end = start + 3_600_000
+            active = 7 <= hour <= 22
+            steps = rnd.randint(200, 1500) if active else rnd.randint(0, 30)
+            record("steps_record_table", local_date, (start, end, steps))
+            record("distance_record_table", local_date, (start, end, steps * 0.72))
+            record(
+                "total_calories_burned_record_table",
+                local_date,
+                (start, end, rnd.uniform(60_000, 140_000)),
+            )
+            record(
+                "active_calories_burned_record_table",
+                local_date,
+                (start, end, steps * rnd.uniform(35, 45)),
+            )
+
+        # 심박수: 부모 기록 1개 + series 샘플
+        parent = record("heart_rate_record_table", local_date, (day_start, day_start + DAY_MS))
+        interval = DAY_MS // max(1, hr_per_day)
+        conn.executemany(
+            "INSERT INTO heart_rate_record_series_table "
+            "(parent_key, beats_per_minute, epoch_millis) VALUES (?, ?, ?)",
+            [
+                (parent, rnd.randint(52, 130), day_start + i * interval)
+                for i in range(hr_per_day)
+            ],
+        )
+        rows += hr_per_day
+
+        record(
+            "resting_heart_rate_record_table",
+            local_date,
+            (day_start + 6 * 3_600_000, rnd.randint(50, 75)),
+        )
+        for _ in range(rnd.randint(1, 3)):
+            record(
+                "oxygen_saturation_record_table",
+                local_date,
+                (day_start + rnd.randint(0, DAY_MS - 1), rnd.uniform(93, 100)),
+            )
+        if offset % 3 == 0:
+            record(
+                "weight_record_table",
+                local_date,
+                (day_start + 7 * 3_600_000, rnd.uniform(60_000, 80_000)),
+            )
+        if offset % 90 == 0:
+            record("height_record_table", local_date, (day_start, 1.72))
+
+        # 수면: 전날 밤 23시 ~ 아침, 단계 4개
+        sleep_start = day_start - 3_600_000
+        sleep_end = sleep_start + rnd.randint(300, 540) * 60_000
+        session = record(
+            "sleep_session_record_table",
+            local_date,
+            (sleep_start, sleep_end, "Sleep", None),
+        )
+        quarter = (sleep_end - sleep_start) // 4
+        conn.executemany(
+            "INSERT INTO sleep_stages_table "
+            "(parent_key, stage_start_time, stage_end_time, stage_type) VALUES (?, ?, ?, ?)",
+            [
+                (session, sleep_start + i * quarter, sleep_start + (i + 1) * quarter, i % 3 + 4)
+                for i in range(4)
+            ],
+        )
+
+        if offset % 2 == 0:
+            start = day_start + 18 * 3_600_000
+            record(
+                "exercise_session_record_table",
+                local_date,
+                (start, start + 45 * 60_000, 56, "Running", "synthetic"),
+            )
+
+        if offset % 30 == 15:
+            conn.executemany(
+                "INSERT INTO heart_rate_record_series_table "
+                "(parent_key, beats_per_minute, epoch_millis) VALUES (?, ?, ?)",
+                [
+                    (parent, 0, day_start + 3_600_000),
+                    (parent, 99, day_start - 1),
+                    (parent, 101, day_start + DAY_MS),
+                ],
+            )
+            rows += 3
+            record("sleep_session_record_table", local_date, (0, sleep_end, "Nap", None))
+            record("weight_record_table", local_date, (day_start, 0.0))
+            record("steps_record_table", local_date, (day_start, day_start, 0))
+
+        conn.execute(
+            "INSERT INTO change_logs_table (record_type, app_id, uuids, operation_type) "
+            "VALUES (?, ?, ?, ?)",
+            (1, 1, os.urandom(16 * 64), 0),
+        )
+
+    conn.commit()
+    conn.close()
+
+    return {"path": path, "days": days, "rows": rows, "bytes": os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 Health Connect DB 생성")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--hr-per-day", type=int, default=288)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="health_connect_synthetic.db")
+    args = parser.parse_args()
+
+    info = build_health_connect_db(args.out, args.days, args.hr_per_day, args.seed)
+    print(
+        f"[INFO] {info['path']}: {info['days']}일, {info['rows']:,}행, "
+        f"{info['bytes'] / 1e6:.1f}MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
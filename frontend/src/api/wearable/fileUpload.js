@@ -1,5 +1,31 @@
 import api from '../index';
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+export const getUploadJob = async (jobId) => {
+  const response = await api.get(`/api/file/jobs/${jobId}`);
+  return response.data;
+};
+
+// 업로드 작업이 끝날 때까지 확인 → 분석 결과 반환
+// (분석이 끝나면 남은 저장이 진행 중이어도 result가 먼저 채워짐)
+export const waitForUploadJob = async (jobId) => {
+  for (;;) {
+    const job = await getUploadJob(jobId);
+    if (job.result) {
+      return job.result;
+    }
+    if (job.status === 'failed') {
+      const error = new Error(job.error || '업로드 처리 중 오류가 발생했습니다.');
+      error.response = { data: { detail: job.error } };
+      throw error;
+    }
+    await sleep(JOB_POLL_INTERVAL_MS);
+  }
+};
+
 export const uploadFile = async (
   file,
   userId,
@@ -14,5 +40,9 @@ export const uploadFile = async (
     headers: { 'Content-Type': 'multipart/form-data' },
   });
 
+  // 서버가 작업 대기열로 처리하면 job_id만 오므로 결과가 나올 때까지 대기
+  if (response.data.job_id && !response.data.llm_result) {
+    return waitForUploadJob(response.data.job_id);
+  }
   return response.data;
 };